@@ -11,7 +11,7 @@ Dies ist nützlich für die spätere manuelle Kontrolle oder Texterkennung (OCR)
 
 Funktionen:
 - Sucht nach der neuesten JSON-Datei mit fehlerhaften Ziehungen
-- Initialisiert einen sichtbaren Chrome-Browser für Debugging-Zwecke
+- Leiht einen sichtbaren Chrome-Browser für Debugging-Zwecke aus dem Driver-Pool (core/driver_pool.py)
 - Navigiert zur richtigen Ziehung über Jahr und Datumsauswahl
 - Erstellt Screenshots der Ziehungsseite
 - Speichert Metadaten zu den erstellten Screenshots als JSON
@@ -28,16 +28,18 @@ Verwendung:
 
 
 import os
+import sys
 import json
-import time
 from datetime import datetime
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
 
+# Projektverzeichnis zur sys.path hinzufügen, um core/ zu importieren
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.selenium_werkzeuge import oeffne_jahr, gehe_zu_ziehung, tag_optionen
+from core.driver_pool import leihe_driver
+
 BASE_URL = "https://www.lotto.de/lotto-6aus49/lottozahlen"
 DATA_PATH = "data"
 SCREENSHOT_PATH = os.path.join(DATA_PATH, "screenshots")
@@ -55,32 +57,24 @@ def lade_fehlerhafte_ziehungen(pfad):
         return json.load(f)
 
 def initialisiere_browser():
-    chrome_options = Options()
-    # chrome_options.add_argument("--headless=new")  # für Debug ausgeschaltet
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    return webdriver.Chrome(service=Service("tools/chromedriver.exe"), options=chrome_options)
+    # Sichtbar (headless=False, für Debug) und nicht schlank – die Screenshots brauchen Bilder und Schriften
+    return leihe_driver(schlank=False, headless=False)
 
 def finde_tag_value(driver, ziel_datum):
     try:
-        tag_select = Select(driver.find_element(By.CSS_SELECTOR, "select[id^='daySelect-select']"))
-        for option in tag_select.options:
-            if ziel_datum.strip() in option.text.strip():
-                return option.get_attribute("value")
+        # Alle Optionen in einem Roundtrip lesen statt .text/.get_attribute pro Option
+        for tag_value, text in tag_optionen(driver) or []:
+            if ziel_datum.strip() in text:
+                return tag_value
     except Exception as e:
         print(f"❌ Fehler beim Ermitteln von tag_value für {ziel_datum}: {e}")
     return None
 
 def lade_ziehung(driver, jahr, tag_value):
-    driver.get(BASE_URL)
-    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CSS_SELECTOR, "select[id^='selectedYear-select']")))
-    Select(driver.find_element(By.CSS_SELECTOR, "select[id^='selectedYear-select']")).select_by_value(str(jahr))
-    time.sleep(1)
-    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CSS_SELECTOR, "select[id^='daySelect-select']")))
-    Select(driver.find_element(By.CSS_SELECTOR, "select[id^='daySelect-select']")).select_by_value(tag_value)
-    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CSS_SELECTOR, ".DrawNumbersCollection__container .LottoBall")))
-    time.sleep(0.5)
+    # Wartet, bis die Kugeln der gewählten Ziehung vollständig und stabil angezeigt werden
+    # (Signatur geändert + DOM ruhig) – sonst landen noch die alten Zahlen im Screenshot.
+    # Die Seite bleibt offen; Jahr/Tag werden umgeschaltet (Neuladen nur nach Fehlern).
+    gehe_zu_ziehung(driver, BASE_URL, jahr, tag_value)
 
 def erstelle_screenshot(driver, jahr, datum, tag_value):
     try:
@@ -102,7 +96,8 @@ def hauptprozess():
 
     print(f"✅ Fehlerhafte Ziehungen geladen aus: {pfad}")
     ziehungen = lade_fehlerhafte_ziehungen(pfad)
-    driver = initialisiere_browser()
+    leihe = initialisiere_browser()
+    driver = leihe.driver
 
     screenshots = []
     for eintrag in ziehungen:
@@ -112,11 +107,7 @@ def hauptprozess():
 
         if not tag_value:
             try:
-                driver.get(BASE_URL)
-                WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CSS_SELECTOR, "select[id^='selectedYear-select']")))
-                Select(driver.find_element(By.CSS_SELECTOR, "select[id^='selectedYear-select']")).select_by_value(str(jahr))
-                time.sleep(1)
-                WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CSS_SELECTOR, "select[id^='daySelect-select']")))
+                oeffne_jahr(driver, BASE_URL, jahr)
                 tag_value = finde_tag_value(driver, datum)
                 if not tag_value:
                     print(f"❌ Kein passendes tag_value für {datum} ({jahr})")
@@ -126,10 +117,12 @@ def hauptprozess():
                 continue
 
         pfad = erstelle_screenshot(driver, jahr, datum, tag_value)
+        if leihe.seite():
+            driver = leihe.driver  # Browser nach MAX_SEITEN ersetzt
         if pfad:
             screenshots.append({"jahr": jahr, "datum": datum, "tag_value": tag_value, "screenshot": pfad})
 
-    driver.quit()
+    leihe.zurueckgeben()
     timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     outpath = os.path.join(DATA_PATH, f"screenshots_mit_daten_{timestamp}.json")
     with open(outpath, "w", encoding="utf-8") as f:
@@ -138,9 +131,8 @@ def hauptprozess():
 
 if __name__ == "__main__":
     hauptprozess()
-    """                                                                                                                                  
-    Achtung, die Klasse funktioniert sehr gut, aber einige Bilder werden zu schnell
-    gemacht, so dass die richtigen Zahlen nicht geladen werden und die Bilder mit den alten Zahlen gemacht werden.
-    
     """
-     
+    Hinweis: Früher wurden einige Bilder zu schnell gemacht, so dass noch die alten Zahlen
+    zu sehen waren. lade_ziehung() wartet jetzt auf die neue, vollständige Ziehung
+    (core/selenium_werkzeuge.py: waehle_tag).
+    """
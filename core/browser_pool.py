@@ -0,0 +1,227 @@
+"""
+Modulname: browser_pool.py
+Pfad:     core/browser_pool.py
+Zweck:    Paralleler Vollabruf der Ziehungshistorie mit mehreren Headless-Browsern
+
+Beschreibung:
+Statt einen Chrome seriell durch 70 Jahre zu führen, laufen N unabhängige Headless-Driver
+in Worker-Threads (die Arbeit wartet fast nur auf Browser/Netz, nicht auf Python).
+- Arbeitsschlange mit Jahren: jeder Worker holt sich das nächste freie Jahr
+  (innerhalb eines Jahres bleibt die Seite offen, siehe gehe_zu_ziehung)
+- Browser kommen aus dem geteilten warmen Pool (core/driver_pool.py, leihe_driver); jeder Worker
+  hält eine Leihe, nach MAX_SEITEN Ziehungen wird der Browser darin ersetzt
+- Wiederholung pro Ziehung und pro Jahr; stürzt ein Browser ab, leiht der Worker einen neuen
+- Ergebnisse werden am Ende nach Datum sortiert zusammengeführt
+- Anzahl Worker: Parameter / --worker (Standard: ANZAHL_WORKER)
+- --messen: Dauer je Ziehung und Phase als JSONL-Trace (core/messung.py)
+
+Verwendung:
+>>> python core/browser_pool.py --start 1955 --ende 2025 --worker 4
+>>> python core/browser_pool.py --fixture --worker 2        (lokale Fixture-Seite, Vergleich mit Sollwerten)
+>>> python core/browser_pool.py --fixture --worker 4 --fixture-jahre 4   (mehr Jahre als Worker)
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import queue
+import argparse
+import threading
+from datetime import datetime
+
+from selenium.common.exceptions import WebDriverException
+
+# Projektverzeichnis zur sys.path hinzufügen, um core/ und model/ zu importieren
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core import messung
+from core.selenium_werkzeuge import oeffne_jahr, gehe_zu_ziehung, lies_seite
+from core.driver_pool import leihe_driver, hole_pool
+
+BASE_URL = "https://www.lotto.de/lotto-6aus49/lottozahlen"
+DATA_PATH = "data"
+
+ANZAHL_WORKER = max(1, (os.cpu_count() or 2) // 2)  # jeder Chrome braucht selbst mehrere Prozesse
+ZIEHUNG_VERSUCHE = 2
+JAHR_VERSUCHE = 2
+
+
+def scraper_eintrag(jahr, datum, seite: dict) -> dict:
+    """
+    Format wie LottoScraper.extrahiere_daten (lotto_alle_ziehungen_scraper.py).
+    """
+    zahlen = seite["zahlen"]
+    eintrag = {"datum": datum, "jahr": jahr}
+    for i in range(6):
+        eintrag[f"zahl_{i + 1}"] = zahlen[i] if len(zahlen) > i else None
+    eintrag["superzahl"] = seite["superzahl"]
+    return eintrag
+
+
+def sortierschluessel(eintrag: dict) -> tuple:
+    """
+    (Jahr, Monat, Tag) aus "dd.mm. (Wochentag)" + Jahr.
+    """
+    treffer = re.match(r"\s*(\d{1,2})\.(\d{1,2})\.", eintrag["datum"])
+    tag, monat = (int(treffer.group(1)), int(treffer.group(2))) if treffer else (0, 0)
+    return int(eintrag["jahr"]), monat, tag
+
+
+def scrape_jahr(driver, url: str, jahr) -> tuple[list, list]:
+    """
+    Alle Ziehungen eines Jahres mit einem Driver. Rückgabe: (Einträge, fehlerhafte Ziehungen).
+    Fehler beim Öffnen des Jahres werden an den Aufrufer weitergereicht (→ Wiederholung des Jahres).
+    """
+    eintraege, fehler = [], []
+    for tag_value, datum in oeffne_jahr(driver, url, jahr):
+        grund = None
+        with messung.ziehung("%04d-%02d-%02d" % sortierschluessel({"jahr": jahr, "datum": datum})) as messpunkt:
+            for versuch in range(ZIEHUNG_VERSUCHE):
+                if versuch:
+                    messpunkt.erneut()
+                try:
+                    gehe_zu_ziehung(driver, url, jahr, tag_value)
+                    with messung.spanne("extract"):
+                        seite = lies_seite(driver)
+                    if len(seite["zahlen"]) < 6:
+                        raise ValueError("Unvollständige Zahlen")
+                    eintraege.append(scraper_eintrag(jahr, datum, seite))
+                    break
+                except Exception as e:
+                    grund = e
+            else:
+                messpunkt.setze("fehler", grund=str(grund))
+                fehler.append({"jahr": jahr, "datum": datum, "tag_value": tag_value, "grund": str(grund)})
+    return eintraege, fehler
+
+
+class BrowserPool:
+    def __init__(self, anzahl_worker: int = ANZAHL_WORKER, url: str = BASE_URL, leihe_fabrik=leihe_driver):
+        """
+        anzahl_worker: parallele Headless-Browser
+        leihe_fabrik: liefert eine Leihe (core/driver_pool.py) mit .driver, .seite(), .zurueckgeben()
+        """
+        self.anzahl_worker = max(1, anzahl_worker)
+        self.url = url
+        self.leihe_fabrik = leihe_fabrik
+        self.fehlerhafte_ziehungen = []
+
+    def _worker(self, nr: int, arbeit: queue.Queue, ergebnisse: list, sperre: threading.Lock):
+        leihe = None
+        try:
+            while True:
+                try:
+                    jahr, versuch = arbeit.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    if leihe is None:
+                        leihe = self.leihe_fabrik()
+                    start = time.perf_counter()
+                    eintraege, fehler = scrape_jahr(leihe.driver, self.url, jahr)
+                    leihe.seite(len(eintraege) + len(fehler))  # ersetzt den Browser ab MAX_SEITEN
+                    print(f"[✓] Worker {nr}: Jahr {jahr} – {len(eintraege)} Ziehungen "
+                          f"({time.perf_counter() - start:.1f} s, {len(fehler)} Fehler)")
+                except Exception as e:
+                    print(f"[!] Worker {nr}: Jahr {jahr} fehlgeschlagen (Versuch {versuch}): {e.__class__.__name__}")
+                    if isinstance(e, WebDriverException) and leihe is not None:
+                        # Browser vermutlich abgestürzt → beenden, beim nächsten Jahr neu leihen
+                        leihe.zurueckgeben(kaputt=True)
+                        leihe = None
+                    if versuch < JAHR_VERSUCHE:
+                        arbeit.put((jahr, versuch + 1))
+                    else:
+                        with sperre:
+                            self.fehlerhafte_ziehungen.append({"jahr": jahr, "datum": None, "grund": str(e)})
+                    continue
+                with sperre:
+                    ergebnisse.extend(eintraege)
+                    self.fehlerhafte_ziehungen.extend(fehler)
+        finally:
+            if leihe is not None:
+                leihe.zurueckgeben()
+
+    def scrape(self, jahre) -> list:
+        """
+        Verteilt die Jahre auf die Worker und liefert alle Einträge nach Datum sortiert.
+        """
+        arbeit = queue.Queue()
+        for jahr in jahre:
+            arbeit.put((jahr, 1))
+
+        ergebnisse, sperre = [], threading.Lock()
+        hole_pool(max_browser=self.anzahl_worker)  # sonst warten Worker über MAX_BROWSER auf einen freien Browser
+        worker = [
+            threading.Thread(target=self._worker, args=(nr, arbeit, ergebnisse, sperre), daemon=True)
+            for nr in range(1, min(self.anzahl_worker, arbeit.qsize()) + 1)
+        ]
+        start = time.perf_counter()
+        for t in worker:
+            t.start()
+        for t in worker:
+            t.join()
+
+        ergebnisse.sort(key=sortierschluessel)
+        dauer = time.perf_counter() - start
+        print(f"✅ {len(ergebnisse)} Ziehungen mit {len(worker)} Browsern in {dauer:.1f} s "
+              f"({len(ergebnisse) / dauer * 60 if dauer else 0:.0f} Ziehungen/min)")
+        return ergebnisse
+
+
+def _fixture_lauf(anzahl_worker: int, anzahl_jahre: int = None):
+    """
+    Lauf gegen die lokale Fixture-Seite (core/fixture_seite.py) mit Vergleich gegen die Sollwerte.
+    anzahl_jahre: so viele Jahre bis einschließlich des letzten Fixture-Jahres (Standard: JAHRE der Fixture);
+    es laufen höchstens so viele Browser wie Jahre.
+    """
+    from core.fixture_seite import starte_server, ziehungen, JAHRE
+
+    soll = ziehungen(range(max(JAHRE) - anzahl_jahre + 1, max(JAHRE) + 1)) if anzahl_jahre else ziehungen()
+    server, url = starte_server(latenz=0.2, daten=soll)
+    try:
+        ergebnisse = BrowserPool(anzahl_worker, url).scrape(sorted(soll))
+    finally:
+        server.shutdown()
+
+    erwartet = {(jahr, e["text"]): (e["zahlen"], e["superzahl"]) for jahr, liste in soll.items() for e in liste}
+    gelesen = {(e["jahr"], e["datum"]): ([e[f"zahl_{i}"] for i in range(1, 7)], e["superzahl"]) for e in ergebnisse}
+    abweichend = [k for k in erwartet if gelesen.get(k) != erwartet[k]]
+    sortiert = ergebnisse == sorted(ergebnisse, key=sortierschluessel)
+    print(f"Fixture: {len(gelesen)}/{len(erwartet)} gelesen, {len(abweichend)} abweichend, sortiert: {sortiert}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Paralleler Abruf der Ziehungshistorie")
+    parser.add_argument("--start", type=int, default=1955)
+    parser.add_argument("--ende", type=int, default=datetime.now().year)
+    parser.add_argument("--worker", type=int, default=ANZAHL_WORKER)
+    parser.add_argument("--fixture", action="store_true", help="lokale Fixture-Seite statt lotto.de")
+    parser.add_argument("--fixture-jahre", type=int, help="Anzahl Fixture-Jahre (Standard: 2)")
+    parser.add_argument("--messen", action="store_true", help="Zeitmessung je Ziehung und Phase (JSONL-Trace)")
+    args = parser.parse_args()
+
+    if args.messen:
+        messung.aktiviere(name="browser_pool")
+    else:
+        messung.aktiviere_aus_umgebung("browser_pool")
+
+    if args.fixture:
+        _fixture_lauf(args.worker, args.fixture_jahre)
+        messung.abschluss()
+        sys.exit(0)
+
+    from model.lotto_model import ziehung_aus_scraper_eintrag, speichere_ziehungen
+
+    pool = BrowserPool(args.worker)
+    daten = pool.scrape(range(args.start, args.ende + 1))
+    speichere_ziehungen([z for z in map(ziehung_aus_scraper_eintrag, daten) if z is not None])
+
+    if pool.fehlerhafte_ziehungen:
+        os.makedirs(DATA_PATH, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        fehler_path = os.path.join(DATA_PATH, f"fehlerhafte_ziehungen_{timestamp}.json")
+        with open(fehler_path, "w", encoding="utf-8") as f:
+            json.dump(pool.fehlerhafte_ziehungen, f, ensure_ascii=False, indent=2)
+        print(f"⚠️ Fehlerhafte Ziehungen gespeichert unter: {fehler_path}")
+    messung.abschluss()
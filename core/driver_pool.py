@@ -0,0 +1,491 @@
+"""
+Modulname: driver_pool.py
+Pfad:     core/driver_pool.py
+Zweck:    Warme Chrome-Instanzen für alle Selenium-Einstiegspunkte (kein Kaltstart pro Aufruf)
+
+Beschreibung:
+Bisher startet und beendet jeder Scraper seinen eigenen Chrome (mehrere Sekunden pro Start).
+leihe_driver() gibt stattdessen einen Driver aus einem Pool aus:
+- Im Prozess: ein Pool pro Konfiguration (schlank / xhr / headless), Driver werden erst bei Bedarf
+  erzeugt, bei der Ausgabe auf Funktion geprüft, nach MAX_SEITEN Seiten oder nach einem Absturz
+  ersetzt und bei Programmende beendet
+- Daemon (python core/driver_pool.py --daemon): ein eigener Prozess hält headless Chromes mit
+  Remote-Debugging-Port warm. Läuft er, hängen sich die Scraper über debuggerAddress an einen
+  freien Browser an (Leihe über multiprocessing.connection); die Verbindung bleibt für die Dauer
+  der Leihe offen, bricht der Scraper ab, ist der Browser automatisch wieder frei.
+  Läuft kein Daemon, wird der Pool im Prozess verwendet.
+
+Verwendung:
+>>> with leihe_driver(schlank=True) as driver:
+...     driver.get(url)
+>>> python core/driver_pool.py --daemon --anzahl 2
+>>> python core/driver_pool.py --status
+>>> python core/driver_pool.py --stop
+>>> python core/driver_pool.py --messen 5     (Kaltstart vs. Pool vs. Daemon, je Auftrag eine Seite)
+"""
+
+import os
+import sys
+import time
+import atexit
+import socket
+import argparse
+import threading
+from multiprocessing.connection import Listener, Client
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+
+# Projektverzeichnis zur sys.path hinzufügen, um core/ und model/ zu importieren
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.schlanker_browser import schlanke_optionen, aktiviere_blockierung, blockier_liste
+from core.xhr_mitschnitt import aktiviere_mitschnitt
+
+CHROMEDRIVER = os.path.join("tools", "chromedriver.exe")
+
+MAX_BROWSER = 2  # gleichzeitig gehaltene Browser je Pool
+MAX_SEITEN = 300  # danach wird der Browser ersetzt (Speicher von Chrome wächst mit der Zeit)
+
+DAEMON_ADRESSE = ("127.0.0.1", 47011)
+DAEMON_SCHLUESSEL = b"extracta-driver-pool"
+
+
+def erzeuge_chrome(schlank: bool = True, xhr: bool = False, headless: bool = True,
+                   debug_port: int = None, debugger_adresse: str = None):
+    """
+    Startet Chrome (oder hängt sich mit debugger_adresse an einen laufenden an).
+    debug_port: Chrome mit --remote-debugging-port starten (für den Daemon).
+    """
+    chrome_options = Options()
+    if debugger_adresse:
+        chrome_options.debugger_address = debugger_adresse
+    else:
+        if headless:
+            chrome_options.add_argument("--headless=new")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        if schlank:
+            schlanke_optionen(chrome_options)
+        if debug_port:
+            chrome_options.add_argument(f"--remote-debugging-port={debug_port}")
+    if xhr:
+        aktiviere_mitschnitt(chrome_options)
+
+    service = Service(CHROMEDRIVER) if os.path.exists(CHROMEDRIVER) else Service()
+    driver = webdriver.Chrome(service=service, options=chrome_options)
+    if debugger_adresse:
+        # Blockierliste gilt pro Sitzung – immer neu setzen (auch leer), damit nichts vom Vorgänger bleibt
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blockier_liste() if schlank else []})
+    elif schlank:
+        aktiviere_blockierung(driver)
+    return driver
+
+
+def ist_gesund(driver) -> bool:
+    """
+    Antwortet der Browser noch? (ein kurzer execute_script-Roundtrip)
+    """
+    try:
+        return driver.execute_script("return 1") == 1
+    except WebDriverException:
+        return False
+
+
+def _beende(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+def _freier_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+# --- Pool im Prozess ---------------------------------------------------------
+
+class DriverPool:
+    def __init__(self, fabrik, max_browser: int = MAX_BROWSER, max_seiten: int = MAX_SEITEN):
+        """
+        fabrik: erzeugt einen neuen Driver (z. B. lambda: erzeuge_chrome(schlank=True))
+        """
+        self.fabrik = fabrik
+        self.max_browser = max(1, max_browser)
+        self.max_seiten = max_seiten
+        self._frei = []  # [(driver, seiten)]
+        self._ausgeliehen = {}  # id(driver) → seiten
+        self._im_start = 0  # Driver, die gerade (außerhalb der Sperre) gestartet werden
+        self._bedingung = threading.Condition()
+        self.erzeugt = 0
+        self.wiederverwendet = 0
+
+    def ausleihen(self, timeout: float = 120):
+        """
+        Gibt einen funktionierenden Driver aus (frei → prüfen; sonst neu, solange unter max_browser; sonst warten).
+        """
+        with self._bedingung:
+            ende = time.monotonic() + timeout
+            while True:
+                while self._frei:
+                    driver, seiten = self._frei.pop()
+                    if ist_gesund(driver):
+                        self._ausgeliehen[id(driver)] = seiten
+                        self.wiederverwendet += 1
+                        return driver
+                    print("[!] Browser aus dem Pool antwortet nicht mehr – wird ersetzt.")
+                    _beende(driver)
+                if len(self._ausgeliehen) + self._im_start < self.max_browser:
+                    break
+                if not self._bedingung.wait(max(0, ende - time.monotonic())):
+                    raise TimeoutError("Kein Browser im Pool frei")
+            self._im_start += 1  # Platz reservieren, Start läuft außerhalb der Sperre
+
+        try:
+            driver = self.fabrik()
+        except Exception:
+            with self._bedingung:
+                self._im_start -= 1
+                self._bedingung.notify()
+            raise
+        with self._bedingung:
+            self._im_start -= 1
+            self._ausgeliehen[id(driver)] = 0
+            self.erzeugt += 1
+        return driver
+
+    def zurueckgeben(self, driver, seiten: int = 1, kaputt: bool = False):
+        """
+        Nimmt den Driver zurück. Nach max_seiten Seiten oder bei kaputt=True wird er beendet.
+        """
+        with self._bedingung:
+            gesamt = self._ausgeliehen.get(id(driver), 0) + seiten
+        behalten = not kaputt and gesamt < self.max_seiten
+        if behalten:
+            try:
+                driver.get("about:blank")  # Seitenzustand (Beobachter, Formulare) nicht an den Nächsten weitergeben
+            except WebDriverException:
+                behalten = False
+        if not behalten:
+            _beende(driver)
+        with self._bedingung:
+            self._ausgeliehen.pop(id(driver), None)
+            if behalten:
+                self._frei.append((driver, gesamt))
+            self._bedingung.notify()
+
+    def schliessen(self):
+        with self._bedingung:
+            frei, self._frei = self._frei, []
+        for driver, _ in frei:
+            _beende(driver)
+
+
+# Ein Pool pro Konfiguration (schlank, xhr, headless)
+_POOLS: dict[tuple, DriverPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def hole_pool(schlank: bool = True, xhr: bool = False, headless: bool = True,
+              max_browser: int = None) -> DriverPool:
+    """
+    max_browser: Obergrenze mindestens auf diesen Wert anheben (z. B. für parallele Worker).
+    """
+    schluessel = (schlank, xhr, headless)
+    with _POOLS_LOCK:
+        if schluessel not in _POOLS:
+            _POOLS[schluessel] = DriverPool(lambda: erzeuge_chrome(schlank, xhr, headless))
+        pool = _POOLS[schluessel]
+    if max_browser and max_browser > pool.max_browser:
+        with pool._bedingung:
+            pool.max_browser = max_browser
+            pool._bedingung.notify_all()
+    return pool
+
+
+@atexit.register
+def schliesse_pools():
+    for pool in list(_POOLS.values()):
+        pool.schliessen()
+
+
+# --- Leihe (Daemon oder Pool im Prozess) -----------------------------------
+
+class Leihe:
+    """
+    Ein ausgeliehener Driver. Als Kontextmanager oder mit zurueckgeben() verwenden.
+    Scraper melden mit seite() ihre Seiten/Ziehungen; nach max_seiten wird der Browser
+    mitten in der Leihe ersetzt (lange Backfills halten eine Leihe für den ganzen Lauf).
+    """
+
+    def __init__(self, schlank: bool = True, xhr: bool = False, headless: bool = True,
+                 max_seiten: int = MAX_SEITEN):
+        self.schlank, self.xhr, self.headless = schlank, xhr, headless
+        self.max_seiten = max_seiten
+        self.ersetzt = 0
+        self._ausleihen()
+
+    def _ausleihen(self):
+        self.seiten = 0
+        self._pool = None
+        self._verbindung, adresse = _daemon_leihe() if self.headless else (None, None)
+        if self._verbindung is not None:
+            try:
+                self.driver = erzeuge_chrome(self.schlank, self.xhr, debugger_adresse=adresse)
+                print(f"[✓] Warmer Browser vom Daemon ({adresse})")
+                return
+            except WebDriverException as e:
+                print(f"[!] Anhängen an den Daemon-Browser fehlgeschlagen: {e.__class__.__name__}")
+                self._melde_daemon(kaputt=True)
+        self._pool = hole_pool(self.schlank, self.xhr, self.headless)
+        self.driver = self._pool.ausleihen()
+
+    def seite(self, anzahl: int = 1) -> bool:
+        """
+        Zählt Seiten/Ziehungen. Ab max_seiten wird der Browser zurückgegeben (und dort ersetzt)
+        und ein frischer ausgeliehen. Rückgabe: True, wenn sich self.driver geändert hat –
+        der Aufrufer muss dann seinen Driver (und z. B. den XHR-Mitschnitt) neu setzen.
+        """
+        self.seiten += anzahl
+        if self.driver is None or self.seiten < self.max_seiten:
+            return False
+        print(f"[✓] {self.seiten} Seiten mit diesem Browser – wird ersetzt")
+        self.zurueckgeben(kaputt=True)  # kaputt=True: nicht in den Pool zurück, sondern beenden
+        self._ausleihen()
+        self.ersetzt += 1
+        return True
+
+    def _melde_daemon(self, kaputt: bool):
+        try:
+            self._verbindung.send({"befehl": "zurueck", "seiten": max(1, self.seiten), "kaputt": kaputt})
+            self._verbindung.close()
+        except (OSError, EOFError):
+            pass
+        self._verbindung = None
+
+    def zurueckgeben(self, kaputt: bool = False):
+        if self.driver is None:
+            return
+        kaputt = kaputt or not ist_gesund(self.driver)
+        if self._verbindung is not None:
+            # Nur die eigene chromedriver-Sitzung beenden; der Browser gehört dem Daemon
+            if not kaputt:
+                try:
+                    self.driver.get("about:blank")
+                except WebDriverException:
+                    kaputt = True
+            _beende(self.driver)
+            self._melde_daemon(kaputt)
+        else:
+            self._pool.zurueckgeben(self.driver, max(1, self.seiten), kaputt)
+        self.driver = None
+
+    def __enter__(self):
+        return self.driver
+
+    def __exit__(self, typ, wert, tb):
+        self.zurueckgeben(kaputt=isinstance(wert, WebDriverException))
+        return False
+
+
+def leihe_driver(schlank: bool = True, xhr: bool = False, headless: bool = True,
+                 max_seiten: int = MAX_SEITEN) -> Leihe:
+    """
+    Warmer Chrome für einen Scraper: vom Daemon (falls er läuft und headless gewünscht ist),
+    sonst aus dem Pool im Prozess.
+    """
+    return Leihe(schlank, xhr, headless, max_seiten)
+
+
+def _daemon_leihe():
+    """
+    (Verbindung mit offener Leihe, debuggerAddress) beim Daemon;
+    (None, None) wenn keiner läuft oder alle Browser belegt sind.
+    """
+    try:
+        verbindung = Client(DAEMON_ADRESSE, authkey=DAEMON_SCHLUESSEL)
+    except OSError:
+        return None, None
+    try:
+        verbindung.send({"befehl": "ausleihen"})
+        antwort = verbindung.recv() if verbindung.poll(30) else {"fehler": "keine Antwort"}
+    except (EOFError, OSError) as e:
+        antwort = {"fehler": e.__class__.__name__}
+    if "fehler" in antwort:
+        print(f"[!] Daemon: {antwort['fehler']} – starte Browser lokal")
+        verbindung.close()
+        return None, None
+    return verbindung, antwort["adresse"]
+
+
+# --- Daemon -----------------------------------------------------------------
+
+class DriverDaemon:
+    def __init__(self, anzahl: int = MAX_BROWSER, max_seiten: int = MAX_SEITEN):
+        self.anzahl = max(1, anzahl)
+        self.max_seiten = max_seiten
+        self.browser = {}  # Port → {"driver", "seiten", "belegt"}
+        self._sperre = threading.Lock()
+        self._laeuft = True
+
+    def _starte_browser(self) -> int:
+        port = _freier_port()
+        driver = erzeuge_chrome(schlank=True, headless=True, debug_port=port)
+        self.browser[port] = {"driver": driver, "seiten": 0, "belegt": False}
+        print(f"[✓] Browser gestartet (Port {port})")
+        return port
+
+    def _ersetzen(self, port: int):
+        _beende(self.browser.pop(port)["driver"])
+        self._starte_browser()
+
+    def _freier_browser(self):
+        with self._sperre:
+            for port, b in list(self.browser.items()):
+                if not b["belegt"]:
+                    if not ist_gesund(b["driver"]):
+                        print(f"[!] Browser auf Port {port} antwortet nicht – wird ersetzt")
+                        self._ersetzen(port)
+                        continue
+                    b["belegt"] = True
+                    return port
+            if len(self.browser) < self.anzahl:
+                port = self._starte_browser()
+                self.browser[port]["belegt"] = True
+                return port
+        return None
+
+    def _zurueck(self, port: int, seiten: int, kaputt: bool):
+        with self._sperre:
+            b = self.browser.get(port)
+            if b is None:
+                return
+            b["seiten"] += seiten
+            b["belegt"] = False
+            if kaputt or b["seiten"] >= self.max_seiten or not ist_gesund(b["driver"]):
+                print(f"[✓] Browser auf Port {port} wird ersetzt ({b['seiten']} Seiten{', defekt' if kaputt else ''})")
+                self._ersetzen(port)
+
+    def _bediene(self, verbindung):
+        port = None
+        try:
+            anfrage = verbindung.recv()
+            befehl = anfrage.get("befehl")
+            if befehl == "status":
+                with self._sperre:
+                    verbindung.send({p: {"seiten": b["seiten"], "belegt": b["belegt"]} for p, b in self.browser.items()})
+            elif befehl == "stop":
+                self._laeuft = False
+                verbindung.send({"ok": True})
+                Client(DAEMON_ADRESSE, authkey=DAEMON_SCHLUESSEL).close()  # weckt accept() in laufen()
+            elif befehl == "ausleihen":
+                port = self._freier_browser()
+                if port is None:
+                    verbindung.send({"fehler": "alle Browser belegt"})
+                    return
+                verbindung.send({"adresse": f"127.0.0.1:{port}"})
+                # Verbindung bleibt bis zur Rückgabe offen; Abbruch des Scrapers = Rückgabe
+                try:
+                    rueckgabe = verbindung.recv()
+                except (EOFError, OSError):
+                    rueckgabe = {"seiten": 1, "kaputt": False}
+                self._zurueck(port, rueckgabe.get("seiten", 1), rueckgabe.get("kaputt", False))
+        except (EOFError, OSError):
+            pass
+        finally:
+            verbindung.close()
+
+    def laufen(self):
+        with self._sperre:
+            for _ in range(self.anzahl):
+                self._starte_browser()  # vorwärmen
+        listener = Listener(DAEMON_ADRESSE, authkey=DAEMON_SCHLUESSEL)
+        print(f"✅ Driver-Daemon bereit auf {DAEMON_ADRESSE[0]}:{DAEMON_ADRESSE[1]} ({self.anzahl} Browser)")
+        try:
+            while self._laeuft:
+                verbindung = listener.accept()
+                if not self._laeuft:
+                    verbindung.close()
+                    break
+                threading.Thread(target=self._bediene, args=(verbindung,), daemon=True).start()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            listener.close()
+            for b in self.browser.values():
+                _beende(b["driver"])
+            print("[✓] Driver-Daemon beendet")
+
+
+def _an_daemon(befehl: str):
+    verbindung = Client(DAEMON_ADRESSE, authkey=DAEMON_SCHLUESSEL)
+    verbindung.send({"befehl": befehl})
+    antwort = verbindung.recv()
+    verbindung.close()
+    return antwort
+
+
+def messe_start(anzahl: int = 5, url: str = "data:text/html,<p>extracta</p>") -> dict:
+    """
+    Dauer eines kurzen Auftrags (Browser holen, eine Seite laden, abgeben) – je `anzahl` Mal
+    mit eigenem Chrome wie bisher, aus dem Pool im Prozess und vom Daemon (nur wenn er läuft).
+    Rückgabe: {Verfahren: s/Auftrag}.
+    """
+    def kalt():
+        driver = erzeuge_chrome(schlank=True)
+        driver.get(url)
+        _beende(driver)
+
+    def pool():
+        p = hole_pool(schlank=True)
+        driver = p.ausleihen()
+        driver.get(url)
+        p.zurueckgeben(driver)
+
+    def daemon():
+        leihe = Leihe(schlank=True)
+        if leihe._verbindung is None:
+            leihe.zurueckgeben()
+            raise RuntimeError("kein Daemon")
+        leihe.driver.get(url)
+        leihe.zurueckgeben()
+
+    ergebnisse = {}
+    for name, auftrag in (("Kaltstart (eigener Chrome)", kalt), ("Pool im Prozess", pool), ("Daemon", daemon)):
+        try:
+            auftrag()  # erster Auftrag füllt Pool/Daemon-Verbindung, zählt nicht
+            start = time.perf_counter()
+            for _ in range(anzahl):
+                auftrag()
+        except RuntimeError:
+            print(f"{name:<28} übersprungen (python core/driver_pool.py --daemon starten)")
+            continue
+        ergebnisse[name] = (time.perf_counter() - start) / anzahl
+        print(f"{name:<28} {ergebnisse[name]:6.2f} s/Auftrag")
+    return ergebnisse
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Warme Chrome-Instanzen für die Selenium-Scraper")
+    parser.add_argument("--daemon", action="store_true", help="Browser warm halten, bis --stop")
+    parser.add_argument("--anzahl", type=int, default=MAX_BROWSER)
+    parser.add_argument("--max-seiten", type=int, default=MAX_SEITEN)
+    parser.add_argument("--status", action="store_true")
+    parser.add_argument("--stop", action="store_true")
+    parser.add_argument("--messen", type=int, metavar="N", help="Startzeiten messen (N Aufträge je Verfahren)")
+    args = parser.parse_args()
+
+    if args.messen:
+        messe_start(args.messen)
+    elif args.daemon:
+        DriverDaemon(args.anzahl, args.max_seiten).laufen()
+    elif args.status or args.stop:
+        try:
+            print(_an_daemon("stop" if args.stop else "status"))
+        except OSError:
+            print("[!] Kein Driver-Daemon erreichbar.")
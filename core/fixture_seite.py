@@ -0,0 +1,454 @@
+"""
+Modulname: fixture_seite.py
+Pfad:     core/fixture_seite.py
+Zweck:    Lokale Nachbildung der lotto.de-Ziehungsseite für Selenium-Tests und Latenzmessungen
+
+Beschreibung:
+Ein kleiner http.server liefert eine Seite mit denselben Selektoren wie lotto.de
+(Jahres-/Tages-Dropdown, .DrawNumbersCollection__container mit .LottoBall-Kugeln).
+Jahres- und Tageswechsel werden – wie auf der echten Seite – verzögert per JavaScript
+nachgeladen; die Kugeln werden nacheinander ausgetauscht (halb gerenderte Zustände
+wie beim Screenshot-Problem sind also möglich).
+
+Die Ziehungen sind deterministisch (Zufall mit festem Seed) und über ziehungen()
+abrufbar, so dass gescrapte Werte direkt verglichen werden können.
+
+Wie auf lotto.de kommen die Zahlen einer Ziehung als JSON (fetch auf /api/…/draws/<Datum>) und
+werden erst danach gerendert – damit lässt sich auch der XHR-Mitschnitt (core/xhr_mitschnitt.py) prüfen.
+Dieselben Endpunkte (…/draws/<Datum>, …/last) nutzt der browserlose Abruf (core/lotto_api.py);
+starte_aufnahme_server() spielt stattdessen mit --aufnehmen gespeicherte Rohantworten ab.
+
+Für die statischen Scraper (core/lotto_scraper.py, core/lotto_statistik_scraper.py) gibt es
+ziehung_html()/statistik_html() mit deren Selektoren und starte_seiten_server(), der beliebige
+Seiten mit je eigener Verzögerung ausliefert (core/paralleler_abruf.py --fixture).
+
+Mit schwer=True lädt die Seite zusätzlich Bilder, eine Webfont und ein „Tracking-Skript“
+von einem anderen Host (localhost statt 127.0.0.1), jeweils ohne Cache – wie ein erster Besuch.
+
+Messung (benötigt Chrome + Selenium):
+>>> python core/fixture_seite.py --ziehungen 10 --latenz 0.3
+>>> python core/fixture_seite.py --blockierung --ziehungen 10     (schlanker Browser vs. normal)
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from datetime import date, datetime, timedelta, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+WOCHENTAGE = ["Montag", "Dienstag", "Mittwoch", "Donnerstag", "Freitag", "Samstag", "Sonntag"]
+JAHRE = (2023, 2024)
+
+
+def ziehungen(jahre=JAHRE, seed: int = 49) -> dict:
+    """
+    {Jahr: [{"value": ISO-Datum, "text": "dd.mm. (Wochentag)", "zahlen": [...], "superzahl": n}, …]}
+    Ziehungen mittwochs und samstags, neueste zuerst (wie im Dropdown).
+    """
+    zufall = random.Random(seed)
+    daten = {}
+    for jahr in jahre:
+        tag = date(jahr, 1, 1)
+        eintraege = []
+        while tag.year == jahr:
+            if tag.weekday() in (2, 5):
+                eintraege.append({
+                    "value": tag.isoformat(),
+                    "text": f"{tag:%d.%m.} ({WOCHENTAGE[tag.weekday()]})",
+                    "zahlen": sorted(zufall.sample(range(1, 50), 6)),
+                    "superzahl": zufall.randrange(10),
+                })
+            tag += timedelta(days=1)
+        daten[jahr] = eintraege[::-1]
+    return daten
+
+
+_SEITE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Lotto 6aus49 – Fixture</title>__ASSETS_KOPF__</head>
+<body>
+__ASSETS__
+<select id="selectedYear-select-1"></select>
+<select id="daySelect-select-1"></select>
+<div class="DrawNumbersCollection__container" id="zahlen"></div>
+<div class="DrawNumbersCollection__container" id="superzahl"></div>
+<script>
+var DATEN = __DATEN__;
+var LATENZ = __LATENZ__;
+var jahrSel = document.getElementById('selectedYear-select-1');
+var tagSel = document.getElementById('daySelect-select-1');
+
+function kugeln(id, werte, schritt) {
+  var c = document.getElementById(id);
+  werte.forEach(function (w, i) {
+    setTimeout(function () {
+      var k = c.children[i];
+      if (!k) { k = document.createElement('span'); k.className = 'LottoBall'; c.appendChild(k); }
+      k.textContent = String(w);
+    }, i * schritt);
+  });
+}
+function zeigeZiehung(jahr, value) {
+  fetch('/api/stats/entities.lotto/draws/' + value).then(function (r) { return r.json(); }).then(function (z) {
+    var zahlen = [], superzahl = [];
+    z.drawNumbersCollection.forEach(function (n) {
+      (n.drawNumberType === 'SUPER_NUMBER' ? superzahl : zahlen).push(n.drawNumber);
+    });
+    setTimeout(function () {
+      kugeln('zahlen', zahlen, 30);
+      kugeln('superzahl', superzahl, 0);
+    }, LATENZ);
+  });
+}
+function ladeTage(jahr, sofort) {
+  setTimeout(function () {
+    tagSel.innerHTML = '';
+    DATEN[jahr].forEach(function (e) {
+      var o = document.createElement('option'); o.value = e.value; o.text = e.text; tagSel.appendChild(o);
+    });
+    zeigeZiehung(jahr, tagSel.value);
+  }, sofort ? 0 : LATENZ);
+}
+Object.keys(DATEN).sort().reverse().forEach(function (j) {
+  var o = document.createElement('option'); o.value = j; o.text = j; jahrSel.appendChild(o);
+});
+jahrSel.addEventListener('change', function () { ladeTage(jahrSel.value, false); });
+tagSel.addEventListener('change', function () { zeigeZiehung(jahrSel.value, tagSel.value); });
+ladeTage(jahrSel.value, true);
+</script>
+</body></html>
+"""
+
+
+# Schwere Assets: Pfad → (Content-Type, Größe in Bytes)
+ASSETS = {
+    **{f"/assets/teaser_{i}.jpg": ("image/jpeg", 250_000) for i in range(6)},
+    "/assets/logo.svg": ("image/svg+xml", 40_000),
+    "/assets/schrift.woff2": ("font/woff2", 120_000),
+    "/tracking/gtm.js": ("application/javascript", 180_000),
+}
+
+
+API_PFAD = "/api/stats/entities.lotto/draws/"
+LETZTE_PFAD = "/api/stats/entities.lotto/last"
+
+
+def payload(eintrag: dict) -> dict:
+    """
+    JSON-Antwort einer Ziehung im Stil der lotto.de-API (Datum als ms-Zeitstempel, Zahlen als Objekte).
+    Die Quoten sind aus den Zahlen abgeleitet, damit sie deterministisch bleiben.
+    """
+    tag = date.fromisoformat(eintrag["value"])
+    zeitstempel = int(datetime(tag.year, tag.month, tag.day, 18, 25, tzinfo=timezone.utc).timestamp() * 1000)
+    nummern = [{"drawNumber": z, "drawNumberType": "LOTTO_NUMBER"} for z in eintrag["zahlen"]]
+    nummern.append({"drawNumber": eintrag["superzahl"], "drawNumberType": "SUPER_NUMBER"})
+    basis = sum(eintrag["zahlen"])
+    return {
+        "drawDate": zeitstempel,
+        "drawNumbersCollection": nummern,
+        "oddsCollection": [{"winningClassDescription": k, "odds": basis * 10 ** (10 - k)} for k in range(1, 10)],
+    }
+
+
+def _assets_html(port: int) -> tuple[str, str]:
+    bilder = "".join(f'<img src="{p}" width="10" height="10">' for p in ASSETS if p.startswith("/assets/") and "schrift" not in p)
+    kopf = ('<style>@font-face { font-family: Fixture; src: url(/assets/schrift.woff2); }'
+            ' body { font-family: Fixture, sans-serif; }</style>'
+            f'<script async src="http://localhost:{port}/tracking/gtm.js"></script>')
+    return kopf, bilder
+
+
+def starte_server(latenz: float = 0.3, port: int = 0, daten: dict = None, schwer: bool = False):
+    """
+    Startet den Fixture-Server im Hintergrund. Rückgabe: (server, URL).
+    schwer=True: Seite lädt zusätzlich ASSETS (jeweils mit `latenz` verzögert).
+    server.shutdown() beendet ihn.
+    """
+    daten = ziehungen() if daten is None else daten
+    nach_value = {e["value"]: e for liste in daten.values() for e in liste}
+    server = ThreadingHTTPServer(("127.0.0.1", port), BaseHTTPRequestHandler)
+    kopf, bilder = _assets_html(server.server_port) if schwer else ("", "")
+    seite = (_SEITE.replace("__DATEN__", json.dumps(daten))
+             .replace("__LATENZ__", str(int(latenz * 1000)))
+             .replace("__ASSETS_KOPF__", kopf)
+             .replace("__ASSETS__", bilder)).encode("utf-8")
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            pfad = self.path.split("?")[0]
+            if pfad.startswith(API_PFAD) or pfad == LETZTE_PFAD:
+                eintrag = nach_value.get(pfad[len(API_PFAD):]) if pfad != LETZTE_PFAD else max(
+                    nach_value.values(), key=lambda e: e["value"], default=None)
+                antwort = json.dumps(payload(eintrag) if eintrag else {}).encode("utf-8")
+                self.send_response(200 if eintrag else 404)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(antwort)))
+                self.end_headers()
+                self.wfile.write(antwort)
+                return
+            if pfad in ASSETS:
+                typ, groesse = ASSETS[pfad]
+                time.sleep(latenz)
+                self.send_response(200)
+                self.send_header("Content-Type", typ)
+                self.send_header("Content-Length", str(groesse))
+                self.send_header("Cache-Control", "no-store")
+                self.send_header("Timing-Allow-Origin", "*")  # sonst meldet Resource Timing 0 Bytes für Fremd-Hosts
+                self.end_headers()
+                self.wfile.write(b"\0" * groesse)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(seite)))
+            self.end_headers()
+            self.wfile.write(seite)
+
+        def log_message(self, *args):
+            pass
+
+    server.RequestHandlerClass = Handler
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/lotto-6aus49/lottozahlen"
+
+
+def ziehung_html(eintrag: dict = None, rahmen: str = "") -> str:
+    """
+    Seite mit den Selektoren von parse_lottoziehung (time, .lotto-zahlen, .lotto-superzahl, .gewinnquoten).
+    rahmen: vorhandenes HTML (z. B. eine gespeicherte lotto.de-Seite), in das der Block eingefügt wird.
+    """
+    eintrag = eintrag or ziehungen()[max(JAHRE)][0]
+    quoten = payload(eintrag)["oddsCollection"]
+    block = (
+        f'<time datetime="{eintrag["value"]}">{eintrag["text"]}</time>'
+        '<div class="lotto-zahlen">' + "".join(f'<span class="zahl">{z}</span>' for z in eintrag["zahlen"]) + "</div>"
+        f'<div class="lotto-superzahl"><span class="zahl">{eintrag["superzahl"]}</span></div>'
+        '<div class="gewinnquoten">' + "".join(
+            f'<div class="gewinnreihe"><span class="klasse">Klasse {q["winningClassDescription"]}</span>'
+            f'<span class="gewinnbetrag">{q["odds"] / 100:.2f} €</span></div>' for q in quoten) + "</div>"
+    )
+    return _einbetten(block, rahmen)
+
+
+def statistik_html(haeufigkeiten: dict = None, rahmen: str = "") -> str:
+    """
+    Seite mit den Selektoren von parse_haeufigkeiten (.StatisticsBar, .LottoBall__circle, .StatisticsBar__count).
+    Standard: Häufigkeiten aus den Fixture-Ziehungen.
+    """
+    if haeufigkeiten is None:
+        haeufigkeiten = {z: 0 for z in range(1, 50)}
+        for liste in ziehungen().values():
+            for e in liste:
+                for z in e["zahlen"]:
+                    haeufigkeiten[z] += 1
+    block = "".join(
+        f'<div class="StatisticsBar"><span class="LottoBall__circle" aria-label="{z}">{z}</span>'
+        f'<span class="StatisticsBar__count">{n}×</span></div>'
+        for z, n in sorted(haeufigkeiten.items())
+    )
+    return _einbetten(block, rahmen)
+
+
+def _einbetten(block: str, rahmen: str) -> str:
+    if "</body>" in rahmen:
+        return rahmen.replace("</body>", block + "</body>", 1)
+    return f"<!DOCTYPE html><html><head><meta charset='utf-8'></head><body>{rahmen}{block}</body></html>"
+
+
+def starte_seiten_server(seiten: dict, port: int = 0):
+    """
+    Stand-in für statische Seiten: {Pfad: (HTML, Verzögerung in Sekunden)}, sonst 404.
+    Rückgabe: (server, Basis-URL).
+    """
+    kodiert = {pfad: (html.encode("utf-8"), latenz) for pfad, (html, latenz) in seiten.items()}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            seite = kodiert.get(self.path.split("?")[0])
+            if seite is None:
+                self.send_error(404)
+                return
+            inhalt, latenz = seite
+            time.sleep(latenz)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(inhalt)))
+            self.end_headers()
+            self.wfile.write(inhalt)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def starte_aufnahme_server(verzeichnis, port: int = 0):
+    """
+    Stand-in für die JSON-Endpunkte: liefert die mit `python core/lotto_api.py --aufnehmen DIR`
+    gespeicherten Rohantworten (Dateiname = URL-Pfad mit "__" statt "/"), sonst 404.
+    Rückgabe: (server, Basis-URL).
+    """
+    verzeichnis = os.path.abspath(verzeichnis)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            datei = os.path.join(verzeichnis, self.path.split("?")[0].strip("/").replace("/", "__") + ".json")
+            antwort = b"{}"
+            if os.path.isfile(datei):
+                with open(datei, "rb") as f:
+                    antwort = f.read()
+            self.send_response(200 if os.path.isfile(datei) else 404)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(antwort)))
+            self.end_headers()
+            self.wfile.write(antwort)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def _lade_mit_pausen(driver, url, jahr, tag_value):
+    """
+    Bisheriges Verfahren (feste Pausen, Vergleich nur der ersten Kugel) – nur für die Messung.
+    """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait, Select
+
+    driver.get(url)
+    time.sleep(2)
+    Select(driver.find_element(By.CSS_SELECTOR, "select[id^='selectedYear-select']")).select_by_value(str(jahr))
+    time.sleep(1)
+    Select(driver.find_element(By.CSS_SELECTOR, "select[id^='daySelect-select']")).select_by_value(tag_value)
+    alte_zahl = driver.find_elements(By.CSS_SELECTOR, ".DrawNumbersCollection__container .LottoBall")[0].text
+    WebDriverWait(driver, 10).until(
+        lambda d: d.find_elements(By.CSS_SELECTOR, ".DrawNumbersCollection__container .LottoBall")[0].text != alte_zahl)
+    time.sleep(0.5)
+
+
+def _lade_mit_bedingungen(driver, url, jahr, tag_value):
+    from core.selenium_werkzeuge import lade_seite, waehle_jahr, waehle_tag
+
+    lade_seite(driver, url)
+    waehle_jahr(driver, jahr)
+    waehle_tag(driver, tag_value)
+
+
+def _lade_in_der_seite(driver, url, jahr, tag_value):
+    from core.selenium_werkzeuge import gehe_zu_ziehung
+
+    gehe_zu_ziehung(driver, url, jahr, tag_value)
+
+
+def _gelesen(driver) -> tuple:
+    from core.selenium_werkzeuge import ziehungs_zustand
+
+    signatur, _ = ziehungs_zustand(driver)
+    zahlen, _, superzahl = signatur.partition("|")
+    return [int(z) for z in zahlen.split(",") if z], int(superzahl) if superzahl else None
+
+
+def messe_latenz(driver, anzahl: int = 10, latenz: float = 0.3) -> dict:
+    """
+    Lädt `anzahl` Ziehungen (älteres Jahr, damit Jahr und Tag wirklich wechseln) mit den alten
+    festen Pausen, mit den Wartebedingungen und mit Navigation innerhalb der Seite.
+    Rückgabe: {Verfahren: (s/Ziehung, Fehler)}.
+    """
+    daten = ziehungen()
+    server, url = starte_server(latenz, daten=daten)
+    jahr = min(daten)
+    auswahl = daten[jahr][1:anzahl + 1]
+    ergebnisse = {}
+    try:
+        verfahren = (
+            ("vorher (time.sleep)", _lade_mit_pausen),
+            ("nachher (Bedingungen)", _lade_mit_bedingungen),
+            ("in der Seite navigieren", _lade_in_der_seite),
+        )
+        for name, laden in verfahren:
+            driver.get("about:blank")  # jedes Verfahren startet ohne geöffnete Seite
+            fehler = 0
+            start = time.perf_counter()
+            for eintrag in auswahl:
+                laden(driver, url, jahr, eintrag["value"])
+                if _gelesen(driver) != (eintrag["zahlen"], eintrag["superzahl"]):
+                    fehler += 1
+            pro_ziehung = (time.perf_counter() - start) / len(auswahl)
+            ergebnisse[name] = (pro_ziehung, fehler)
+            print(f"{name:<24} {pro_ziehung:6.2f} s/Ziehung   falsch gelesen: {fehler}/{len(auswahl)}")
+    finally:
+        server.shutdown()
+    return ergebnisse
+
+
+def messe_blockierung(driver_normal, driver_schlank, anzahl: int = 10, latenz: float = 0.1) -> dict:
+    """
+    Lädt `anzahl` Ziehungen der schweren Fixture-Seite jeweils komplett neu (wie neu_laden=True)
+    mit einem normalen und einem schlanken Browser (core/schlanker_browser.py).
+    Rückgabe: {Name: (s/Ziehung, Bytes/Ziehung, Fehler)}.
+    """
+    from core.selenium_werkzeuge import lade_seite, waehle_jahr, waehle_tag
+    from core.schlanker_browser import uebertragene_bytes
+
+    daten = ziehungen()
+    server, url = starte_server(latenz, daten=daten, schwer=True)
+    jahr = min(daten)
+    auswahl = daten[jahr][1:anzahl + 1]
+    ergebnisse = {}
+    try:
+        for name, driver in (("normal", driver_normal), ("schlank (CDP-Blockierung)", driver_schlank)):
+            driver.get("about:blank")
+            fehler, summe_bytes = 0, 0
+            start = time.perf_counter()
+            for eintrag in auswahl:
+                lade_seite(driver, url)
+                summe_bytes += uebertragene_bytes(driver)
+                waehle_jahr(driver, jahr)
+                waehle_tag(driver, eintrag["value"])
+                if _gelesen(driver) != (eintrag["zahlen"], eintrag["superzahl"]):
+                    fehler += 1
+            pro_ziehung = (time.perf_counter() - start) / len(auswahl)
+            ergebnisse[name] = (pro_ziehung, summe_bytes / len(auswahl), fehler)
+            print(f"{name:<26} {pro_ziehung:6.2f} s/Ziehung   {summe_bytes / len(auswahl) / 1024:8.0f} KiB/Ziehung"
+                  f"   falsch gelesen: {fehler}/{len(auswahl)}")
+    finally:
+        server.shutdown()
+    return ergebnisse
+
+
+if __name__ == "__main__":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from core.driver_pool import erzeuge_chrome  # gemessen wird genau die Browser-Konfiguration der Scraper
+
+    parser = argparse.ArgumentParser(description="Latenzmessung der Selenium-Wartestrategie an der Fixture-Seite")
+    parser.add_argument("--ziehungen", type=int, default=10)
+    parser.add_argument("--latenz", type=float, default=0.3, help="simulierte Ladezeit der Seite in Sekunden")
+    parser.add_argument("--blockierung", action="store_true", help="schlanken Browser (CDP-Blockierung) messen")
+    args = parser.parse_args()
+
+    if args.blockierung:
+        normal = erzeuge_chrome(schlank=False)
+        schlank = erzeuge_chrome(schlank=True)
+        try:
+            messe_blockierung(normal, schlank, args.ziehungen, args.latenz)
+        finally:
+            normal.quit()
+            schlank.quit()
+        sys.exit(0)
+
+    driver = erzeuge_chrome(schlank=False)
+    try:
+        ergebnisse = messe_latenz(driver, args.ziehungen, args.latenz)
+        vorher = next(iter(ergebnisse.values()))[0]
+        for name, (pro_ziehung, _) in list(ergebnisse.items())[1:]:
+            print(f"{name}: ×{vorher / pro_ziehung:.1f} – Hochrechnung für ~6.000 Ziehungen: "
+                  f"{vorher * 6000 / 3600:.1f} h → {pro_ziehung * 6000 / 3600:.1f} h")
+    finally:
+        driver.quit()
@@ -0,0 +1,117 @@
+"""
+Modulname: fortschritt_journal.py
+Pfad:     core/fortschritt_journal.py
+Zweck:    Checkpoint-Journal für lange Scraper-Läufe (Ziehungshistorie 1955 – heute)
+
+Beschreibung:
+Jede erfolgreich gelesene Ziehung wird sofort als eine Zeile (JSONL) angehängt, abgeschlossene
+Jahre bekommen eine eigene Markierung. Bricht ein Lauf ab (z. B. im Jahr 1990), überspringt
+der nächste Lauf alles, was schon im Journal steht.
+- Im Speicher werden nur die Schlüssel (Jahr, tag_value) gehalten, nicht die Ziehungen
+  → konstanter Speicherbedarf, egal wie viele Jahre gescrapt werden
+- Die Einträge werden am Ende per Generator aus der Datei gelesen (eintraege())
+- Eine beim Absturz abgeschnittene letzte Zeile wird beim Laden ignoriert
+
+Datei: data/fortschritt/<name>.jsonl
+"""
+
+import os
+import json
+from pathlib import Path
+
+FORTSCHRITT_DIR = Path(__file__).resolve().parent.parent / "data" / "fortschritt"
+
+
+class FortschrittsJournal:
+    def __init__(self, name: str, verzeichnis: Path = FORTSCHRITT_DIR):
+        self.pfad = Path(verzeichnis) / f"{name}.jsonl"
+        self._erledigt = set()  # (Jahr, tag_value)
+        self._jahre = set()  # vollständig abgeschlossene Jahre
+        self._datei = None
+        self._laden()
+
+    def _laden(self):
+        if not self.pfad.exists():
+            return
+        for zeile in self._zeilen():
+            if zeile.get("jahr_fertig"):
+                self._jahre.add(int(zeile["jahr"]))
+            else:
+                self._erledigt.add((int(zeile["jahr"]), str(zeile["tag_value"])))
+        if self._erledigt or self._jahre:
+            print(f"[✓] Checkpoint geladen: {len(self._erledigt)} Ziehungen, "
+                  f"{len(self._jahre)} abgeschlossene Jahre ({self.pfad})")
+
+    def _zeilen(self):
+        with open(self.pfad, "r", encoding="utf-8") as f:
+            for zeile in f:
+                zeile = zeile.strip()
+                if not zeile:
+                    continue
+                try:
+                    yield json.loads(zeile)
+                except json.JSONDecodeError:
+                    print(f"[!] Unlesbare Checkpoint-Zeile übersprungen: {self.pfad}")
+
+    def _anhaengen(self, daten: dict):
+        if self._datei is None:
+            self.pfad.parent.mkdir(parents=True, exist_ok=True)
+            self._datei = open(self.pfad, "a", encoding="utf-8")
+            if self._datei.tell() and not self.pfad.read_bytes().endswith(b"\n"):
+                self._datei.write("\n")  # abgeschnittene letzte Zeile eines abgebrochenen Laufs abschließen
+        self._datei.write(json.dumps(daten, ensure_ascii=False) + "\n")
+        self._datei.flush()
+        os.fsync(self._datei.fileno())  # eine Ziehung dauert Sekunden – fsync fällt nicht ins Gewicht
+
+    # --- Abfragen ------------------------------------------------------------
+
+    def ist_erledigt(self, jahr, tag_value) -> bool:
+        return (int(jahr), str(tag_value)) in self._erledigt
+
+    def jahr_erledigt(self, jahr) -> bool:
+        return int(jahr) in self._jahre
+
+    def eintraege(self, jahr=None):
+        """
+        Liest die gespeicherten Ziehungen aus der Datei (Generator), optional nur eines Jahres.
+        """
+        if self._datei is not None:
+            self._datei.flush()
+        if not self.pfad.exists():
+            return
+        for zeile in self._zeilen():
+            if zeile.get("jahr_fertig") or (jahr is not None and int(zeile["jahr"]) != int(jahr)):
+                continue
+            yield zeile["eintrag"]
+
+    # --- Schreiben -----------------------------------------------------------
+
+    def ziehung(self, jahr, tag_value, eintrag: dict):
+        """
+        Schreibt eine gelesene Ziehung sofort auf die Platte.
+        """
+        self._anhaengen({"jahr": int(jahr), "tag_value": str(tag_value), "eintrag": eintrag})
+        self._erledigt.add((int(jahr), str(tag_value)))
+
+    def jahr_abschliessen(self, jahr):
+        """
+        Markiert ein Jahr als vollständig – der nächste Lauf öffnet es gar nicht erst.
+        """
+        if int(jahr) not in self._jahre:
+            self._anhaengen({"jahr": int(jahr), "jahr_fertig": True})
+            self._jahre.add(int(jahr))
+
+    def schliessen(self):
+        if self._datei is not None:
+            self._datei.close()
+            self._datei = None
+
+    def loeschen(self):
+        """
+        Entfernt das Journal nach erfolgreicher Übernahme in den Ziehungsspeicher.
+        """
+        self.schliessen()
+        if self.pfad.exists():
+            self.pfad.unlink()
+        self._erledigt.clear()
+        self._jahre.clear()
@@ -0,0 +1,50 @@
+"""
+Initialisierung core/html_parsen.py …
+Ziel:
+
+- Gemeinsamer, schneller Parse-Modus für die statischen Scraper
+- Nur die relevanten Teilbäume werden aufgebaut (SoupStrainer auf Tag-Namen/CSS-Klassen),
+  der Rest der ~40 KB großen Seite wird beim Einlesen verworfen
+- lxml als Backend, falls installiert – sonst html.parser (Standardbibliothek)
+"""
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401  (nur Verfügbarkeit prüfen)
+    PARSER = "lxml"
+except ImportError:
+    PARSER = "html.parser"
+
+
+class Teilbaeume(SoupStrainer):
+    """
+    Lässt nur Tags mit einem der Namen oder einer der CSS-Klassen zu – jeweils mit ihrem ganzen Inhalt.
+    Funktioniert mit der alten (name, attrs) und der neuen (allow_tag_creation) SoupStrainer-Schnittstelle.
+    """
+    def __init__(self, namen=(), klassen=()):
+        self.namen = frozenset(namen)
+        self.klassen = frozenset(klassen)
+        super().__init__(self._passt)
+
+    def _passt(self, name, attrs=None) -> bool:
+        if name in self.namen:
+            return True
+        klasse = (attrs or {}).get("class") or ""
+        if not isinstance(klasse, str):
+            klasse = " ".join(klasse)
+        return not self.klassen.isdisjoint(klasse.split())
+
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        # bs4 >= 4.13: entscheidet beim Einlesen, ob ein Tag überhaupt angelegt wird
+        return self._passt(name, attrs)
+
+
+def erzeuge_soup(html: str, namen=(), klassen=(), schnell: bool = True) -> BeautifulSoup:
+    """
+    schnell=True: nur die Teilbäume mit den angegebenen Tag-Namen/Klassen, bestes verfügbares Backend.
+    schnell=False: vollständiger Baum mit html.parser (bisheriges Verhalten).
+    """
+    if not schnell:
+        return BeautifulSoup(html, "html.parser")
+    return BeautifulSoup(html, PARSER, parse_only=Teilbaeume(namen, klassen))
@@ -0,0 +1,114 @@
+"""
+Initialisierung core/http_abruf.py …
+Ziel:
+
+- Gemeinsame Abrufschicht für die statischen Scraper (lotto_scraper, lotto_statistik_scraper)
+- Eine gepoolte requests.Session (Keep-Alive: TCP/TLS-Aufbau nur einmal pro Host)
+- Timeout + automatische Wiederholung mit Backoff bei Verbindungsfehlern und 429/5xx
+- Festplatten-Cache mit bedingten GETs (If-None-Match / If-Modified-Since):
+  unveränderte Seiten kommen bei 304 aus dem Cache statt erneut übertragen zu werden
+"""
+
+import os
+import json
+import hashlib
+import threading
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / "data" / "http_cache"
+
+TIMEOUT = (5, 20)  # (Verbindungsaufbau, Lesen) in Sekunden
+WIEDERHOLUNGEN = 3
+BACKOFF = 0.5  # Wartezeit 0.5 s, 1 s, 2 s …
+POOL_GROESSE = 10
+USER_AGENT = "Extracta/1.0 (+https://github.com/Dofp79/Extracta)"
+
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+
+def hole_session() -> requests.Session:
+    """
+    Gibt die prozessweit geteilte Session zurück (wird beim ersten Aufruf angelegt).
+    """
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            retry = Retry(
+                total=WIEDERHOLUNGEN,
+                backoff_factor=BACKOFF,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=("GET", "HEAD"),
+                respect_retry_after_header=True,
+            )
+            adapter = HTTPAdapter(pool_connections=POOL_GROESSE, pool_maxsize=POOL_GROESSE, max_retries=retry)
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers["User-Agent"] = USER_AGENT
+            _SESSION = session
+        return _SESSION
+
+
+def _cache_pfade(url: str) -> tuple[Path, Path]:
+    """
+    Cache-Dateien einer URL: Inhalt + Metadaten (ETag, Last-Modified).
+    """
+    schluessel = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+    return CACHE_DIR / f"{schluessel}.body", CACHE_DIR / f"{schluessel}.json"
+
+
+def _lade_cache(url: str):
+    inhalt_pfad, meta_pfad = _cache_pfade(url)
+    if not (inhalt_pfad.exists() and meta_pfad.exists()):
+        return None, None
+    with open(meta_pfad, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    return inhalt_pfad.read_text(encoding="utf-8"), meta
+
+
+def _speichere_cache(url: str, text: str, antwort: requests.Response):
+    """
+    Speichert Inhalt + Validatoren atomar (Temp-Datei + Umbenennen).
+    """
+    etag = antwort.headers.get("ETag")
+    zuletzt = antwort.headers.get("Last-Modified")
+    if not etag and not zuletzt:
+        return  # Ohne Validatoren ist kein bedingter GET möglich
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    inhalt_pfad, meta_pfad = _cache_pfade(url)
+    meta = {"url": url, "etag": etag, "last_modified": zuletzt}
+    for pfad, daten in ((inhalt_pfad, text), (meta_pfad, json.dumps(meta, ensure_ascii=False))):
+        tmp = pfad.with_suffix(pfad.suffix + ".tmp")
+        tmp.write_text(daten, encoding="utf-8")
+        os.replace(tmp, pfad)
+
+
+def lade(url: str, cache: bool = True, timeout=TIMEOUT) -> str:
+    """
+    Lädt eine Seite über die gepoolte Session und gibt den Text zurück.
+    Mit cache=True werden gespeicherte Validatoren mitgeschickt; bei 304 kommt der Inhalt aus dem Cache.
+    """
+    headers = {}
+    gespeichert, meta = _lade_cache(url) if cache else (None, None)
+    if meta:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    antwort = hole_session().get(url, headers=headers, timeout=timeout)
+    if antwort.status_code == 304 and gespeichert is not None:
+        print(f"[✓] Unverändert (304), aus Cache: {url}")
+        return gespeichert
+
+    antwort.raise_for_status()  # Stoppt bei HTTP-Fehlern
+    text = antwort.text
+    if cache:
+        _speichere_cache(url, text, antwort)
+    return text
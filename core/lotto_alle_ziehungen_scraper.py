@@ -13,14 +13,18 @@ Es navigiert die Auswahlmenüs für Jahr und Ziehungsdatum dynamisch und extrahi
 - Superzahl
 
 Funktionen:
-- Navigiert durch die Jahres- und Datumsauswahl
-- Erkennt DOM-Änderungen und wartet aktiv auf neue Ziehungsdaten
+- Navigiert durch die Jahres- und Datumsauswahl (innerhalb der geladenen Seite, ohne Neuladen pro Ziehung)
+- Erkennt DOM-Änderungen und wartet aktiv auf neue Ziehungsdaten (keine festen Pausen)
+- XHR-Modus: liest die Ziehungen samt Quoten aus den JSON-Antworten der Seite (DOM nur als Fallback)
 - Extrahiert vollständige Ziehungsdaten je Datum
 - Implementiert Retry-Logik bei fehlerhaften DOM-Zugriffen
 - Ignoriert leere oder fehlerhafte Dropdown-Einträge
 - Optional: sichtbarer Browser für Tests (Headless kann deaktiviert werden)
+- Schreibt jede Ziehung sofort ins Checkpoint-Journal; ein abgebrochener Lauf wird beim nächsten Start fortgesetzt
+- Inkrementeller Modus (--nur-neue): nur Ziehungen nach der jüngsten Ziehung im Speicher
 - Exportiert Daten in Excel-Datei
 - Fehlerhafte Ziehungen werden separat protokolliert (JSON)
+- Zeitmessung (--messen): Dauer je Ziehung und Phase als JSONL-Trace mit Auswertung (core/messung.py)
 
 Abhängigkeiten:
 - Selenium
@@ -29,19 +33,29 @@ Abhängigkeiten:
 
 Verwendung:
 >>> (venv) PS E:\Extracta> python core/lotto_alle_ziehungen_scraper.py
+>>> (venv) PS E:\Extracta> python core/lotto_alle_ziehungen_scraper.py --nur-neue
+>>> (venv) PS E:\Extracta> python core/lotto_alle_ziehungen_scraper.py --messen
 """
 
 
 import os
-import time
+import sys
+import json
 import pandas as pd
 from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait, Select
-from selenium.webdriver.support import expected_conditions as EC
+
+# Projektverzeichnis zur sys.path hinzufügen, um Model-Import zu ermöglichen
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from model.lotto_model import ziehung_aus_scraper_eintrag, speichere_ziehungen, iso_datum, neuestes_datum
+from core.fortschritt_journal import FortschrittsJournal
+from core import messung
+from core.xhr_mitschnitt import XhrMitschnitt
+from core.driver_pool import leihe_driver
+from core.ziehung_payload import scraper_eintrag_aus_ziehung
+from core.selenium_werkzeuge import (
+    lade_seite, waehle_jahr, waehle_tag, oeffne_jahr, gehe_zu_ziehung, lies_seite, ZAEHLER,
+    schalte_jahr, schalte_zu_ziehung, warte_auf_ruhe
+)
 
 BASE_URL = "https://www.lotto.de/lotto-6aus49/lottozahlen"
 DATA_PATH = "data"
@@ -49,52 +63,67 @@ os.makedirs(DATA_PATH, exist_ok=True)
 
 class LottoScraper:
     # Initialisiert den Selenium WebDriver (Chrome, Headless) und erstellt eine Fehlerliste.
-    def __init__(self):
-        chrome_options = Options()
-        chrome_options.add_argument("--headless=new")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        self.driver = webdriver.Chrome(service=Service("tools/chromedriver.exe"), options=chrome_options)
+    # neu_laden=True: bisheriges Verhalten (Seite für jede Ziehung neu laden), sonst Navigation innerhalb der Seite.
+    # Jede gelesene Ziehung landet sofort im Checkpoint-Journal (data/fortschritt/alle_ziehungen.jsonl).
+    # schlank=True: Bilder, Schriften und Tracking-Skripte werden per CDP blockiert (core/schlanker_browser.py).
+    # xhr=True: Ziehungen aus den Netzwerkantworten der Seite lesen (core/xhr_mitschnitt.py), DOM als Fallback.
+    # Der Browser kommt warm aus dem Driver-Pool bzw. vom Daemon (core/driver_pool.py).
+    def __init__(self, neu_laden=False, schlank=True, xhr=True):
+        self._leihe = leihe_driver(schlank, xhr)
+        self.driver = self._leihe.driver
+        self.mitschnitt = XhrMitschnitt(self.driver) if xhr else None
         self.fehlerhafte_ziehungen = []
+        self.offene_jahre = []  # Jahre mit Fehlern in diesem Lauf → Journal bleibt für den nächsten Lauf
+        self.neu_laden = neu_laden
+        self.journal = FortschrittsJournal("alle_ziehungen")
 
     # Wählt ein bestimmtes Jahr und Ziehungstag im Dropdown aus und wartet auf neue Ziehungsdaten.
+    # Gewartet wird auf Bedingungen statt fester Pausen (core/selenium_werkzeuge.py):
+    # Seite geladen → Tage des Jahres geladen → Kugel-Signatur geändert, vollständig und DOM ruhig.
+    # Ohne neu_laden bleibt die Seite offen: nur Jahr/Tag werden umgeschaltet, neu geladen wird nur nach Fehlern.
     def lade_jahr_und_tag(self, jahr, tag_value):
-        self.driver.get(BASE_URL)
-        time.sleep(2)
-
-        jahr_select = Select(self.driver.find_element(By.CSS_SELECTOR, "select[id^='selectedYear-select']"))
-        jahr_select.select_by_value(str(jahr))
-        time.sleep(1)
+        if not self.neu_laden:
+            gehe_zu_ziehung(self.driver, BASE_URL, jahr, tag_value)
+            return
+        lade_seite(self.driver, BASE_URL)
+        waehle_jahr(self.driver, jahr)
+        waehle_tag(self.driver, tag_value)
 
-        tag_select = Select(self.driver.find_element(By.CSS_SELECTOR, "select[id^='daySelect-select']"))
-        tag_select.select_by_value(tag_value)
+    # Meldet eine Ziehung an den Driver-Pool; hat er den Browser nach MAX_SEITEN ersetzt,
+    # zeigen Driver und XHR-Mitschnitt auf den neuen (die Seite wird beim nächsten Schritt neu geladen).
+    def zaehle_seite(self):
+        if self._leihe.seite():
+            self.driver = self._leihe.driver
+            if self.mitschnitt is not None:
+                self.mitschnitt.wechsle_driver(self.driver)
 
-        try:
-            alte_zahl = self.driver.find_elements(By.CSS_SELECTOR, ".DrawNumbersCollection__container")[0]\
-                         .find_elements(By.CLASS_NAME, "LottoBall")[0].text.strip()
-        except:
-            alte_zahl = ""
+    # True, solange der XHR-Mitschnitt genutzt wird (schaltet sich nach wiederholten Fehlschlägen selbst ab).
+    def xhr_aktiv(self):
+        return self.mitschnitt is not None and self.mitschnitt.aktiv
 
-        # Wird verwendet, um einen DOM-Wechsel zu erkennen, also: Ist die neu geladene Zahl im DOM anders als die alte?
-        def neue_zahl_geladen(driver):
-            try:
-                neue_zahl = driver.find_elements(By.CSS_SELECTOR, ".DrawNumbersCollection__container")[0]\
-                              .find_elements(By.CLASS_NAME, "LottoBall")[0].text.strip()
-                return neue_zahl != "" and neue_zahl != alte_zahl
-            except:
-                return False
+    # Liefert den Eintrag einer Ziehung: zuerst aus dem XHR-Mitschnitt (ohne auf das Rendern zu warten,
+    # bereits mitgeschnittene Tage ganz ohne Auswahl), sonst wie bisher über den DOM.
+    def hole_ziehung(self, jahr, tag_value, datum):
+        self.zaehle_seite()
+        if self.xhr_aktiv():
+            iso = iso_datum(datum, jahr)
+            ziehung = self.mitschnitt.vorhanden(iso)
+            if ziehung is None:
+                schalte_zu_ziehung(self.driver, BASE_URL, jahr, tag_value)
+                ziehung = self.mitschnitt.warte_auf_ziehung(iso)
+            if ziehung is not None:
+                with messung.spanne("parse", art="xhr"):
+                    return scraper_eintrag_aus_ziehung(ziehung, datum, jahr)
+        self.lade_jahr_und_tag(jahr, tag_value)
+        return self.extrahiere_daten(jahr, datum)
 
-        WebDriverWait(self.driver, 10).until(neue_zahl_geladen)
-        time.sleep(0.5)
-
-    # Extrahiert die 6 Lottozahlen und die Superzahl von der aktuellen Seite.
+    # Extrahiert die 6 Lottozahlen und die Superzahl von der aktuellen Seite (ein execute_script-Roundtrip).
     def extrahiere_daten(self, jahr, datum):
         try:
-            container = self.driver.find_elements(By.CSS_SELECTOR, ".DrawNumbersCollection__container")
-            zahlen = [int(el.text.strip()) for el in container[0].find_elements(By.CLASS_NAME, "LottoBall")]
-            superzahl = int(container[1].find_element(By.CLASS_NAME, "LottoBall").text.strip()) if len(container) > 1 else None
-        except:
+            with messung.spanne("extract"):
+                seite = lies_seite(self.driver)
+            zahlen, superzahl = seite["zahlen"], seite["superzahl"]
+        except Exception:
             zahlen = []
             superzahl = None
         return {
@@ -113,69 +142,106 @@ class LottoScraper:
     - durch alle Jahre iteriert (1955–2025)
     - für jedes Jahr alle Ziehungsdaten-Tage auswählt
     - die Lottozahlen und Superzahl extrahiert
-    - die Daten speichert (oder Fehler dokumentiert)
+    - jede Ziehung sofort ins Checkpoint-Journal schreibt (oder Fehler dokumentiert)
+    Bereits im Journal stehende Ziehungen/Jahre werden übersprungen (Fortsetzen nach Abbruch).
+    nur_neue=True: nur Ziehungen nach der jüngsten Ziehung im Speicher (wöchentliche Aktualisierung).
     """
-    def extrahiere_alle_daten(self, start=1955, ende=2025):
-        daten = [] # Initialisierung der Ergebnisliste
+    def extrahiere_alle_daten(self, start=1955, ende=2025, nur_neue=False):
+        nach = neuestes_datum() if nur_neue else None
+        if nach:
+            start = max(start, int(nach[:4]))
+            print(f"🔎 Inkrementeller Lauf: nur Ziehungen nach {nach}")
+        aktuelles_jahr = datetime.now().year
+        neu = 0
+
         for jahr in range(start, ende + 1):
+            if self.journal.jahr_erledigt(jahr):
+                print(f"⏭️ Jahr {jahr} bereits vollständig (Checkpoint)")
+                continue
             print(f"🔄 Verarbeite Jahr {jahr} …")
-            self.driver.get(BASE_URL)
-            time.sleep(2)
-
-            # Öffnet die Lotto-Seite und wählt das aktuelle Jahr im Dropdown-Menü
-            jahr_select = Select(self.driver.find_element(By.CSS_SELECTOR, "select[id^='selectedYear-select']"))
-            jahr_select.select_by_value(str(jahr))
-            time.sleep(2)
-
+            fehler_vorher = len(self.fehlerhafte_ziehungen)
             try:
-                tag_select = Select(self.driver.find_element(By.CSS_SELECTOR, "select[id^='daySelect-select']"))
-                optionen = tag_select.options # Liest alle verfügbaren Ziehungsdaten im aktuellen Jahr.
-
-                for i in range(len(optionen)): #Iteriert durch jeden Ziehungstag im Jahr.
-                    tag_select = Select(self.driver.find_element(By.CSS_SELECTOR, "select[id^='daySelect-select']"))
-                    # Ermittelt den internen Wert für die Dropdown-Auswahl (value) und das sichtbare Datum (z. B. „21.06. (Mittwoch)”).
-                    option = tag_select.options[i]
-                    tag_value = option.get_attribute("value")
-                    datum = option.text.strip()
-
-                    try:
-                        # Wählt das Datum und ruft die Lottozahlen ab.
-                        self.lade_jahr_und_tag(jahr, tag_value)
-                        eintrag = self.extrahiere_daten(jahr, datum)
-
-                        # Wenn mindestens 3 Zahlen vorhanden, wird die Ziehung als gültig gespeichert.
-                        if all([eintrag["zahl_1"], eintrag["zahl_2"], eintrag["zahl_3"]]):
-                            daten.append(eintrag)
-                        else:
-                            raise ValueError("Unvollständige Zahlen")
-
-                    except Exception as e1:
-                        print(f"⚠️ Fehler bei Ziehung {i} in Jahr {jahr}, erster Versuch: {e1}")
-                        time.sleep(2)
-                        # Zweiter Versuch, dann wird der Fehler samt Jahr und Datum dokumentiert.
+                # Öffnet die Lotto-Seite (nur falls nötig) und wählt das aktuelle Jahr im Dropdown-Menü.
+                # Rückgabe: alle Ziehungsdaten des Jahres als [value, Text] – einmal gelesen, nicht pro Ziehung.
+                if self.xhr_aktiv():
+                    optionen = schalte_jahr(self.driver, BASE_URL, jahr)
+                elif self.neu_laden:
+                    lade_seite(self.driver, BASE_URL)
+                    optionen = waehle_jahr(self.driver, jahr)
+                else:
+                    optionen = oeffne_jahr(self.driver, BASE_URL, jahr)
+
+                # Iteriert durch jeden Ziehungstag im Jahr: interner Wert (value) und sichtbares Datum (z. B. „21.06. (Mittwoch)”).
+                for i, (tag_value, datum) in enumerate(optionen):
+                    if self.journal.ist_erledigt(jahr, tag_value):
+                        continue
+                    if nach and (iso_datum(datum, jahr) or "") <= nach:
+                        continue
+                    # Misst die Phasen dieser Ziehung (core/messung.py, nur mit --messen)
+                    with messung.ziehung(iso_datum(datum, jahr) or f"{jahr}/{tag_value}") as messpunkt:
                         try:
-                            self.lade_jahr_und_tag(jahr, tag_value)
-                            eintrag = self.extrahiere_daten(jahr, datum)
+                            # Wählt das Datum und ruft die Lottozahlen ab.
+                            eintrag = self.hole_ziehung(jahr, tag_value, datum)
+
+                            # Wenn mindestens 3 Zahlen vorhanden, wird die Ziehung als gültig gespeichert.
                             if all([eintrag["zahl_1"], eintrag["zahl_2"], eintrag["zahl_3"]]):
-                                daten.append(eintrag)
+                                with messung.spanne("persist", art="journal"):
+                                    self.journal.ziehung(jahr, tag_value, eintrag)
+                                neu += 1
                             else:
-                                raise ValueError("Unvollständige Zahlen beim zweiten Versuch")
-                        except Exception as e2:
-                            print(f"❌ Fehler bei Ziehung {i} in Jahr {jahr} auch im zweiten Versuch: {e2}")
-                            self.fehlerhafte_ziehungen.append({
-                                "jahr": jahr,
-                                "datum": datum,
-                                "grund": str(e2)
-                            })
+                                raise ValueError("Unvollständige Zahlen")
+
+                        except Exception as e1:
+                            print(f"⚠️ Fehler bei Ziehung {i} in Jahr {jahr}, erster Versuch: {e1}")
+                            messpunkt.erneut()
+                            try:
+                                # Statt fester 2 s: nur warten, bis die Seite nach dem Fehler zur Ruhe kommt
+                                warte_auf_ruhe(self.driver, timeout=2)
+                            except Exception:
+                                pass  # zweiter Versuch lädt ohnehin neu
+                            # Zweiter Versuch, dann wird der Fehler samt Jahr und Datum dokumentiert.
+                            try:
+                                eintrag = self.hole_ziehung(jahr, tag_value, datum)
+                                if all([eintrag["zahl_1"], eintrag["zahl_2"], eintrag["zahl_3"]]):
+                                    with messung.spanne("persist", art="journal"):
+                                        self.journal.ziehung(jahr, tag_value, eintrag)
+                                    neu += 1
+                                else:
+                                    raise ValueError("Unvollständige Zahlen beim zweiten Versuch")
+                            except Exception as e2:
+                                print(f"❌ Fehler bei Ziehung {i} in Jahr {jahr} auch im zweiten Versuch: {e2}")
+                                messpunkt.setze("fehler", grund=str(e2))
+                                self.fehlerhafte_ziehungen.append({
+                                    "jahr": jahr,
+                                    "datum": datum,
+                                    "tag_value": tag_value,
+                                    "grund": str(e2)
+                                })
+
+                # Abgeschlossene Vorjahre ohne Fehler werden nicht mehr geöffnet;
+                # das laufende Jahr bleibt offen, weil noch Ziehungen dazukommen.
+                if len(self.fehlerhafte_ziehungen) > fehler_vorher:
+                    self.offene_jahre.append(jahr)
+                elif jahr < aktuelles_jahr:
+                    self.journal.jahr_abschliessen(jahr)
 
             except Exception as e:
                 print(f"❌ Fehler beim Laden der Tage in Jahr {jahr}: {e}")
+                self.offene_jahre.append(jahr)
 
-        return daten
+        print(f"📄 Seitenaufrufe: {ZAEHLER['seitenaufrufe']} für {neu} neue Ziehungen "
+              f"(davon {ZAEHLER['neu_geladen_nach_fehler']} nach Fehlern)")
+        if self.mitschnitt is not None:
+            print(f"📡 XHR: {self.mitschnitt.antworten} JSON-Antworten, {len(self.mitschnitt.ziehungen)} Ziehungen "
+                  f"mitgeschnitten{'' if self.mitschnitt.aktiv else ' (abgeschaltet, DOM gelesen)'}")
+        return [e for e in self.journal.eintraege() if start <= int(e["jahr"]) <= ende]
 
     # Exportiert alle extrahierten Daten sortiert nach Datum als Excel-Datei & speichert Fehler als JSON.
     def exportiere_excel(self, daten):
         df = pd.DataFrame(daten)
+        if "quoten" in df:
+            # Quoten (nur im XHR-Modus) als JSON-Text, Excel kann keine Dictionaries speichern
+            df["quoten"] = df["quoten"].map(lambda q: json.dumps(q, ensure_ascii=False) if isinstance(q, dict) else q)
         df["sort_datum"] = df["datum"].str.extract(r"(\d{2}\.\d{2})").iloc[:, 0] + "." + df["jahr"].astype(str)
         df["sort_datum"] = pd.to_datetime(df["sort_datum"], format="%d.%m.%Y", errors="coerce")
         df.sort_values(by=["jahr", "sort_datum"], inplace=True)
@@ -183,7 +249,8 @@ class LottoScraper:
 
         timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         path = os.path.join(DATA_PATH, f"alle_lottoziehungen_{timestamp}.xlsx")
-        df.to_excel(path, index=False)
+        with messung.spanne("persist", art="export", anzahl=len(df)):
+            df.to_excel(path, index=False)
         print(f"✅ Excel-Datei gespeichert: {path}")
 
         if self.fehlerhafte_ziehungen:
@@ -191,13 +258,36 @@ class LottoScraper:
             pd.DataFrame(self.fehlerhafte_ziehungen).to_json(fehler_path, orient="records", indent=2)
             print(f"⚠️ Fehlerhafte Ziehungen gespeichert unter: {fehler_path}")
 
-    # Beendet die Selenium WebDriver-Sitzung.
+    # Übernimmt alle gültigen Ziehungen in einem Schritt in den Primärspeicher (model/lotto_model.py).
+    def uebernehme_in_speicher(self, daten):
+        with messung.spanne("parse", art="eintraege", anzahl=len(daten)):
+            ziehungen = [z for z in map(ziehung_aus_scraper_eintrag, daten) if z is not None]
+        return speichere_ziehungen(ziehungen)
+
+    # Gibt den Browser an den Pool zurück.
     def beenden(self):
-        self.driver.quit()
+        self.journal.schliessen()
+        self._leihe.zurueckgeben()
 
 # === Hauptausführung ===
 if __name__ == "__main__":
+    nur_neue = "--nur-neue" in sys.argv
+    if "--messen" in sys.argv:
+        messung.aktiviere(name="alle_ziehungen")
+    else:
+        messung.aktiviere_aus_umgebung("alle_ziehungen")
     scraper = LottoScraper()
-    daten = scraper.extrahiere_alle_daten(start=1955, ende=1956)  # Beispiel-Range
-    scraper.exportiere_excel(daten)
+    if nur_neue:
+        daten = scraper.extrahiere_alle_daten(ende=datetime.now().year, nur_neue=True)
+    else:
+        daten = scraper.extrahiere_alle_daten(start=1955, ende=1956)  # Beispiel-Range
+    if daten:
+        scraper.exportiere_excel(daten)
+        scraper.uebernehme_in_speicher(daten)
+    if scraper.offene_jahre:
+        print(f"⚠️ Unvollständige Jahre: {', '.join(map(str, scraper.offene_jahre))} – Checkpoint bleibt erhalten.")
+    else:
+        # Alles im Speicher → Checkpoint wird nicht mehr gebraucht; bei Fehlern bleibt er für den nächsten Lauf
+        scraper.journal.loeschen()
     scraper.beenden()
+    messung.abschluss()
@@ -0,0 +1,245 @@
+"""
+Initialisierung core/lotto_api.py …
+Ziel:
+
+- Ziehungen ohne Browser direkt von den JSON-Endpunkten abrufen (die Daten, die auch die
+  React-Seite per XHR lädt, siehe core/xhr_mitschnitt.py) → eine kleine HTTP-Anfrage pro Ziehung
+  statt Chrome-Start + Rendern
+- Einzelnes Datum, ganzes Jahr oder Zeitraum; Endpunkte als URL-Vorlagen konfigurierbar (ENDPUNKTE, --basis)
+- Gepoolte Session aus core/http_abruf.py, begrenzte Parallelität (Semaphore wie core/paralleler_abruf.py)
+- Umwandlung in LottoZiehung über core/ziehung_payload.py
+- Ersetzt den Selenium-Weg für den Vollabruf 1955 – heute (--start/--ende, --nur-neue)
+- --aufnehmen DIR speichert die Rohantworten; core/fixture_seite.starte_aufnahme_server(DIR)
+  spielt sie lokal wieder ab
+- --messen: Dauer je Ziehung (fetch/parse/persist) als JSONL-Trace mit Auswertung (core/messung.py)
+
+Ohne Jahres-Endpunkt werden alle Mittwoche und Samstage des Zeitraums abgefragt;
+Tage ohne Ziehung liefern 404 bzw. keine Ziehung und werden übersprungen.
+
+Verwendung:
+>>> python core/lotto_api.py --datum 2025-04-12
+>>> python core/lotto_api.py --start 1955 --ende 2025
+>>> python core/lotto_api.py --nur-neue
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+from pathlib import Path
+from urllib.parse import urlsplit
+from datetime import date, timedelta
+
+import requests
+
+# Projektverzeichnis zur sys.path hinzufügen, um core/ und model/ zu importieren
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core import http_abruf, messung
+from core.ziehung_payload import ziehungen_aus_payload
+from model.lotto_model import LottoZiehung
+
+BASIS_URL = "https://www.lotto.de"
+
+# URL-Vorlagen relativ zur Basis; None = Endpunkt nicht vorhanden
+ENDPUNKTE = {
+    "ziehung": "/api/stats/entities.lotto/draws/{datum}",  # {datum} = JJJJ-MM-TT
+    "jahr": None,  # z. B. "/api/stats/entities.lotto/draws/year/{jahr}"
+    "letzte": "/api/stats/entities.lotto/last",
+}
+
+PARALLEL = http_abruf.POOL_GROESSE  # mehr gleichzeitige Anfragen als Verbindungen im Pool bringen nichts
+ZIEHUNGSTAGE = (2, 5)  # Mittwoch, Samstag
+
+
+def ziehungstage(von: date, bis: date) -> list[date]:
+    """
+    Alle möglichen Ziehungstage (Mi/Sa) im Zeitraum, höchstens bis heute.
+    """
+    bis = min(bis, date.today())
+    tage, tag = [], von
+    while tag <= bis:
+        if tag.weekday() in ZIEHUNGSTAGE:
+            tage.append(tag)
+        tag += timedelta(days=1)
+    return tage
+
+
+def _aufnahme_datei(verzeichnis: Path, url: str) -> Path:
+    """
+    Dateiname einer aufgenommenen Antwort: URL-Pfad mit "__" statt "/" (siehe fixture_seite.starte_aufnahme_server).
+    """
+    return Path(verzeichnis) / (urlsplit(url).path.strip("/").replace("/", "__") + ".json")
+
+
+class LottoApi:
+    def __init__(self, basis: str = BASIS_URL, endpunkte: dict = None, parallel: int = PARALLEL,
+                 aufnehmen: Path = None):
+        """
+        basis: Basis-URL (lotto.de oder lokaler Stand-in-Server)
+        endpunkte: überschreibt einzelne Einträge von ENDPUNKTE
+        parallel: gleichzeitige Anfragen
+        aufnehmen: Verzeichnis, in dem jede Rohantwort als JSON abgelegt wird
+        """
+        self.basis = basis.rstrip("/")
+        self.endpunkte = {**ENDPUNKTE, **(endpunkte or {})}
+        self.parallel = max(1, parallel)
+        self.aufnehmen = Path(aufnehmen) if aufnehmen else None
+        self.anfragen = 0
+
+    def _url(self, art: str, **werte) -> str | None:
+        vorlage = self.endpunkte.get(art)
+        return self.basis + vorlage.format(**werte) if vorlage else None
+
+    def _lade_json(self, url: str):
+        """
+        JSON einer URL über die gepoolte Session, None bei 404 (kein Eintrag an diesem Tag).
+        """
+        self.anfragen += 1
+        try:
+            text = http_abruf.lade(url, cache=False)
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                return None
+            raise
+        daten = json.loads(text)
+        if self.aufnehmen:
+            self.aufnehmen.mkdir(parents=True, exist_ok=True)
+            _aufnahme_datei(self.aufnehmen, url).write_text(text, encoding="utf-8")
+        return daten
+
+    # --- Einzelabrufe ---------------------------------------------------------
+
+    def hole_ziehung(self, datum) -> LottoZiehung | None:
+        """
+        Ziehung eines Tages (date oder "JJJJ-MM-TT"), None wenn an dem Tag keine Ziehung war.
+        """
+        datum = datum.isoformat() if isinstance(datum, date) else str(datum)
+        with messung.ziehung(datum) as messpunkt:
+            with messung.spanne("fetch", art="api"):
+                daten = self._lade_json(self._url("ziehung", datum=datum))
+            with messung.spanne("parse", art="api"):
+                treffer = [z for z in ziehungen_aus_payload(daten) if z.datum == datum] if daten else []
+            if not treffer:
+                messpunkt.setze("keine")  # an dem Tag keine Ziehung – zählt nicht als gelesene Ziehung
+        return treffer[0] if treffer else None
+
+    def hole_letzte(self) -> LottoZiehung | None:
+        """
+        Jüngste Ziehung laut "letzte"-Endpunkt.
+        """
+        daten = self._lade_json(self._url("letzte"))
+        ziehungen = ziehungen_aus_payload(daten) if daten else []
+        return max(ziehungen, key=lambda z: z.datum) if ziehungen else None
+
+    # --- Massenabrufe ---------------------------------------------------------
+
+    async def _hole_tage(self, tage: list[date]) -> tuple[list[LottoZiehung], list[dict]]:
+        semaphore = asyncio.Semaphore(self.parallel)
+        fehler = []
+
+        async def eine(tag):
+            async with semaphore:
+                try:
+                    return await asyncio.to_thread(self.hole_ziehung, tag)
+                except Exception as e:
+                    fehler.append({"datum": tag.isoformat(), "grund": str(e)})
+                    return None
+
+        ergebnisse = await asyncio.gather(*(eine(tag) for tag in tage))
+        return [z for z in ergebnisse if z is not None], fehler
+
+    def hole_bereich(self, von, bis) -> tuple[list[LottoZiehung], list[dict]]:
+        """
+        Alle Ziehungen von … bis (date oder ISO-Text), nach Datum sortiert.
+        Rückgabe: (Ziehungen, fehlgeschlagene Tage bzw. Jahre).
+        """
+        von = date.fromisoformat(von) if isinstance(von, str) else von
+        bis = date.fromisoformat(bis) if isinstance(bis, str) else bis
+        if self.endpunkte.get("jahr"):
+            ziehungen, fehler = [], []
+            for jahr in range(von.year, bis.year + 1):
+                try:
+                    ziehungen += [z for z in self.hole_jahr(jahr) if von.isoformat() <= z.datum <= bis.isoformat()]
+                except Exception as e:
+                    # Wie im Tages-Zweig: ein fehlgeschlagenes Jahr beendet nicht den ganzen Abruf
+                    fehler.append({"jahr": jahr, "datum": None, "grund": str(e)})
+            return sorted(ziehungen, key=lambda z: z.datum), fehler
+
+        ziehungen, fehler = asyncio.run(self._hole_tage(ziehungstage(von, bis)))
+        return sorted(ziehungen, key=lambda z: z.datum), fehler
+
+    def hole_jahr(self, jahr: int) -> list[LottoZiehung]:
+        """
+        Alle Ziehungen eines Jahres – mit Jahres-Endpunkt eine Anfrage, sonst eine pro Ziehungstag.
+        """
+        url = self._url("jahr", jahr=jahr)
+        if url is None:
+            return self.hole_bereich(date(jahr, 1, 1), date(jahr, 12, 31))[0]
+        with messung.spanne("fetch", art="api", jahr=jahr):
+            daten = self._lade_json(url)
+        with messung.spanne("parse", art="api", jahr=jahr):
+            ziehungen = [z for z in ziehungen_aus_payload(daten) if z.datum.startswith(f"{jahr}-")] if daten else []
+        return sorted({z.datum: z for z in ziehungen}.values(), key=lambda z: z.datum)
+
+
+def backfill(api: LottoApi, start: int = 1955, ende: int = None, nur_neue: bool = False) -> tuple[int, list]:
+    """
+    Vollabruf ohne Browser: Jahr für Jahr abrufen und gesammelt in den Primärspeicher übernehmen.
+    nur_neue=True: erst ab dem Tag nach der jüngsten gespeicherten Ziehung.
+    Rückgabe: (Anzahl neu gespeicherter Ziehungen, fehlgeschlagene Tage bzw. Jahre).
+    """
+    from model.lotto_model import speichere_ziehungen, neuestes_datum
+
+    von, bis = date(start, 1, 1), date((ende or date.today().year), 12, 31)
+    nach = neuestes_datum() if nur_neue else None
+    if nach:
+        von = max(von, date.fromisoformat(nach) + timedelta(days=1))
+        print(f"[✓] Inkrementell: nur Ziehungen ab {von}")
+
+    start_zeit = time.perf_counter()
+    neu, alle_fehler = 0, []
+    for jahr in range(von.year, bis.year + 1):
+        ziehungen, fehler = api.hole_bereich(max(von, date(jahr, 1, 1)), min(bis, date(jahr, 12, 31)))
+        if ziehungen:
+            neu += speichere_ziehungen(ziehungen)["eingefuegt"]
+        alle_fehler += fehler
+        print(f"[✓] {jahr}: {len(ziehungen)} Ziehungen{f', {len(fehler)} Fehler' if fehler else ''}")
+
+    dauer = time.perf_counter() - start_zeit
+    print(f"✅ {neu} neue Ziehungen, {api.anfragen} Anfragen in {dauer:.1f} s")
+    return neu, alle_fehler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ziehungen ohne Browser von den JSON-Endpunkten abrufen")
+    parser.add_argument("--basis", default=BASIS_URL, help="Basis-URL (z. B. lokaler Stand-in-Server)")
+    parser.add_argument("--datum", help="nur eine Ziehung (JJJJ-MM-TT) anzeigen")
+    parser.add_argument("--start", type=int, default=1955)
+    parser.add_argument("--ende", type=int, default=date.today().year)
+    parser.add_argument("--nur-neue", action="store_true")
+    parser.add_argument("--parallel", type=int, default=PARALLEL)
+    parser.add_argument("--aufnehmen", help="Rohantworten in diesem Verzeichnis speichern")
+    parser.add_argument("--messen", action="store_true", help="Zeitmessung je Ziehung und Phase (JSONL-Trace)")
+    args = parser.parse_args()
+
+    if args.messen:
+        messung.aktiviere(name="lotto_api")
+    else:
+        messung.aktiviere_aus_umgebung("lotto_api")
+
+    api = LottoApi(args.basis, parallel=args.parallel, aufnehmen=args.aufnehmen)
+    if args.datum:
+        ziehung = api.hole_ziehung(args.datum)
+        print(ziehung.to_dict() if ziehung else f"[!] Keine Ziehung am {args.datum}")
+        sys.exit(0)
+
+    _, fehler = backfill(api, args.start, args.ende, args.nur_neue)
+    messung.abschluss()
+    if fehler:
+        os.makedirs("data", exist_ok=True)
+        fehler_path = os.path.join("data", f"api_fehler_{date.today():%Y-%m-%d}.json")
+        with open(fehler_path, "w", encoding="utf-8") as f:
+            json.dump(fehler, f, ensure_ascii=False, indent=2)
+        print(f"⚠️ Fehlgeschlagene Tage gespeichert unter: {fehler_path}")
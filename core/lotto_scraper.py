@@ -14,8 +14,9 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
-import requests
 from bs4 import BeautifulSoup
+from core import http_abruf, messung
+from core.html_parsen import erzeuge_soup
 from model.lotto_model import LottoZiehung
 import datetime
 import sys
@@ -27,19 +28,22 @@ LOTTO_URL = "https://www.lotto.de/lotto-6aus49/lottozahlen"
 
 def lade_html(url: str) -> str:
     """
-    Führt einen einfachen GET-Request zur angegebenen URL aus.
+    Führt einen GET-Request zur angegebenen URL aus (gepoolte Session, Retry, HTTP-Cache).
     Gibt den HTML-Inhalt der Seite zurück (textbasiert).
     """
-    response = requests.get(url)
-    response.raise_for_status()  # Stoppt bei HTTP-Fehlern
-    return response.text
+    return http_abruf.lade(url)
 
-def parse_lottoziehung(html: str) -> LottoZiehung:
+# Einzige Bereiche der Seite, die parse_lottoziehung braucht (schneller Parse-Modus)
+ZIEHUNG_TAGS = ("time",)
+ZIEHUNG_KLASSEN = ("lotto-zahlen", "lotto-superzahl", "gewinnquoten")
+
+def parse_lottoziehung(html: str, schnell: bool = True) -> LottoZiehung:
     """
     Extrahiert Lottozahlen, Superzahl und Quoten aus dem HTML.
     Gibt eine fertige LottoZiehung-Instanz zurück.
+    schnell=True baut nur die relevanten Teilbäume auf (siehe core/html_parsen.py).
     """
-    soup = BeautifulSoup(html, "html.parser")
+    soup = erzeuge_soup(html, ZIEHUNG_TAGS, ZIEHUNG_KLASSEN, schnell)
 
     #  Ziehungsdatum extrahieren (z. B. <time datetime="2025-04-10">)
     datum_tag = soup.find("time")
@@ -70,8 +74,10 @@ def hole_aktuelle_ziehung() -> LottoZiehung:
     Hauptfunktion: Ruft HTML von lotto.de ab und parst die Ziehung.
     Gibt eine LottoZiehung-Instanz zurück.
     """
-    html = lade_html(LOTTO_URL)
-    ziehung = parse_lottoziehung(html)
+    with messung.spanne("fetch", art="html"):
+        html = lade_html(LOTTO_URL)
+    with messung.spanne("parse", art="html"):
+        ziehung = parse_lottoziehung(html)
     return ziehung
 
 # Testlauf (wird nur ausgeführt, wenn Datei direkt gestartet wird)
@@ -5,6 +5,7 @@ Ziel:
 - Öffnet die Website mit Selenium
 - Wartet auf die geladenen Zahlen
 - Extrahiert Lottozahlen, Superzahl & Quoten
+  (Chrome/Edge: direkt aus der JSON-Antwort der Seite per XHR-Mitschnitt, DOM als Fallback)
 - Unterstützt Chrome, Firefox & Edge
 - Gibt ein LottoZiehung-Objekt zurück
 """
@@ -22,10 +23,16 @@ from selenium.webdriver.firefox.service import Service as FirefoxService
 from selenium.webdriver.edge.service import Service as EdgeService
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import WebDriverException
 
 # Projektverzeichnis zur sys.path hinzufügen, um Model-Import zu ermöglichen
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from model.lotto_model import LottoZiehung
+from core.selenium_werkzeuge import warte_auf_seite, AKTUELLE_SEITE
+from core.schlanker_browser import schlanke_optionen, aktiviere_blockierung
+from core.xhr_mitschnitt import XhrMitschnitt, aktiviere_mitschnitt
+from core.driver_pool import leihe_driver
+from core import messung
 
 # Pfade zu den verschiedenen Browser-Treibern
 DRIVER_PATHS = {
@@ -38,10 +45,12 @@ DRIVER_PATHS = {
 LOTTO_URL = "https://www.lotto.de/lotto-6aus49/lottozahlen"
 
 
-def create_driver(browser: str = "chrome"):
+def create_driver(browser: str = "chrome", schlank: bool = True, xhr: bool = False):
     """
     Erstellt und gibt den passenden WebDriver zurück.
     Unterstützt: chrome, firefox, edge
+    schlank=True: Bilder, Schriften und Tracking werden blockiert (core/schlanker_browser.py)
+    xhr=True: Netzwerk-Log für den XHR-Mitschnitt einschalten (nur Chrome/Edge)
     """
     browser = browser.lower()  # robust gegen Groß-/Kleinschreibung
     driver = None
@@ -51,6 +60,10 @@ def create_driver(browser: str = "chrome"):
         service = ChromeService(executable_path=DRIVER_PATHS["chrome"])
         options = webdriver.ChromeOptions()
         options.add_argument("--headless")  # Headless = kein sichtbares Fenster
+        if schlank:
+            schlanke_optionen(options)
+        if xhr:
+            aktiviere_mitschnitt(options)
         driver = webdriver.Chrome(service=service, options=options)
 
     # Firefox-Driver konfigurieren
@@ -58,6 +71,8 @@ def create_driver(browser: str = "chrome"):
         service = FirefoxService(executable_path=DRIVER_PATHS["firefox"])
         options = webdriver.FirefoxOptions()
         options.add_argument("--headless")
+        if schlank:
+            options.set_preference("permissions.default.image", 2)  # kein CDP: nur Bilder abschalten
         driver = webdriver.Firefox(service=service, options=options)
 
     # Edge-Driver konfigurieren
@@ -65,69 +80,86 @@ def create_driver(browser: str = "chrome"):
         service = EdgeService(executable_path=DRIVER_PATHS["edge"])
         options = webdriver.EdgeOptions()
         options.add_argument("--headless")
+        if schlank:
+            schlanke_optionen(options)
+        if xhr:
+            aktiviere_mitschnitt(options)
         driver = webdriver.Edge(service=service, options=options)
 
     else:
         raise ValueError(" Ungültiger Browser. Unterstützt: chrome, firefox, edge")
 
+    if schlank and browser in ("chrome", "edge"):
+        aktiviere_blockierung(driver)
     return driver
 
 
-def hole_aktuelle_ziehung(browser: str = "chrome") -> LottoZiehung:
+def hole_aktuelle_ziehung(browser: str = "chrome", schlank: bool = True, xhr: bool = True) -> LottoZiehung:
     """
     Öffnet die Seite mit dem gewählten Browser, extrahiert Ziehungsdaten.
+    Chrome kommt warm aus dem Driver-Pool bzw. vom Daemon (core/driver_pool.py), andere Browser werden neu gestartet.
+    xhr=True (Chrome/Edge): Ziehung samt Quoten aus der JSON-Antwort der Seite, ohne auf das Rendern zu warten.
     Gibt ein LottoZiehung-Objekt zurück.
     """
     print(f" Starte Browser: {browser}")
-    driver = create_driver(browser)
-    driver.get(LOTTO_URL)
+    xhr = xhr and browser.lower() in ("chrome", "edge")
+    leihe = leihe_driver(schlank, xhr) if browser.lower() == "chrome" else None
+    driver = leihe.driver if leihe else create_driver(browser, schlank, xhr)
+    kaputt = False
+    mitschnitt = XhrMitschnitt(driver) if xhr else None
+    with messung.spanne("fetch", art="seite"):
+        driver.get(LOTTO_URL)
 
     try:
+        if mitschnitt is not None:
+            ziehung = mitschnitt.warte_auf_ziehung()
+            if ziehung is not None and ziehung.superzahl != -1:  # ohne Superzahl: vermutlich ein anderes Spiel
+                print(f" Ziehung aus XHR-Antwort gelesen ({mitschnitt.antworten} JSON-Antworten)")
+                return ziehung
+            print(" Keine passende XHR-Antwort – lese den DOM ...")
+
         wait = WebDriverWait(driver, 20)  # längere Wartezeit für dynamisches Laden
 
         # Warten, bis das Hauptlayout geladen ist (zeigt an, dass React fertig ist)
         print(" Warte auf <main.page--lotto6aus49> ...")
-        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "main.page--lotto6aus49")))
-
-        # Sicherheitswartezeit: Gibt JS Zeit, alles zu bauen
-        print(" Kurze Pause für finale DOM-Erzeugung (JS)...")
-        time.sleep(2)
-
-        #  Ziehungsdatum holen
-        datum_element = driver.find_element(By.TAG_NAME, "time")
-        datum = datum_element.get_attribute("datetime")
-
-        #  Lottozahlen (6 aus 49)
-        zahlen_elements = driver.find_elements(By.CSS_SELECTOR, ".lotto-zahlen .zahl")
-        zahlen = [int(elem.text.strip()) for elem in zahlen_elements[:6]]
-
-        #  Superzahl
-        superzahl_elem = driver.find_element(By.CSS_SELECTOR, ".lotto-superzahl .zahl")
-        superzahl = int(superzahl_elem.text.strip())
-
-        #  Gewinnquoten
-        quoten = {}
-        quotenzeilen = driver.find_elements(By.CSS_SELECTOR, ".gewinnquoten .gewinnreihe")
-        for zeile in quotenzeilen:
-            try:
-                klasse = zeile.find_element(By.CSS_SELECTOR, ".klasse").text.strip()
-                betrag = zeile.find_element(By.CSS_SELECTOR, ".gewinnbetrag").text.strip()
-                quoten[klasse] = betrag
-            except Exception:
-                continue  # Unvollständige Zeile ignorieren
+        with messung.spanne("wait", art="seite"):
+            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "main.page--lotto6aus49")))
+
+        # Warten, bis die Zahlen gerendert sind, und alles (Datum, Zahlen, Superzahl, Quoten)
+        # mit einem einzigen execute_script-Aufruf lesen statt einzelner find_element-Roundtrips
+        print(" Warte auf die Lottozahlen (JS) ...")
+        with messung.spanne("extract"):
+            seite = warte_auf_seite(driver, AKTUELLE_SEITE, timeout=20)
+
+        datum = seite["zeit"]
+        if not datum:
+            raise ValueError("Kein <time datetime> mit dem Ziehungsdatum gefunden")
+        zahlen = seite["zahlen"][:6]
+        superzahl = seite["superzahl"]
+        if superzahl is None:
+            raise ValueError("Superzahl nicht gefunden")
+        quoten = seite["quoten"]
 
         return LottoZiehung(datum=datum, zahlen=zahlen, superzahl=superzahl, quoten=quoten)
 
     except Exception as e:
+        kaputt = isinstance(e, WebDriverException)
         # HTML-Dump bei Fehler zur Analyse
-        with open("debug_output.html", "w", encoding="utf-8") as f:
-            f.write(driver.page_source)
-        print(" HTML-Dump gespeichert als debug_output.html")
+        try:
+            with open("debug_output.html", "w", encoding="utf-8") as f:
+                f.write(driver.page_source)
+            print(" HTML-Dump gespeichert als debug_output.html")
+        except WebDriverException:
+            kaputt = True
         raise e
 
     finally:
-        driver.quit()
-        print(f" {browser} wurde sauber geschlossen.")
+        if leihe:
+            leihe.zurueckgeben(kaputt)
+            print(f" {browser} an den Pool zurückgegeben.")
+        else:
+            driver.quit()
+            print(f" {browser} wurde sauber geschlossen.")
 
 
 # Hauptblock: Wird nur ausgeführt, wenn Datei direkt gestartet wird
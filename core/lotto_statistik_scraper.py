@@ -1,24 +1,31 @@
 """
 Scraper für die Lottozahlen-Ziehungshäufigkeit
 Zielseite: https://www.lotto.de/lotto-6aus49/statistik/ziehungshaeufigkeit
+
+Die Häufigkeiten werden inzwischen lokal aus dem Ziehungsspeicher berechnet
+(data/HaeufigkeitRechner.py). Die Statistikseite dient nur noch zum Abgleich:
+>>> python core/lotto_statistik_scraper.py --abgleich
 """
 
-import requests
-from bs4 import BeautifulSoup
+import os
+import sys
 from typing import List, Tuple
-from core.haeufigkeit_speicher import HaeufigkeitSpeicher
+
+# Projektverzeichnis zur sys.path hinzufügen, um data/ und model/ zu importieren
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core import http_abruf
+from core.html_parsen import erzeuge_soup
+from data.HaeufigkeitSpeicher import HaeufigkeitSpeicher
 
 # URL der Statistikseite
 STATISTIK_URL = "https://www.lotto.de/lotto-6aus49/statistik/ziehungshaeufigkeit"
 
 def lade_html(url: str) -> str:
     """
-    Lädt das HTML der angegebenen URL per GET-Request.
+    Lädt das HTML der angegebenen URL per GET-Request (gepoolte Session, Retry, HTTP-Cache).
     Zusätzlich wird das HTML in einer Datei gespeichert zur Analyse.
     """
-    response = requests.get(url)
-    response.raise_for_status()
-    html = response.text
+    html = http_abruf.lade(url)
 
     # SPEICHERUNG ZUR DIAGNOSE
     with open("debug_statistik.html", "w", encoding="utf-8") as f:
@@ -27,11 +34,12 @@ def lade_html(url: str) -> str:
 
     return html
 
-def parse_haeufigkeiten(html: str) -> dict:
+def parse_haeufigkeiten(html: str, schnell: bool = True) -> dict:
     """
     Parst die Ziehungshäufigkeiten aus dem HTML und gibt sie als Dictionary zurück.
+    schnell=True baut nur die .StatisticsBar-Teilbäume auf (siehe core/html_parsen.py).
     """
-    soup = BeautifulSoup(html, "html.parser")
+    soup = erzeuge_soup(html, klassen=("StatisticsBar",), schnell=schnell)
     bars = soup.select(".StatisticsBar")
     if not bars:
         raise ValueError("⚠️ Keine Statistik-Bars gefunden – Selector eventuell falsch.")
@@ -54,15 +62,27 @@ def parse_haeufigkeiten(html: str) -> dict:
 
 # Testlauf
 if __name__ == "__main__":
-    html = lade_html(STATISTIK_URL)
-    daten = parse_haeufigkeiten(html)
+    from data.HaeufigkeitRechner import HaeufigkeitRechner  # numpy nur für den Testlauf nötig
 
-    print("🎱 Häufigkeiten:")
+    # Häufigkeiten lokal aus den gespeicherten Ziehungen berechnen
+    rechner = HaeufigkeitRechner.aus_speicher()
+    daten = rechner.als_dict()
+
+    print(f"🎱 Häufigkeiten ({rechner.anzahl_ziehungen} Ziehungen):")
     for zahl in sorted(daten):
         print(f"Zahl {zahl:>2}: {daten[zahl]}x")
 
     # Speichern in Formate
     speicher = HaeufigkeitSpeicher()
-    speicher.speichere_json(daten)
-    speicher.speichere_csv(daten)
-    speicher.speichere_excel(daten)
+    rechner.speichern(speicher)
+
+    # Optional: Abgleich mit der Statistikseite von lotto.de
+    if "--abgleich" in sys.argv:
+        html = lade_html(STATISTIK_URL)
+        abweichungen = rechner.vergleiche(parse_haeufigkeiten(html))
+        if abweichungen:
+            print(f"⚠️ {len(abweichungen)} Abweichungen (lokal, lotto.de):")
+            for zahl, (lokal, gescrapt) in abweichungen.items():
+                print(f"Zahl {zahl:>2}: {lokal} ↔ {gescrapt}")
+        else:
+            print("✅ Lokale Häufigkeiten stimmen mit lotto.de überein.")
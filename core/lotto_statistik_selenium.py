@@ -11,33 +11,25 @@ Ziel:
 import time
 import os
 import sys
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
 # Stelle sicher, dass LottoZiehung importierbar wäre, falls gebraucht
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-# Lokaler Pfad zum ChromeDriver
-CHROME_DRIVER_PATH = os.path.join("tools", "chromedriver.exe")
+from core.driver_pool import leihe_driver
 
 # Zielseite
 STATISTIK_URL = "https://www.lotto.de/lotto-6aus49/statistik/ziehungshaeufigkeit"
 
 
-def hole_statistik_mit_selenium() -> list[tuple[int, int]]:
+def hole_statistik_mit_selenium(schlank: bool = True) -> list[tuple[int, int]]:
     """
     Führt den Browser, wartet auf DOM, extrahiert Zahlen + Häufigkeit
+    schlank=True: Bilder, Schriften und Tracking werden blockiert
     """
-    # Chrome headless starten
-    options = webdriver.ChromeOptions()
-    options.add_argument("--headless")
-    service = ChromeService(executable_path=CHROME_DRIVER_PATH)
-    driver = webdriver.Chrome(service=service, options=options)
-
-    try:
+    # Headless-Chrome warm aus dem Driver-Pool (bzw. vom Daemon) statt Neustart
+    with leihe_driver(schlank) as driver:
         print(" Öffne Seite …")
         driver.get(STATISTIK_URL)
 
@@ -67,10 +59,6 @@ def hole_statistik_mit_selenium() -> list[tuple[int, int]]:
 
         return sorted(daten, key=lambda x: x[0])  # sortiere nach Lottozahl
 
-    finally:
-        driver.quit()
-        print(" Browser beendet")
-
 
 if __name__ == "__main__":
     daten = hole_statistik_mit_selenium()
@@ -0,0 +1,337 @@
+"""
+Modulname: messung.py
+Pfad:     core/messung.py
+Zweck:    Zeitmessung pro Ziehung und Phase als JSONL-Trace, mit Auswertung (p50/p95/max, Ziehungen/min)
+
+Beschreibung:
+Bisher zeigen die Scraper nur Statuszeilen – bei einem stundenlangen Backfill ist nicht zu sehen,
+ob die Zeit in Navigation, Dropdown-Auswahl, Warten oder Auslesen steckt. Dieses Modul misst
+Spannen in festen Phasen:
+- fetch    Seitenaufruf (art="seite"), Dropdown-Auswahl (art="jahr"/"tag"), HTTP-Abruf (art="api"/"html")
+- wait     Warten auf Dropdown-Optionen, Kugeln, DOM-Ruhe oder die XHR-Antwort
+- extract  Auslesen der angezeigten Ziehung aus dem DOM
+- parse    Umwandeln von HTML/JSON/Scraper-Einträgen in LottoZiehung-Objekte
+- persist  Checkpoint-Journal, Primärspeicher, Excel
+Alle Spannen innerhalb von ziehung(...) tragen deren Kennung; die Ziehungs-Spanne selbst
+(phase="ziehung") enthält Gesamtdauer, Versuche und Ergebnis.
+
+- Abgeschaltet (Standard) geben spanne()/ziehung() ein gemeinsames Leer-Objekt zurück:
+  keine Uhr, kein Schreiben, nur ein Funktionsaufruf
+- Eingeschaltet mit aktiviere(), --messen in den Scraper-CLIs oder EXTRACTA_MESSUNG=1 (bzw. =Pfad)
+- Pro Spanne eine JSON-Zeile in data/messung/<name>_<zeitstempel>.jsonl:
+  {"lauf", "ziehung", "phase", "art", "start", "dauer_ms", "versuche", "ergebnis", …}
+- ergebnis: "ok", Name der Ausnahme oder vom Aufrufer gesetzt (z. B. "fehler", "keine")
+
+Verwendung:
+>>> with messung.ziehung("2025-04-12") as z:
+...     with messung.spanne("fetch", art="tag"):
+...         ...
+>>> python core/lotto_alle_ziehungen_scraper.py --messen
+>>> python core/messung.py data/messung/alle_ziehungen_2025-04-12_10-00-00.jsonl
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import atexit
+import argparse
+import threading
+import contextvars
+from pathlib import Path
+from datetime import datetime
+
+# Projektverzeichnis zur sys.path hinzufügen, um model/ zu importieren
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+MESS_DIR = Path(__file__).resolve().parent.parent / "data" / "messung"
+
+PHASEN = ("fetch", "wait", "extract", "parse", "persist")
+ZIEHUNG = "ziehung"
+
+# Aktuelle Ziehungs-Spanne (je Thread bzw. asyncio-Task eigene)
+_AKTUELLE_ZIEHUNG = contextvars.ContextVar("aktuelle_ziehung", default=None)
+
+_TRACE = None
+
+
+class _Leer:
+    """
+    Platzhalter bei abgeschalteter Messung – alle Methoden tun nichts.
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, typ, wert, tb):
+        return False
+
+    def erneut(self):
+        pass
+
+    def setze(self, ergebnis: str = None, **felder):
+        pass
+
+
+_LEER = _Leer()
+
+
+class Trace:
+    def __init__(self, pfad: Path):
+        self.pfad = Path(pfad)
+        self.pfad.parent.mkdir(parents=True, exist_ok=True)
+        self.lauf = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        self._datei = open(self.pfad, "a", encoding="utf-8")
+        self._sperre = threading.Lock()
+
+    def schreibe(self, eintrag: dict):
+        zeile = json.dumps(eintrag, ensure_ascii=False, default=str)
+        with self._sperre:
+            if not self._datei.closed:  # Spannen, die nach deaktiviere() enden, werden verworfen
+                self._datei.write(zeile + "\n")
+
+    def schliessen(self):
+        with self._sperre:
+            self._datei.close()
+
+
+class Spanne:
+    __slots__ = ("_trace", "phase", "ziehung", "felder", "versuche", "ergebnis", "_wand", "_start", "_token")
+
+    def __init__(self, trace: Trace, phase: str, ziehung: str = None, felder: dict = None):
+        self._trace = trace
+        self.phase = phase
+        self.ziehung = ziehung
+        self.felder = felder or {}
+        self.versuche = 1
+        self.ergebnis = None
+        self._token = None
+
+    def __enter__(self):
+        if self.phase == ZIEHUNG:
+            self._token = _AKTUELLE_ZIEHUNG.set(self)
+        self._wand = time.time()
+        self._start = time.perf_counter()
+        return self
+
+    def erneut(self):
+        """
+        Zählt einen weiteren Versuch (Wiederholung, Neuladen nach Fehler).
+        """
+        self.versuche += 1
+
+    def setze(self, ergebnis: str = None, **felder):
+        """
+        Ergebnis (statt "ok"/Ausnahme) und zusätzliche Felder für die Trace-Zeile.
+        """
+        if ergebnis is not None:
+            self.ergebnis = ergebnis
+        self.felder.update(felder)
+
+    def __exit__(self, typ, wert, tb):
+        dauer = time.perf_counter() - self._start
+        if self._token is not None:
+            _AKTUELLE_ZIEHUNG.reset(self._token)
+        if self.ergebnis is None:
+            self.ergebnis = "ok" if typ is None else typ.__name__
+        self._trace.schreibe({
+            "lauf": self._trace.lauf,
+            "ziehung": self.ziehung,
+            "phase": self.phase,
+            **self.felder,
+            "start": round(self._wand, 3),
+            "dauer_ms": round(dauer * 1000, 2),
+            "versuche": self.versuche,
+            "ergebnis": self.ergebnis,
+        })
+        return False
+
+
+# --- Schnittstelle für die Scraper -------------------------------------------
+
+def aktiv() -> bool:
+    return _TRACE is not None
+
+
+def aktiviere(pfad: Path = None, name: str = "lauf") -> Path:
+    """
+    Schaltet die Messung ein. Ohne Pfad: data/messung/<name>_<zeitstempel>.jsonl.
+    Rückgabe: Pfad des Traces.
+    """
+    global _TRACE
+    if _TRACE is not None:
+        return _TRACE.pfad
+    pfad = Path(pfad) if pfad else MESS_DIR / f"{name}_{datetime.now():%Y-%m-%d_%H-%M-%S}.jsonl"
+    _TRACE = Trace(pfad)
+    _model_messung(spanne)
+    print(f"[✓] Zeitmessung aktiv → {pfad}")
+    return pfad
+
+
+def _model_messung(spanne_fabrik):
+    """
+    model/ kennt core/ nicht – die Persist-Spannen des Modells werden dort per Haken registriert.
+    """
+    from model.lotto_model import setze_zeitmessung
+
+    setze_zeitmessung(spanne_fabrik)
+
+
+def deaktiviere() -> Path | None:
+    """
+    Schaltet die Messung ab und schließt den Trace. Rückgabe: dessen Pfad (None, wenn nicht aktiv).
+    """
+    global _TRACE
+    trace, _TRACE = _TRACE, None
+    if trace is None:
+        return None
+    _model_messung(None)
+    trace.schliessen()
+    return trace.pfad
+
+
+def aktiviere_aus_umgebung(name: str = "lauf") -> Path | None:
+    """
+    EXTRACTA_MESSUNG=1 → Standardpfad, EXTRACTA_MESSUNG=<pfad> → dieser Pfad.
+    """
+    wert = os.environ.get("EXTRACTA_MESSUNG", "").strip()
+    if not wert or wert == "0":
+        return None
+    return aktiviere(None if wert == "1" else Path(wert), name)
+
+
+def spanne(phase: str, **felder):
+    """
+    Misst einen Abschnitt (Kontextmanager). Innerhalb von ziehung() mit deren Kennung.
+    """
+    if _TRACE is None:
+        return _LEER
+    aktuelle = _AKTUELLE_ZIEHUNG.get()
+    return Spanne(_TRACE, phase, aktuelle.ziehung if aktuelle else None, felder)
+
+
+def ziehung(kennung: str, **felder):
+    """
+    Klammer um alle Phasen einer Ziehung (Kennung z. B. ISO-Datum).
+    """
+    if _TRACE is None:
+        return _LEER
+    return Spanne(_TRACE, ZIEHUNG, kennung, felder)
+
+
+def erneut():
+    """
+    Zählt einen weiteren Versuch der aktuellen Ziehung (für Wiederholungen tief in den Hilfsfunktionen).
+    """
+    aktuelle = _AKTUELLE_ZIEHUNG.get() if _TRACE is not None else None
+    if aktuelle is not None:
+        aktuelle.erneut()
+
+
+def abschluss():
+    """
+    Am Ende eines Laufs: Trace schließen und Auswertung ausgeben (nur bei aktiver Messung).
+    """
+    pfad = deaktiviere()
+    if pfad is not None:
+        drucke_bericht(bericht(pfad))
+        print(f"[✓] Trace gespeichert: {pfad}")
+
+
+atexit.register(deaktiviere)
+
+
+# --- Auswertung ---------------------------------------------------------------
+
+def _perzentil(sortiert: list, anteil: float) -> float:
+    """
+    Nächster-Rang-Perzentil einer sortierten Liste.
+    """
+    return sortiert[max(0, math.ceil(anteil * len(sortiert)) - 1)]
+
+
+def _kennzahlen(dauern: list, versuche: list, ergebnisse: list) -> dict:
+    dauern = sorted(dauern)
+    abweichend = {}
+    for e in ergebnisse:
+        if e != "ok":
+            abweichend[e] = abweichend.get(e, 0) + 1
+    return {
+        "anzahl": len(dauern),
+        "summe_s": round(sum(dauern) / 1000, 2),
+        "p50_ms": _perzentil(dauern, 0.5),
+        "p95_ms": _perzentil(dauern, 0.95),
+        "max_ms": dauern[-1],
+        "wiederholt": sum(v > 1 for v in versuche),
+        "ergebnisse": abweichend,  # nur Ergebnisse ≠ "ok", z. B. {"fehler": 2, "keine": 40}
+    }
+
+
+def bericht(pfad: Path) -> dict:
+    """
+    Wertet einen Trace aus:
+    {"phasen": {phase: Kennzahlen}, "arten": {"phase/art": Kennzahlen}, "ziehungen": n,
+     "ziehungen_pro_minute": x, "laeufe": n}
+    """
+    gruppen, arten = {}, {}
+    laeufe = {}  # lauf → [erster Start, letztes Ende, erfolgreiche Ziehungen]
+    with open(pfad, encoding="utf-8") as f:
+        for zeile in f:
+            try:
+                e = json.loads(zeile)
+            except ValueError:
+                continue  # abgeschnittene letzte Zeile nach Abbruch
+            werte = (e["dauer_ms"], e.get("versuche", 1), e.get("ergebnis", "ok"))
+            for ziel, schluessel in ((gruppen, e["phase"]),
+                                     (arten, f"{e['phase']}/{e['art']}" if e.get("art") else None)):
+                if schluessel is not None:
+                    for liste, wert in zip(ziel.setdefault(schluessel, ([], [], [])), werte):
+                        liste.append(wert)
+            lauf = laeufe.setdefault(e.get("lauf"), [e["start"], 0.0, 0])
+            lauf[0] = min(lauf[0], e["start"])
+            lauf[1] = max(lauf[1], e["start"] + e["dauer_ms"] / 1000)
+            lauf[2] += e["phase"] == ZIEHUNG and e.get("ergebnis") == "ok"
+
+    reihenfolge = {p: i for i, p in enumerate((ZIEHUNG,) + PHASEN)}
+    dauer_s = sum(ende - anfang for anfang, ende, _ in laeufe.values())
+    ziehungen = sum(n for _, _, n in laeufe.values())
+    return {
+        "phasen": {p: _kennzahlen(*gruppen[p]) for p in sorted(gruppen, key=lambda p: reihenfolge.get(p, 99))},
+        "arten": {a: _kennzahlen(*arten[a]) for a in sorted(arten)},
+        "ziehungen": ziehungen,
+        "ziehungen_pro_minute": round(ziehungen / dauer_s * 60, 1) if dauer_s else 0.0,
+        "laeufe": len(laeufe),
+    }
+
+
+def drucke_bericht(auswertung: dict):
+    kopf = f"{'Phase':<18}{'Anzahl':>8}{'Summe s':>10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'wdh.':>6}  nicht ok"
+    print(kopf)
+    print("-" * len(kopf))
+    for titel, gruppe in (("", auswertung["phasen"]), ("  ", auswertung["arten"])):
+        for name, k in gruppe.items():
+            print(f"{titel + name:<18}{k['anzahl']:>8}{k['summe_s']:>10.1f}{k['p50_ms']:>10.1f}"
+                  f"{k['p95_ms']:>10.1f}{k['max_ms']:>10.1f}{k['wiederholt']:>6}  "
+                  + ", ".join(f"{e}: {n}" for e, n in k["ergebnisse"].items()))
+    print(f"✅ {auswertung['ziehungen']} Ziehungen, {auswertung['ziehungen_pro_minute']} Ziehungen/min "
+          f"({auswertung['laeufe']} Lauf/Läufe)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Auswertung eines Mess-Traces (JSONL)")
+    parser.add_argument("trace", nargs="?", help="Trace-Datei (Standard: jüngste in data/messung)")
+    parser.add_argument("--json", action="store_true", help="Auswertung als JSON ausgeben")
+    args = parser.parse_args()
+
+    pfad = Path(args.trace) if args.trace else max(MESS_DIR.glob("*.jsonl"), key=os.path.getmtime, default=None)
+    if pfad is None or not pfad.exists():
+        print("[!] Kein Trace gefunden.")
+        sys.exit(1)
+    auswertung = bericht(pfad)
+    if args.json:
+        print(json.dumps(auswertung, ensure_ascii=False, indent=2))
+    else:
+        print(f"[✓] {pfad}")
+        drucke_bericht(auswertung)
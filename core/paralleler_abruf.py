@@ -0,0 +1,129 @@
+"""
+Initialisierung core/paralleler_abruf.py …
+Ziel:
+
+- Alle konfigurierten lotto.de-Seiten eines Aktualisierungslaufs gleichzeitig abrufen
+  (aktuelle Ziehung, Statistik, später Quoten-Seiten)
+- asyncio als Orchestrierung; die blockierenden requests-Aufrufe laufen per asyncio.to_thread
+  über die gepoolte Session aus core/http_abruf.py
+- Begrenzung der gleichzeitigen Abrufe pro Host (Semaphore), damit lotto.de nicht geflutet wird
+- Jede Seite wird geparst, sobald sie da ist → Laufzeit ≈ langsamste Seite statt Summe aller Seiten
+
+Nachprüfen ohne lotto.de: python core/paralleler_abruf.py --fixture [--latenz 0.3,0.6,0.8,1.0]
+(lokale Stand-in-Seiten aus core/fixture_seite.py mit künstlicher Verzögerung, parallel vs. nacheinander)
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+from urllib.parse import urlsplit
+
+# Projektverzeichnis zur sys.path hinzufügen, um core/ und model/ zu importieren
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core import http_abruf
+from core.lotto_scraper import LOTTO_URL, parse_lottoziehung
+from core.lotto_statistik_scraper import STATISTIK_URL, parse_haeufigkeiten
+
+# Name → (URL, Parse-Funktion); weitere Seiten einfach hier ergänzen
+SEITEN = {
+    "ziehung": (LOTTO_URL, parse_lottoziehung),
+    "statistik": (STATISTIK_URL, parse_haeufigkeiten),
+}
+
+PRO_HOST = 2  # gleichzeitige Abrufe je Host
+
+
+async def _abrufen_und_parsen(name: str, url: str, parse, semaphoren: dict, pro_host: int):
+    host = urlsplit(url).netloc
+    semaphore = semaphoren.setdefault(host, asyncio.Semaphore(pro_host))
+    start = time.perf_counter()
+    async with semaphore:
+        html = await asyncio.to_thread(http_abruf.lade, url)
+    ergebnis = await asyncio.to_thread(parse, html)
+    print(f"[✓] {name}: {url} ({time.perf_counter() - start:.2f} s)")
+    return ergebnis
+
+
+async def hole_alle(seiten: dict = None, pro_host: int = None) -> dict:
+    """
+    Ruft alle Seiten gleichzeitig ab und parst sie.
+    Rückgabe: {Name: Ergebnis der Parse-Funktion oder die aufgetretene Exception}.
+    """
+    seiten = SEITEN if seiten is None else seiten
+    pro_host = PRO_HOST if pro_host is None else pro_host
+    semaphoren = {}
+
+    aufgaben = [
+        _abrufen_und_parsen(name, url, parse, semaphoren, pro_host)
+        for name, (url, parse) in seiten.items()
+    ]
+    ergebnisse = await asyncio.gather(*aufgaben, return_exceptions=True)
+
+    for name, ergebnis in zip(seiten, ergebnisse):
+        if isinstance(ergebnis, Exception):
+            print(f"[!] {name}: Abruf/Parsen fehlgeschlagen: {ergebnis}")
+    return dict(zip(seiten, ergebnisse))
+
+
+def hole_alle_seiten(seiten: dict = None, pro_host: int = None) -> dict:
+    """
+    Synchroner Einstieg (z. B. für extracta_runner.py).
+    """
+    return asyncio.run(hole_alle(seiten, pro_host))
+
+
+def fixture_vergleich(latenzen=(0.3, 0.6, 0.8, 1.0)) -> dict:
+    """
+    Ruft lokale Stand-in-Seiten (abwechselnd Ziehung/Statistik) mit den gegebenen Verzögerungen
+    einmal parallel über hole_alle_seiten und einmal nacheinander ab.
+    Rückgabe: {"parallel": s, "nacheinander": s, "langsamste": s, "summe": s}.
+    """
+    from core.fixture_seite import ziehung_html, statistik_html, starte_seiten_server
+
+    vorlagen = [("ziehung", ziehung_html(), parse_lottoziehung), ("statistik", statistik_html(), parse_haeufigkeiten)]
+    pfade = {}
+    for i, latenz in enumerate(latenzen):
+        name, html, parse = vorlagen[i % len(vorlagen)]
+        pfade[f"/{name}-{i}"] = (name, html, parse, latenz)
+
+    server, basis = starte_seiten_server({pfad: (html, latenz) for pfad, (_, html, _, latenz) in pfade.items()})
+    try:
+        seiten = {pfad.strip("/"): (basis + pfad, parse) for pfad, (_, _, parse, _) in pfade.items()}
+        # pro_host = Anzahl Seiten: alle Stand-ins liegen auf demselben Host
+        start = time.perf_counter()
+        ergebnisse = hole_alle_seiten(seiten, pro_host=len(seiten))
+        parallel = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for url, parse in seiten.values():
+            parse(http_abruf.lade(url, cache=False))
+        nacheinander = time.perf_counter() - start
+    finally:
+        server.shutdown()
+
+    fehler = [name for name, e in ergebnisse.items() if isinstance(e, Exception)]
+    if fehler:
+        raise RuntimeError(f"Stand-in-Seiten fehlgeschlagen: {fehler}")
+    return {"parallel": parallel, "nacheinander": nacheinander, "langsamste": max(latenzen), "summe": sum(latenzen)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Alle lotto.de-Seiten gleichzeitig abrufen")
+    parser.add_argument("--fixture", action="store_true", help="lokale Stand-in-Seiten statt lotto.de")
+    parser.add_argument("--latenz", default="0.3,0.6,0.8,1.0", help="Verzögerungen der Stand-ins in Sekunden")
+    args = parser.parse_args()
+
+    if args.fixture:
+        z = fixture_vergleich(tuple(float(x) for x in args.latenz.split(",")))
+        print(f"Parallel: {z['parallel']:.2f} s (langsamste Seite {z['langsamste']:.2f} s) | "
+              f"nacheinander: {z['nacheinander']:.2f} s (Summe {z['summe']:.2f} s)")
+        sys.exit(0)
+
+    start = time.perf_counter()
+    ergebnisse = hole_alle_seiten()
+    print(f"Gesamt: {time.perf_counter() - start:.2f} s")
+    for name, ergebnis in ergebnisse.items():
+        if not isinstance(ergebnis, Exception):
+            print(f"{name}: {ergebnis.to_dict() if hasattr(ergebnis, 'to_dict') else ergebnis}")
@@ -0,0 +1,79 @@
+"""
+Initialisierung core/parse_benchmark.py …
+Ziel:
+
+- Misst den vollständigen und den schnellen Parse-Modus (core/html_parsen.py)
+  an den gespeicherten Seiten debug_output.html und debug_statistik.html
+- Die gespeicherten Seiten enthalten die gesuchten Blöcke nicht (mehr); daher wird der passende
+  Block aus core/fixture_seite.py eingefügt – Seitengröße bleibt realistisch, die Selektoren treffen
+- Ausgabe: Parses pro Sekunde je Modus + Beschleunigung
+- Prüft, dass beide Modi exakt dasselbe und ein inhaltlich gefülltes Ergebnis liefern (AssertionError sonst)
+
+Aufruf: python core/parse_benchmark.py [--wiederholungen 50]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+# Projektverzeichnis zur sys.path hinzufügen, um core/ und model/ zu importieren
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.html_parsen import PARSER
+from core.fixture_seite import ziehung_html, statistik_html
+from core.lotto_scraper import parse_lottoziehung
+from core.lotto_statistik_scraper import parse_haeufigkeiten
+
+PROJEKT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _ziehung_gefuellt(d: dict) -> bool:
+    return len(d["zahlen"]) == 6 and d["superzahl"] != -1 and bool(d["quoten"])
+
+
+def _statistik_gefuellt(d: dict) -> bool:
+    return len(d) == 49 and any(n > 0 for n in d.values())
+
+
+# (Datei, Fixture-Block, Parse-Funktion, Umwandlung in vergleichbare Daten, Prüfung auf Inhalt)
+FAELLE = [
+    ("debug_output.html", ziehung_html, parse_lottoziehung, lambda z: z.to_dict(), _ziehung_gefuellt),
+    ("debug_statistik.html", statistik_html, parse_haeufigkeiten, lambda d: d, _statistik_gefuellt),
+]
+
+
+def parses_pro_sekunde(funktion, html: str, schnell: bool, wiederholungen: int) -> float:
+    start = time.perf_counter()
+    for _ in range(wiederholungen):
+        funktion(html, schnell=schnell)
+    return wiederholungen / (time.perf_counter() - start)
+
+
+def benchmark(wiederholungen: int = 50) -> dict:
+    """
+    Führt alle Fälle aus. Rückgabe: {Datei: (voll/s, schnell/s)}.
+    """
+    print(f"Backend schneller Modus: {PARSER}")
+    ergebnisse = {}
+    for datei, block, funktion, vergleichbar, gefuellt in FAELLE:
+        with open(os.path.join(PROJEKT_DIR, datei), "r", encoding="utf-8") as f:
+            html = block(rahmen=f.read())
+
+        voll = vergleichbar(funktion(html, schnell=False))
+        schnell = vergleichbar(funktion(html, schnell=True))
+        assert voll == schnell, f"{datei}: Ergebnisse unterscheiden sich\n{voll}\n{schnell}"
+        assert gefuellt(voll), f"{datei}: Selektoren treffen nicht, Ergebnis leer\n{voll}"
+
+        pro_s_voll = parses_pro_sekunde(funktion, html, False, wiederholungen)
+        pro_s_schnell = parses_pro_sekunde(funktion, html, True, wiederholungen)
+        ergebnisse[datei] = (pro_s_voll, pro_s_schnell)
+        print(f"{datei:<22} voll: {pro_s_voll:7.1f}/s   schnell: {pro_s_schnell:7.1f}/s   "
+              f"×{pro_s_schnell / pro_s_voll:.1f}   (Ergebnis identisch, gefüllt)")
+    return ergebnisse
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parse-Benchmark auf den gespeicherten HTML-Seiten")
+    parser.add_argument("--wiederholungen", type=int, default=50)
+    args = parser.parse_args()
+    benchmark(args.wiederholungen)
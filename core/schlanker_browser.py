@@ -0,0 +1,102 @@
+"""
+Modulname: schlanker_browser.py
+Pfad:     core/schlanker_browser.py
+Zweck:    Schlanker Browser-Modus für die Selenium-Scraper (Bilder, Schriften, Tracking blockieren)
+
+Beschreibung:
+Die Scraper lesen pro Ziehung nur ein paar DOM-Knoten, Chrome lädt aber jedes Mal alle Bilder,
+Schriften, Tracking- und Werbeskripte von lotto.de mit. Im schlanken Modus
+- blockiert Chrome diese Anfragen über das DevTools-Protokoll (Network.setBlockedURLs),
+  gruppiert nach Art (bilder, schriften, medien, dritte) – Muster mit * als Platzhalter
+- lassen sich einzelne Muster über eine Erlaubt-Liste wieder freigeben
+  (z. B. erlaubt=("*.svg*",) falls ein Ziehungselement doch ein Bild braucht)
+- starten die Browser mit schlanken Flags (keine Erweiterungen, kein Hintergrund-Netzverkehr …)
+
+Nur Chromium-Browser (Chrome, Edge) sprechen CDP; Firefox schaltet im schlanken Modus nur Bilder ab
+(siehe create_driver in core/lotto_scraper_selenium.py).
+
+Messung gegen die Fixture-Seite mit schweren Assets:
+>>> python core/fixture_seite.py --blockierung --ziehungen 10
+"""
+
+from fnmatch import fnmatchcase
+
+# Blockierte URL-Muster je Art (Syntax von Network.setBlockedURLs: * = beliebige Zeichen)
+BLOCKIER_MUSTER = {
+    "bilder": ["*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.avif*", "*.svg*", "*.ico*"],
+    "schriften": ["*.woff*", "*.ttf*", "*.otf*", "*.eot*"],
+    "medien": ["*.mp4*", "*.webm*", "*.mp3*", "*.m3u8*"],
+    "dritte": [
+        "*googletagmanager.com*", "*google-analytics.com*", "*doubleclick.net*",
+        "*googlesyndication.com*", "*facebook.net*", "*facebook.com/tr*", "*hotjar.com*",
+        "*usercentrics.eu*", "*cookiebot.com*", "*etracker.com*", "*adform.net*",
+        "*criteo.com*", "*/gtm.js*", "*/analytics.js*",
+    ],
+}
+STANDARD_ARTEN = ("bilder", "schriften", "medien", "dritte")
+ERLAUBT = ()  # Muster, die nie blockiert werden (projektweit)
+
+SCHLANKE_ARGUMENTE = (
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-translate",
+    "--no-first-run",
+    "--mute-audio",
+    "--metrics-recording-only",
+    "--disable-features=Translate,OptimizationHints,MediaRouter",
+)
+
+_BYTES_JS = """
+var e = performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'));
+return e.reduce(function (s, x) { return s + (x.transferSize || 0); }, 0);
+"""
+
+
+def blockier_liste(arten=STANDARD_ARTEN, erlaubt=()) -> list[str]:
+    """
+    URL-Muster für die gewählten Arten, ohne die von `erlaubt` (bzw. ERLAUBT) abgedeckten.
+    Ein Muster gilt als erlaubt, wenn es einem Erlaubt-Muster entspricht oder gleich ist.
+    """
+    erlaubt = tuple(ERLAUBT) + tuple(erlaubt)
+    muster = []
+    for art in arten:
+        if art not in BLOCKIER_MUSTER:
+            raise ValueError(f"Unbekannte Art '{art}'. Möglich: {', '.join(BLOCKIER_MUSTER)}")
+        muster += [m for m in BLOCKIER_MUSTER[art]
+                   if m not in muster and not any(fnmatchcase(m, e) for e in erlaubt)]
+    return muster
+
+
+def schlanke_optionen(options):
+    """
+    Ergänzt Chrome-/Edge-Optionen um die schlanken Start-Flags. Gibt die Optionen zurück.
+    """
+    for argument in SCHLANKE_ARGUMENTE:
+        if argument not in options.arguments:
+            options.add_argument(argument)
+    return options
+
+
+def aktiviere_blockierung(driver, arten=STANDARD_ARTEN, erlaubt=()) -> list[str]:
+    """
+    Schaltet die Anfrage-Blockierung per CDP ein (gilt für alle folgenden Seitenaufrufe des Drivers).
+    Rückgabe: aktive Muster ([] wenn der Browser kein CDP unterstützt).
+    """
+    if not hasattr(driver, "execute_cdp_cmd"):
+        print("[!] Browser ohne DevTools-Protokoll – Anfragen werden nicht blockiert.")
+        return []
+    muster = blockier_liste(arten, erlaubt)
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": muster})
+    return muster
+
+
+def uebertragene_bytes(driver) -> int:
+    """
+    Übertragene Bytes der aktuell geöffneten Seite (Dokument + Ressourcen, laut Resource Timing).
+    Blockierte Anfragen zählen 0.
+    """
+    return int(driver.execute_script(_BYTES_JS) or 0)
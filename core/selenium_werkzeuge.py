@@ -0,0 +1,358 @@
+"""
+Modulname: selenium_werkzeuge.py
+Pfad:     core/selenium_werkzeuge.py
+Zweck:    Gemeinsame Warte- und Auswahlfunktionen für die Selenium-Scraper (lotto.de Jahres-/Tagesauswahl)
+
+Beschreibung:
+Statt fester time.sleep()-Pausen wird auf Bedingungen gewartet:
+- Seite geladen      → Jahres-Dropdown ist im DOM
+- Jahr gewechselt    → die Optionen des Tages-Dropdowns haben sich geändert
+- Ziehung gewechselt → die Signatur aller Kugeln (Lottozahlen + Superzahl) hat sich geändert,
+                       ist vollständig (6 Zahlen) und der DOM ist seit RUHE_MS ruhig
+Die Ruhe wird über einen MutationObserver im Browser gemessen. Dadurch werden keine halb
+gerenderten oder noch alten Zahlen mehr gelesen (siehe Hinweis in FehlerZiehungOCR_Screenshots.py).
+
+gehe_zu_ziehung() navigiert innerhalb der bereits geladenen Seite (nur Jahr/Tag umschalten)
+und lädt die Seite nur beim ersten Aufruf oder nach einem Fehler neu → ~ein Seitenaufruf pro Lauf
+statt einer pro Ziehung.
+
+schalte_zu_ziehung() schaltet nur die Dropdowns um, ohne auf das Rendern der Kugeln zu warten –
+für den XHR-Mitschnitt (core/xhr_mitschnitt.py), der die Daten aus der Netzwerkantwort liest.
+
+Seitenaufrufe und Dropdown-Auswahl werden als Phase "fetch", das Warten als Phase "wait"
+gemessen (core/messung.py, nur bei aktiver Messung); Neuladen nach Fehlern zählt als Wiederholung.
+
+Abhängigkeiten:
+- Selenium
+"""
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait, Select
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import WebDriverException
+
+from core import messung
+
+JAHR_SELECT = "select[id^='selectedYear-select']"
+TAG_SELECT = "select[id^='daySelect-select']"
+KUGEL_CONTAINER = ".DrawNumbersCollection__container"
+
+TIMEOUT = 10  # Sekunden
+POLL = 0.05  # Prüfintervall der Wartebedingungen in Sekunden
+RUHE_MS = 150  # so lange darf sich der DOM nicht mehr ändern, bevor gelesen wird
+JAHR_RUHE_MS = 1000  # Obergrenze nach Jahreswechsel, falls die Seite keine neue Ziehung anzeigt
+
+# Zählt DOM-Änderungen und merkt sich den Zeitpunkt der letzten (einmal pro Seite)
+_BEOBACHTER_JS = """
+if (!window.__extracta) {
+    window.__extracta = {letzte: performance.now(), anzahl: 0};
+    new MutationObserver(function () {
+        window.__extracta.letzte = performance.now();
+        window.__extracta.anzahl += 1;
+    }).observe(document.body, {childList: true, subtree: true, characterData: true});
+}
+"""
+
+# [Signatur aller Kugeln, ms seit der letzten DOM-Änderung]
+_ZUSTAND_JS = """
+var container = document.querySelectorAll(arguments[0]);
+var teile = [];
+for (var i = 0; i < container.length; i++) {
+    var kugeln = container[i].querySelectorAll('.LottoBall');
+    var zahlen = [];
+    for (var j = 0; j < kugeln.length; j++) zahlen.push(kugeln[j].textContent.trim());
+    teile.push(zahlen.join(','));
+}
+var ruhe = window.__extracta ? performance.now() - window.__extracta.letzte : 1e9;
+return [teile.join('|'), ruhe];
+"""
+
+_OPTIONEN_JS = """
+var select = document.querySelector(arguments[0]);
+if (!select) return null;
+return Array.prototype.map.call(select.options, function (o) { return [o.value, o.text.trim()]; });
+"""
+
+# Gewähltes Jahr, falls die Seite von lade_seite() geöffnet wurde (Beobachter aktiv), sonst null
+_OFFENES_JAHR_JS = """
+var select = document.querySelector(arguments[0]);
+return (window.__extracta && select) ? select.value : null;
+"""
+
+# Selektoren für lies_seite(): Bereich = (Container-Selektor, Index des Containers, Element-Selektor)
+HISTORIE_SEITE = {
+    "zahlen": [KUGEL_CONTAINER, 0, ".LottoBall"],
+    "superzahl": [KUGEL_CONTAINER, 1, ".LottoBall"],
+    "jahr_select": JAHR_SELECT,
+    "tag_select": TAG_SELECT,
+    "quoten": None,
+}
+AKTUELLE_SEITE = {
+    "zahlen": [".lotto-zahlen", 0, ".zahl"],
+    "superzahl": [".lotto-superzahl", 0, ".zahl"],
+    "jahr_select": JAHR_SELECT,
+    "tag_select": TAG_SELECT,
+    "quoten": [".gewinnquoten .gewinnreihe", ".klasse", ".gewinnbetrag"],
+}
+
+# Liest Kugeln, Superzahl, Datum, Quoten und alle Tagesoptionen in einem einzigen Roundtrip
+_LIES_SEITE_JS = """
+var s = arguments[0];
+function texte(bereich) {
+    var c = document.querySelectorAll(bereich[0])[bereich[1]];
+    if (!c) return [];
+    return Array.prototype.map.call(c.querySelectorAll(bereich[2]), function (e) { return e.textContent.trim(); });
+}
+var jahrSel = document.querySelector(s.jahr_select);
+var tagSel = document.querySelector(s.tag_select);
+var zeit = document.querySelector('time[datetime]');
+var quoten = {};
+if (s.quoten) {
+    document.querySelectorAll(s.quoten[0]).forEach(function (zeile) {
+        var k = zeile.querySelector(s.quoten[1]), b = zeile.querySelector(s.quoten[2]);
+        if (k && b) quoten[k.textContent.trim()] = b.textContent.trim();
+    });
+}
+return {
+    zahlen: texte(s.zahlen),
+    superzahl: texte(s.superzahl),
+    zeit: zeit ? zeit.getAttribute('datetime') : null,
+    jahr: jahrSel ? jahrSel.value : null,
+    tag_value: tagSel ? tagSel.value : null,
+    tag_text: (tagSel && tagSel.selectedIndex >= 0) ? tagSel.options[tagSel.selectedIndex].text.trim() : null,
+    optionen: tagSel ? Array.prototype.map.call(tagSel.options, function (o) { return [o.value, o.text.trim()]; }) : [],
+    quoten: quoten
+};
+"""
+
+_SETZE_WERT_JS = "arguments[0].value = arguments[1]; arguments[0].dispatchEvent(new Event('change'));"
+
+
+# Zähler für Auswertungen (Seitenaufrufe ↔ Ziehungen)
+ZAEHLER = {"seitenaufrufe": 0, "neu_geladen_nach_fehler": 0}
+
+
+def _warte(driver, bedingung, timeout=TIMEOUT, meldung=""):
+    return WebDriverWait(driver, timeout, poll_frequency=POLL).until(bedingung, meldung)
+
+
+def lade_seite(driver, url: str, timeout: float = TIMEOUT, kugeln: bool = True):
+    """
+    Öffnet die Seite und wartet, bis das Jahres-Dropdown da ist und die Startziehung
+    vollständig angezeigt wird (statt time.sleep(2)). kugeln=False: nur auf das Dropdown warten.
+    """
+    with messung.spanne("fetch", art="seite"):
+        driver.get(url)
+    ZAEHLER["seitenaufrufe"] += 1
+    with messung.spanne("wait", art="seite"):
+        _warte(driver, EC.presence_of_element_located((By.CSS_SELECTOR, JAHR_SELECT)), timeout,
+               "Jahresauswahl nicht gefunden")
+        driver.execute_script(_BEOBACHTER_JS)
+        if kugeln:
+            warte_auf_ziehung(driver, None, timeout)
+
+
+def ziehungs_zustand(driver) -> tuple[str, float]:
+    """
+    (Signatur aller Kugeln, z. B. "3,7,11,22,33,44|5"; Millisekunden seit der letzten DOM-Änderung)
+    """
+    signatur, ruhe = driver.execute_script(_ZUSTAND_JS, KUGEL_CONTAINER)
+    return signatur, ruhe
+
+
+def ist_vollstaendig(signatur: str) -> bool:
+    """
+    Mindestens 6 Lottozahlen im ersten Container, alle als Zahl lesbar.
+    """
+    zahlen = signatur.split("|", 1)[0]
+    zahlen = zahlen.split(",") if zahlen else []
+    return len(zahlen) >= 6 and all(z.isdigit() for z in zahlen)
+
+
+def tag_optionen(driver) -> list:
+    """
+    Alle Einträge des Tages-Dropdowns als [[value, Text], …] (ein Roundtrip), None ohne Dropdown.
+    """
+    return driver.execute_script(_OPTIONEN_JS, TAG_SELECT)
+
+
+def warte_auf_tag_optionen(driver, alte=None, timeout: float = TIMEOUT) -> list:
+    """
+    Wartet, bis das Tages-Dropdown Einträge hat (und sie sich von `alte` unterscheiden).
+    """
+    def bereit(d):
+        optionen = tag_optionen(d)
+        return optionen if optionen and optionen != alte else False
+    return _warte(driver, bereit, timeout, "Tagesauswahl nicht aktualisiert")
+
+
+def warte_auf_ruhe(driver, timeout: float = TIMEOUT):
+    """
+    Wartet, bis sich der DOM seit RUHE_MS nicht mehr geändert hat.
+    """
+    _warte(driver, lambda d: ziehungs_zustand(d)[1] >= RUHE_MS, timeout, "DOM kommt nicht zur Ruhe")
+
+
+def warte_auf_ziehung(driver, alte_signatur: str = None, timeout: float = TIMEOUT) -> str:
+    """
+    Wartet, bis eine vollständige Ziehung angezeigt wird, die sich von `alte_signatur`
+    unterscheidet, und der DOM ruhig ist. Rückgabe: die neue Signatur.
+    """
+    def bereit(d):
+        signatur, ruhe = ziehungs_zustand(d)
+        if signatur == alte_signatur or not ist_vollstaendig(signatur) or ruhe < RUHE_MS:
+            return False
+        return signatur
+    return _warte(driver, bereit, timeout, "Neue Ziehung wurde nicht geladen")
+
+
+def _waehle(driver, selektor: str, wert: str, per_js: bool) -> bool:
+    """
+    Setzt den Wert eines Dropdowns. Rückgabe: False, wenn der Wert schon ausgewählt war.
+    """
+    element = driver.find_element(By.CSS_SELECTOR, selektor)
+    if element.get_attribute("value") == wert:
+        return False
+    if per_js:
+        driver.execute_script(_SETZE_WERT_JS, element, wert)
+    else:
+        Select(element).select_by_value(wert)
+    return True
+
+
+def waehle_jahr(driver, jahr, per_js: bool = False, timeout: float = TIMEOUT) -> list:
+    """
+    Wählt das Jahr und wartet, bis die Ziehungstage des Jahres geladen sind.
+    Rückgabe: Tagesoptionen [[value, Text], …].
+    """
+    alte = tag_optionen(driver)
+    alte_signatur, _ = ziehungs_zustand(driver)
+    with messung.spanne("fetch", art="jahr"):
+        gewechselt = _waehle(driver, JAHR_SELECT, str(jahr), per_js)
+    if not gewechselt:
+        with messung.spanne("wait", art="jahr"):
+            optionen = warte_auf_tag_optionen(driver, None, timeout)
+            warte_auf_ruhe(driver, timeout)
+        return optionen
+
+    with messung.spanne("wait", art="jahr"):
+        optionen = warte_auf_tag_optionen(driver, alte, timeout)
+
+    # Nach dem Jahreswechsel zeigt die Seite die erste Ziehung des Jahres an. Erst wenn diese
+    # da ist (oder der DOM länger ruhig bleibt), darf waehle_tag() die alte Signatur merken –
+    # sonst würde sie mit der gewünschten Ziehung verwechselt.
+    def jahr_geladen(d):
+        signatur, ruhe = ziehungs_zustand(d)
+        if ruhe >= JAHR_RUHE_MS:
+            return True
+        return signatur != alte_signatur and ist_vollstaendig(signatur) and ruhe >= RUHE_MS
+    with messung.spanne("wait", art="jahr"):
+        _warte(driver, jahr_geladen, timeout, "Ziehungen des Jahres nicht geladen")
+    return optionen
+
+
+def waehle_tag(driver, tag_value: str, per_js: bool = False, timeout: float = TIMEOUT) -> str:
+    """
+    Wählt den Ziehungstag und wartet, bis dessen Zahlen vollständig angezeigt werden.
+    Rückgabe: Signatur der angezeigten Ziehung.
+    """
+    alte_signatur, _ = ziehungs_zustand(driver)
+    with messung.spanne("fetch", art="tag"):
+        gewechselt = _waehle(driver, TAG_SELECT, tag_value, per_js)
+    with messung.spanne("wait", art="tag"):
+        # war schon ausgewählt → nur Vollständigkeit
+        return warte_auf_ziehung(driver, alte_signatur if gewechselt else None, timeout)
+
+
+def oeffne_jahr(driver, url: str, jahr, per_js: bool = False, timeout: float = TIMEOUT) -> list:
+    """
+    Wählt das Jahr in der bereits geöffneten Seite (geladen wird nur, wenn sie noch nicht offen ist
+    oder das Umschalten fehlschlägt). Rückgabe: Tagesoptionen [[value, Text], …].
+    """
+    try:
+        if driver.execute_script(_OFFENES_JAHR_JS, JAHR_SELECT) is None:
+            lade_seite(driver, url, timeout)
+        return waehle_jahr(driver, jahr, per_js, timeout)
+    except WebDriverException as e:
+        print(f"[!] Jahreswechsel ohne Neuladen fehlgeschlagen ({jahr}): {e.__class__.__name__} – lade Seite neu")
+        ZAEHLER["neu_geladen_nach_fehler"] += 1
+        messung.erneut()
+        lade_seite(driver, url, timeout)
+        return waehle_jahr(driver, jahr, per_js, timeout)
+
+
+def gehe_zu_ziehung(driver, url: str, jahr, tag_value: str, per_js: bool = False,
+                    timeout: float = TIMEOUT) -> str:
+    """
+    Zeigt die gewünschte Ziehung an, ohne die Seite neu zu laden:
+    - Seite noch nicht offen → einmal laden
+    - anderes Jahr → nur das Jahres-Dropdown umschalten
+    - danach nur das Tages-Dropdown umschalten und auf die neue Ziehung warten
+    Schlägt das fehl, wird die Seite einmal vollständig neu geladen.
+    Rückgabe: Signatur der angezeigten Ziehung.
+    """
+    try:
+        offenes_jahr = driver.execute_script(_OFFENES_JAHR_JS, JAHR_SELECT)
+        if offenes_jahr is None:
+            lade_seite(driver, url, timeout)
+        if offenes_jahr != str(jahr):
+            waehle_jahr(driver, jahr, per_js, timeout)
+        return waehle_tag(driver, tag_value, per_js, timeout)
+    except WebDriverException as e:  # auch TimeoutException
+        print(f"[!] Navigation ohne Neuladen fehlgeschlagen ({jahr}, {tag_value}): {e.__class__.__name__} – lade Seite neu")
+        ZAEHLER["neu_geladen_nach_fehler"] += 1
+        messung.erneut()
+        lade_seite(driver, url, timeout)
+        waehle_jahr(driver, jahr, per_js, timeout)
+        return waehle_tag(driver, tag_value, per_js, timeout)
+
+
+def schalte_jahr(driver, url: str, jahr, per_js: bool = False, timeout: float = TIMEOUT) -> list:
+    """
+    Wie oeffne_jahr(), wartet aber nur auf die Tagesoptionen, nicht auf die Kugeln.
+    Rückgabe: Tagesoptionen [[value, Text], …].
+    """
+    if driver.execute_script(_OFFENES_JAHR_JS, JAHR_SELECT) is None:
+        lade_seite(driver, url, timeout, kugeln=False)
+    alte = tag_optionen(driver)
+    with messung.spanne("fetch", art="jahr"):
+        gewechselt = _waehle(driver, JAHR_SELECT, str(jahr), per_js)
+    with messung.spanne("wait", art="jahr"):
+        return warte_auf_tag_optionen(driver, alte if gewechselt else None, timeout)
+
+
+def schalte_zu_ziehung(driver, url: str, jahr, tag_value: str, per_js: bool = False,
+                       timeout: float = TIMEOUT):
+    """
+    Wie gehe_zu_ziehung(), wartet aber nicht auf die Kugeln: Seite (falls nötig) laden,
+    Jahr umschalten, dann nur den Tag setzen. Die Ziehung selbst kommt aus dem XHR-Mitschnitt.
+    """
+    if driver.execute_script(_OFFENES_JAHR_JS, JAHR_SELECT) != str(jahr):
+        schalte_jahr(driver, url, jahr, per_js, timeout)
+    with messung.spanne("fetch", art="tag"):
+        _waehle(driver, TAG_SELECT, tag_value, per_js)
+
+
+def lies_seite(driver, selektoren: dict = HISTORIE_SEITE) -> dict:
+    """
+    Liest die angezeigte Ziehung mit einem einzigen execute_script-Aufruf:
+    {"zahlen": [int, …], "superzahl": int | None, "zeit": <time datetime>, "jahr", "tag_value",
+     "tag_text", "optionen": [[value, Text], …], "quoten": {Klasse: Betrag}}
+    Nicht lesbare Zahlen ergeben eine leere Liste (wie bisher bei Fehlern).
+    """
+    daten = driver.execute_script(_LIES_SEITE_JS, selektoren)
+    zahlen = daten["zahlen"]
+    daten["zahlen"] = [int(z) for z in zahlen] if all(z.isdigit() for z in zahlen) else []
+    superzahl = daten["superzahl"]
+    daten["superzahl"] = int(superzahl[0]) if superzahl and superzahl[0].isdigit() else None
+    return daten
+
+
+def warte_auf_seite(driver, selektoren: dict = HISTORIE_SEITE, timeout: float = TIMEOUT) -> dict:
+    """
+    Wie lies_seite(), wartet aber, bis mindestens 6 Zahlen lesbar sind (jede Prüfung = ein Roundtrip).
+    """
+    def bereit(d):
+        daten = lies_seite(d, selektoren)
+        return daten if len(daten["zahlen"]) >= 6 else False
+    return _warte(driver, bereit, timeout, "Lottozahlen nicht gefunden")
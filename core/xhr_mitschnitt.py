@@ -0,0 +1,149 @@
+"""
+Modulname: xhr_mitschnitt.py
+Pfad:     core/xhr_mitschnitt.py
+Zweck:    JSON-Antworten (XHR/fetch) der lotto.de-Seite über das DevTools-Protokoll mitschneiden
+
+Beschreibung:
+Statt auf das Rendern der Kugeln zu warten und den DOM zu lesen, werden die Netzwerkantworten
+der Seite mitgelesen (Performance-Log von chromedriver + Network.getResponseBody) und direkt
+in LottoZiehung-Objekte umgewandelt (core/ziehung_payload.py):
+- keine Render-Wartezeiten, kein DOM-Parsen, vollständige Quoten aus den Daten der Seite
+- jede gesehene Ziehung wird nach Datum zwischengespeichert; liefert eine Antwort ein ganzes
+  Jahr, muss für die übrigen Tage gar nichts mehr ausgewählt werden
+- kommt für ein Datum keine passende Antwort, liefert warte_auf_ziehung() None → die Scraper
+  lesen dann wie bisher den DOM; nach FEHLVERSUCHE Fehlschlägen in Folge wird der Mitschnitt
+  für den Lauf abgeschaltet
+
+Voraussetzung: Chrome/Edge mit aktiviere_mitschnitt(options) gestartet.
+"""
+
+import json
+import time
+import base64
+
+from selenium.common.exceptions import WebDriverException
+
+from core import messung
+from core.ziehung_payload import ziehungen_aus_payload
+
+API_MUSTER = ("/api/",)  # nur Antworten, deren URL eines der Muster enthält, werden ausgewertet
+XHR_TIMEOUT = 3  # Sekunden, die pro Ziehung auf eine passende Antwort gewartet wird
+POLL = 0.05
+FEHLVERSUCHE = 3
+
+
+def aktiviere_mitschnitt(options):
+    """
+    Schaltet das Performance-Log (Netzwerkereignisse) für Chrome-/Edge-Optionen ein.
+    """
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    return options
+
+
+class XhrMitschnitt:
+    def __init__(self, driver, muster: tuple = API_MUSTER):
+        self.driver = driver
+        self.muster = muster
+        self.aktiv = hasattr(driver, "execute_cdp_cmd")
+        self.ziehungen = {}  # ISO-Datum → LottoZiehung
+        self.antworten = 0
+        self._offen = {}  # requestId → URL (Antwort da, Body noch nicht fertig)
+        self._fehlversuche = 0
+        if self.aktiv:
+            driver.execute_cdp_cmd("Network.enable", {})
+            self.leeren()  # Ereignisse früherer Nutzer eines wiederverwendeten Browsers verwerfen
+
+    def wechsle_driver(self, driver):
+        """
+        Mitschnitt auf einen neuen Browser umstellen (z. B. nach dem Recycling im Driver-Pool);
+        bereits mitgeschnittene Ziehungen und ein Abschalten bleiben erhalten.
+        """
+        self.driver = driver
+        self._offen.clear()
+        if self.aktiv:
+            driver.execute_cdp_cmd("Network.enable", {})
+            self.leeren()
+
+    def _passt(self, antwort: dict) -> bool:
+        url = antwort.get("url", "")
+        return "json" in antwort.get("mimeType", "").lower() and any(m in url for m in self.muster)
+
+    def _body(self, request_id: str):
+        body = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+        text = body.get("body", "")
+        if body.get("base64Encoded"):
+            text = base64.b64decode(text).decode("utf-8", errors="replace")
+        return json.loads(text)
+
+    def verarbeite_log(self) -> int:
+        """
+        Liest die neuen Netzwerkereignisse und übernimmt alle Ziehungen aus fertigen JSON-Antworten.
+        Rückgabe: Anzahl neu erkannter Ziehungen.
+        """
+        if not self.aktiv:
+            return 0
+        neu = 0
+        for eintrag in self.driver.get_log("performance"):
+            nachricht = json.loads(eintrag["message"])["message"]
+            methode, parameter = nachricht.get("method"), nachricht.get("params", {})
+            if methode == "Network.responseReceived" and self._passt(parameter.get("response", {})):
+                self._offen[parameter["requestId"]] = parameter["response"]["url"]
+            elif methode == "Network.loadingFailed":
+                self._offen.pop(parameter.get("requestId"), None)
+            elif methode == "Network.loadingFinished" and parameter.get("requestId") in self._offen:
+                url = self._offen.pop(parameter["requestId"])
+                try:
+                    daten = self._body(parameter["requestId"])
+                except (WebDriverException, ValueError) as e:
+                    print(f"[!] XHR-Antwort nicht lesbar ({url}): {e.__class__.__name__}")
+                    continue
+                self.antworten += 1
+                for ziehung in ziehungen_aus_payload(daten):
+                    neu += ziehung.datum not in self.ziehungen
+                    self.ziehungen[ziehung.datum] = ziehung
+        return neu
+
+    def leeren(self):
+        """
+        Verwirft bisher angefallene Ereignisse (z. B. vor dem Start), die Zwischenablage bleibt erhalten.
+        """
+        if self.aktiv:
+            self.driver.get_log("performance")
+            self._offen.clear()
+
+    def vorhanden(self, datum: str):
+        """
+        Bereits mitgeschnittene Ziehung zum ISO-Datum (ohne zu warten), sonst None.
+        """
+        if self.aktiv:
+            self.verarbeite_log()
+        return self.ziehungen.get(datum)
+
+    def warte_auf_ziehung(self, datum: str = None, timeout: float = XHR_TIMEOUT):
+        """
+        Wartet auf die Ziehung zum ISO-Datum (datum=None: auf irgendeine neue Ziehung).
+        Rückgabe: LottoZiehung oder None (→ DOM-Fallback beim Aufrufer).
+        """
+        if not self.aktiv:
+            return None
+        bekannt = set(self.ziehungen)
+        ende = time.monotonic() + timeout
+        with messung.spanne("wait", art="xhr") as spanne:
+            while True:
+                self.verarbeite_log()
+                if datum is not None and datum in self.ziehungen:
+                    self._fehlversuche = 0
+                    return self.ziehungen[datum]
+                if datum is None and set(self.ziehungen) - bekannt:
+                    self._fehlversuche = 0
+                    return self.ziehungen[max(set(self.ziehungen) - bekannt)]
+                if time.monotonic() >= ende:
+                    spanne.setze("keine")
+                    break
+                time.sleep(POLL)
+
+        self._fehlversuche += 1
+        if self._fehlversuche >= FEHLVERSUCHE:
+            print(f"[!] {FEHLVERSUCHE}× keine passende XHR-Antwort – Mitschnitt abgeschaltet, lese den DOM.")
+            self.aktiv = False
+        return None
@@ -0,0 +1,196 @@
+"""
+Modulname: ziehung_payload.py
+Pfad:     core/ziehung_payload.py
+Zweck:    Ziehungsdaten aus den JSON-Antworten (XHR) der lotto.de-Seite in LottoZiehung-Objekte umwandeln
+
+Beschreibung:
+Die React-Seite lädt Zahlen, Superzahl und Quoten als JSON, bevor sie gerendert werden.
+Der genaue Aufbau der Antworten ist nicht dokumentiert – daher wird tolerant gesucht:
+- jede (verschachtelte) Struktur mit Datum + mindestens 6 Zahlen gilt als Ziehung
+- Schlüsselnamen sind in den Tupeln unten konfigurierbar (englisch wie in der API, deutsch wie im Modell)
+- Zahlen dürfen als int oder als Objekt ({"drawNumber": 7, "drawNumberType": …}) vorliegen;
+  Einträge mit "super" im Typ werden als Superzahl erkannt
+- Datum als ISO-Text, "dd.mm.yyyy" oder Zeitstempel in Millisekunden
+
+Eine Antwort kann mehrere Ziehungen enthalten (z. B. alle Ziehungen eines Jahres).
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+# Projektverzeichnis zur sys.path hinzufügen, um Model-Import zu ermöglichen
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from model.lotto_model import LottoZiehung
+
+ZEITZONE = ZoneInfo("Europe/Berlin")  # Ziehungsdaten sind deutsche Kalendertage
+EPOCHE = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+DATUM_SCHLUESSEL = ("drawDate", "drawDateTime", "date", "datum", "ziehungsdatum")
+ZAHLEN_SCHLUESSEL = ("drawNumbersCollection", "drawNumbers", "numbers", "lottoNumbers", "zahlen")
+SUPERZAHL_SCHLUESSEL = ("superNumber", "superzahl", "superNumberValue")
+QUOTEN_SCHLUESSEL = ("oddsCollection", "odds", "winningClasses", "quoten")
+
+ZAHL_WERT = ("drawNumber", "number", "value", "zahl")
+ZAHL_TYP = ("drawNumberType", "type", "typ")
+KLASSE_SCHLUESSEL = ("winningClassDescription", "winningClass", "klasse", "class")
+BETRAG_SCHLUESSEL = ("odds", "prize", "amount", "quote", "gewinn")
+
+
+def _erster(daten: dict, schluessel: tuple):
+    for s in schluessel:
+        if daten.get(s) is not None:
+            return daten[s]
+    return None
+
+
+def _als_zahl(wert):
+    if isinstance(wert, bool):
+        return None
+    if isinstance(wert, int):
+        return wert
+    if isinstance(wert, str) and wert.strip().isdigit():
+        return int(wert.strip())
+    return None
+
+
+def iso_aus_wert(wert) -> str | None:
+    """
+    "2025-04-12T…", "12.04.2025" oder 1744480800000 (ms) → "2025-04-12".
+    Zeitstempel und ISO-Texte mit Zone ("…Z", "…+00:00") werden in Europe/Berlin ausgewertet –
+    ein reines Datum, als Berliner Mitternacht gesendet, landet sonst in UTC auf dem Vortag.
+    Zeitstempel vor 1970 (Ziehungen ab 1955) sind negativ; gerechnet wird per timedelta,
+    da fromtimestamp() negative Werte unter Windows ablehnt.
+    """
+    if isinstance(wert, (int, float)) and not isinstance(wert, bool):
+        millisekunden = wert if abs(wert) > 1e11 else wert * 1000
+        zeitpunkt = EPOCHE + timedelta(milliseconds=millisekunden)
+        return zeitpunkt.astimezone(ZEITZONE).date().isoformat()
+    if not isinstance(wert, str):
+        return None
+    wert = wert.strip()
+    if "T" in wert:
+        try:
+            zeitpunkt = datetime.fromisoformat(wert.replace("Z", "+00:00"))
+            if zeitpunkt.tzinfo is not None:
+                return zeitpunkt.astimezone(ZEITZONE).date().isoformat()
+        except ValueError:
+            pass  # z. B. Sekundenbruchteile in anderem Format → nur den Datumsteil lesen
+    for format_, laenge in (("%Y-%m-%d", 10), ("%d.%m.%Y", 10)):
+        try:
+            return datetime.strptime(wert[:laenge], format_).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+
+def _zahlen_und_superzahl(daten: dict) -> tuple[list[int], int | None]:
+    sammlung = _erster(daten, ZAHLEN_SCHLUESSEL) or []
+    superzahl = _als_zahl(_erster(daten, SUPERZAHL_SCHLUESSEL))
+    zahlen = []
+    if not isinstance(sammlung, list):
+        return [], superzahl
+    for eintrag in sammlung:
+        if isinstance(eintrag, dict):
+            wert = _als_zahl(_erster(eintrag, ZAHL_WERT))
+            if "super" in str(_erster(eintrag, ZAHL_TYP) or "").lower():
+                superzahl = wert if superzahl is None else superzahl
+                continue
+        else:
+            wert = _als_zahl(eintrag)
+        if wert is not None:
+            zahlen.append(wert)
+    return zahlen, superzahl
+
+
+def _quoten(daten: dict) -> dict:
+    quoten = {}
+    for eintrag in _erster(daten, QUOTEN_SCHLUESSEL) or []:
+        if not isinstance(eintrag, dict):
+            continue
+        klasse, betrag = _erster(eintrag, KLASSE_SCHLUESSEL), _erster(eintrag, BETRAG_SCHLUESSEL)
+        if klasse is None or betrag is None:
+            continue
+        klasse = f"Klasse {klasse}" if _als_zahl(klasse) is not None else str(klasse).strip()
+        quoten[klasse] = betrag
+    return quoten
+
+
+def ziehung_aus_objekt(daten: dict) -> LottoZiehung | None:
+    """
+    Ein einzelnes JSON-Objekt → LottoZiehung, None wenn Datum oder 6 Zahlen fehlen.
+    """
+    datum = iso_aus_wert(_erster(daten, DATUM_SCHLUESSEL))
+    zahlen, superzahl = _zahlen_und_superzahl(daten)
+    if datum is None or len(zahlen) < 6:
+        return None
+    return LottoZiehung(
+        datum=datum,
+        zahlen=zahlen[:6],
+        superzahl=superzahl if superzahl is not None else -1,
+        quoten=_quoten(daten),
+    )
+
+
+def ziehungen_aus_payload(daten) -> list[LottoZiehung]:
+    """
+    Durchsucht eine komplette JSON-Antwort (beliebig verschachtelt) nach Ziehungen.
+    """
+    gefunden, offen = [], [daten]
+    while offen:
+        knoten = offen.pop()
+        if isinstance(knoten, dict):
+            try:
+                ziehung = ziehung_aus_objekt(knoten)
+            except (ValueError, TypeError, OverflowError, OSError) as e:
+                # Ein fehlerhaftes Objekt darf die übrigen Ziehungen der Antwort nicht verwerfen
+                print(f"[!] Ziehung im Payload übersprungen: {e.__class__.__name__}: {e}")
+                continue
+            if ziehung is not None:
+                gefunden.append(ziehung)
+                continue
+            offen.extend(knoten.values())
+        elif isinstance(knoten, list):
+            offen.extend(knoten)
+    return gefunden
+
+
+def scraper_eintrag_aus_ziehung(ziehung: LottoZiehung, datum_text: str, jahr) -> dict:
+    """
+    LottoZiehung → Eintrag im Format der historischen Scraper (zahl_1 … zahl_6), inklusive Quoten.
+    """
+    eintrag = {"datum": datum_text, "jahr": jahr}
+    for i, zahl in enumerate(ziehung.zahlen, start=1):
+        eintrag[f"zahl_{i}"] = zahl
+    eintrag["superzahl"] = ziehung.superzahl if ziehung.superzahl != -1 else None
+    eintrag["quoten"] = ziehung.quoten
+    return eintrag
+
+
+if __name__ == "__main__":
+    # Selbstprüfung der Datumsumwandlung (u. a. Ziehungen vor 1970, UTC-Texte, Sommerzeit)
+    faelle = [
+        ("2025-04-12T19:25:00", "2025-04-12"),
+        ("12.04.2025", "2025-04-12"),
+        ("2025-04-11T22:00:00Z", "2025-04-12"),        # Berliner Mitternacht in UTC (Sommerzeit)
+        ("2025-01-03T23:00:00+00:00", "2025-01-04"),   # Berliner Mitternacht in UTC (Winterzeit)
+        (1744408800000, "2025-04-12"),                 # dasselbe als ms-Zeitstempel
+        (-315532800000, "1960-01-02"),                 # vor 1970 → negativ
+        (-449110800000, "1955-10-09"),                 # erste Ziehung, Berliner Mitternacht
+        (1744408800, "2025-04-12"),                    # Sekunden statt ms
+    ]
+    abweichend = [(wert, soll, iso_aus_wert(wert)) for wert, soll in faelle if iso_aus_wert(wert) != soll]
+    for wert, soll, ist in abweichend:
+        print(f"⚠️ {wert!r}: erwartet {soll}, erhalten {ist}")
+
+    payload = {"draws": [
+        {"drawDate": -449110800000, "drawNumbersCollection": [1, 2, 3, 4, 5, 6], "superNumber": 3},
+        {"drawDate": 10 ** 20, "drawNumbersCollection": [7, 8, 9, 10, 11, 12]},  # unlesbar → übersprungen
+    ]}
+    gefunden = [z.datum for z in ziehungen_aus_payload(payload)]
+    if gefunden != ["1955-10-09"]:
+        print(f"⚠️ Payload mit fehlerhaftem Objekt: {gefunden}")
+        abweichend.append(payload)
+    if not abweichend:
+        print(f"✅ {len(faelle)} Datumsfälle und fehlerhaftes Payload-Objekt korrekt")
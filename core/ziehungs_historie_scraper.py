@@ -8,8 +8,12 @@ Website:  https://www.lotto.de/lotto-6aus49/lottozahlen
 Funktionen:
 - Steuert Jahr- & Datumsauswahl dynamisch über die Weboberfläche
 - Extrahiert Ziehungsdaten (Datum, 6 Zahlen, Superzahl)
-- Speichert pro Jahr als JSON-Datei
+- XHR-Modus: liest Ziehungen samt Quoten aus den JSON-Antworten der Seite (DOM nur als Fallback)
+- Speichert pro Jahr als JSON-Datei; vorhandene Jahresdateien und das Checkpoint-Journal
+  werden beim nächsten Lauf gelesen → Abbruch kostet nur die laufende Ziehung
+- Inkrementeller Modus (--nur-neue): nur Ziehungen nach der jüngsten Ziehung im Speicher
 - Erstellt zusammenfassende CSV- und Excel-Dateien für alle Ziehungen
+- Zeitmessung (--messen): Dauer je Ziehung und Phase als JSONL-Trace mit Auswertung (core/messung.py)
 
 Abhängigkeiten:
 - Selenium
@@ -21,18 +25,27 @@ Nutzung:
 >>> PS C:\Extracta> .\venv\Scripts\activate
 >>> (venv) PS C:\Extracta> python core/ziehungs_historie_scraper.py
 >>> python core/ziehungs_historie_scraper.py
+>>> python core/ziehungs_historie_scraper.py --nur-neue
+>>> python core/ziehungs_historie_scraper.py --messen
 """
 
 import os
-import time
+import sys
 import json
 import pandas as pd
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from datetime import datetime
+
+# Projektverzeichnis zur sys.path hinzufügen, um Model-Import zu ermöglichen
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from model.lotto_model import ziehung_aus_scraper_eintrag, speichere_ziehungen, iso_datum, neuestes_datum
+from core.fortschritt_journal import FortschrittsJournal
+from core import messung
+from core.xhr_mitschnitt import XhrMitschnitt
+from core.driver_pool import leihe_driver
+from core.selenium_werkzeuge import (
+    lade_seite, waehle_jahr, waehle_tag, oeffne_jahr, gehe_zu_ziehung, warte_auf_seite, ZAEHLER,
+    schalte_jahr, schalte_zu_ziehung
+)
 
 # Zielseite, von der gescrapt wird
 BASE_URL = "https://www.lotto.de/lotto-6aus49/lottozahlen"
@@ -40,73 +53,51 @@ DATA_PATH = os.path.join("data", "ziehungen_historie")
 os.makedirs(DATA_PATH, exist_ok=True)
 
 class LottoScraper:
-    def __init__(self):
+    def __init__(self, neu_laden=False, schlank=True, xhr=True):
         """
-        Initialisiert den Chrome WebDriver im Headless-Modus (unsichtbarer Browser).
+        Leiht einen warmen Headless-Chrome aus dem Driver-Pool bzw. vom Daemon (core/driver_pool.py).
+        neu_laden=True lädt die Seite wie früher für jede Ziehung neu; standardmäßig
+        wird innerhalb der geöffneten Seite navigiert.
+        schlank=True blockiert Bilder, Schriften und Tracking-Skripte (core/schlanker_browser.py).
+        xhr=True liest die Ziehungen aus den Netzwerkantworten der Seite (core/xhr_mitschnitt.py).
         """
-        chrome_options = Options()
-        chrome_options.add_argument("--headless=new")
-        self.driver = webdriver.Chrome(service=Service("tools/chromedriver.exe"), options=chrome_options)
+        self.neu_laden = neu_laden
+        self._leihe = leihe_driver(schlank, xhr)
+        self.driver = self._leihe.driver
+        self.mitschnitt = XhrMitschnitt(self.driver) if xhr else None
+        self.journal = FortschrittsJournal("ziehungs_historie")
+        self.offene_jahre = []  # Jahre mit Fehlern in diesem Lauf → Journal bleibt für den nächsten Lauf
 
     def lade_jahr_und_tag(self, jahr, tag_value):
         """
         Öffnet die Website und wählt ein bestimmtes Jahr und einen Ziehungstag aus.
         Dies wird über JavaScript ausgelöst (wie ein echter Klick).
+        Statt fester Pausen wird auf die Änderung des DOM gewartet (core/selenium_werkzeuge.py).
+        Ohne neu_laden werden nur Jahr/Tag in der offenen Seite umgeschaltet.
         """
-        self.driver.get(BASE_URL)
-        time.sleep(2)
-
-        jahr_select = self.driver.find_element(By.CSS_SELECTOR, "select[id^='selectedYear-select']")
-        self.driver.execute_script(
-            "arguments[0].value = arguments[1]; arguments[0].dispatchEvent(new Event('change'));",
-            jahr_select, str(jahr)
-        )
-        time.sleep(2)
-
-        tag_select = self.driver.find_element(By.CSS_SELECTOR, "select[id^='daySelect-select']")
-        self.driver.execute_script(
-            "arguments[0].value = arguments[1]; arguments[0].dispatchEvent(new Event('change'));",
-            tag_select, tag_value
-        )
-        time.sleep(2)
+        if not self.neu_laden:
+            gehe_zu_ziehung(self.driver, BASE_URL, jahr, tag_value, per_js=True)
+            return
+        lade_seite(self.driver, BASE_URL)
+        waehle_jahr(self.driver, jahr, per_js=True)
+        waehle_tag(self.driver, tag_value, per_js=True)
 
     def extrahiere_daten(self, jahr, datum):
         """
-        Wartet auf die Lottozahlen (6 Kugeln) und Superzahl.
+        Wartet auf die Lottozahlen (6 Kugeln) und liest sie samt Superzahl
+        mit einem einzigen execute_script-Aufruf (core/selenium_werkzeuge.py).
         Gibt ein Dictionary mit Datum, Jahr, Zahlen und Superzahl zurück.
         """
         try:
-            #  Warten bis 6 Kugeln im DOM erscheinen
-            WebDriverWait(self.driver, 10).until(
-                lambda d: len(
-                    d.find_elements(By.CSS_SELECTOR, ".DrawNumbersCollection__container")[0]
-                    .find_elements(By.CLASS_NAME, "LottoBall")
-                ) >= 6
-            )
-
-            # Lottozahlen extrahieren
-            zahlen_container = self.driver.find_elements(By.CSS_SELECTOR, ".DrawNumbersCollection__container")[0]
-            zahlen_elems = zahlen_container.find_elements(By.CLASS_NAME, "LottoBall")
-            zahlen = [int(el.text.strip()) for el in zahlen_elems]
-
+            with messung.spanne("extract"):
+                seite = warte_auf_seite(self.driver)
+            zahlen, superzahl = seite["zahlen"], seite["superzahl"]
         except Exception as e:
             print(f" Lottozahlen fehlen für {datum} ({jahr}): {e}")
-            zahlen = []
-
-        try:
-            #  Superzahl warten und extrahieren
-            WebDriverWait(self.driver, 5).until(
-                lambda d: d.find_elements(By.CSS_SELECTOR, ".DrawNumbersCollection__container")[1]
-                .find_element(By.CLASS_NAME, "LottoBall")
-            )
+            zahlen, superzahl = [], None
 
-            super_container = self.driver.find_elements(By.CSS_SELECTOR, ".DrawNumbersCollection__container")[1]
-            super_elem = super_container.find_element(By.CLASS_NAME, "LottoBall")
-            superzahl = int(super_elem.text.strip())
-
-        except Exception as e:
-            print(f" Superzahl fehlt für {datum} ({jahr}): {e}")
-            superzahl = None
+        if zahlen and superzahl is None:
+            print(f" Superzahl fehlt für {datum} ({jahr})")
 
         return {
             "datum": datum,
@@ -115,86 +106,226 @@ class LottoScraper:
             "superzahl": superzahl
         }
 
-    def extrahiere_pro_jahr(self, jahr):
+    def zaehle_seite(self):
         """
-        Für ein bestimmtes Jahr:
-        1. Lade alle Datum-Optionen
-        2. Iteriere durch alle Ziehungen
-        3. Extrahiere und speichere die Daten in einer JSON-Datei
+        Meldet eine Ziehung an den Driver-Pool. Wurde der Browser nach MAX_SEITEN ersetzt, zeigen
+        Driver und XHR-Mitschnitt auf den neuen (die Seite wird beim nächsten Schritt neu geladen).
         """
-        print(f" Jahr {jahr} wird verarbeitet …")
-        self.driver.get(BASE_URL)
-        time.sleep(2)
-
-        jahr_select = self.driver.find_element(By.CSS_SELECTOR, "select[id^='selectedYear-select']")
-        self.driver.execute_script(
-            "arguments[0].value = arguments[1]; arguments[0].dispatchEvent(new Event('change'));",
-            jahr_select, str(jahr)
-        )
-        time.sleep(2)
-
-        # Warte und hole die Optionen für alle Ziehungstage
-        for _ in range(10):
-            try:
-                tag_select = self.driver.find_element(By.CSS_SELECTOR, "select[id^='daySelect-select']")
-                optionen = tag_select.find_elements(By.TAG_NAME, "option")
-                break
-            except Exception:
-                time.sleep(1)
-        else:
-            print(f"Konnte Tage für Jahr {jahr} nicht laden.")
-            return []
+        if self._leihe.seite():
+            self.driver = self._leihe.driver
+            if self.mitschnitt is not None:
+                self.mitschnitt.wechsle_driver(self.driver)
 
-        # Wichtig: jedes Mal neu selektieren, da Seite neu rendert
-        anzahl_optionen = len(optionen)
-        ziehungen = []
+    def xhr_aktiv(self):
+        """True, solange der XHR-Mitschnitt genutzt wird (schaltet sich nach Fehlschlägen selbst ab)."""
+        return self.mitschnitt is not None and self.mitschnitt.aktiv
 
-        for i in range(anzahl_optionen):
-            try:
-                # Dropdown neu holen, da es sich nach jeder Interaktion aktualisiert
-                tag_select = self.driver.find_element(By.CSS_SELECTOR, "select[id^='daySelect-select']")
-                option = tag_select.find_elements(By.TAG_NAME, "option")[i]
+    def hole_ziehung(self, jahr, tag_value, datum):
+        """
+        Liest eine Ziehung aus dem XHR-Mitschnitt – ohne Render-Wartezeit, bereits mitgeschnittene
+        Tage ganz ohne Auswahl. Ohne passende Antwort wie bisher über den DOM.
+        """
+        self.zaehle_seite()
+        if self.xhr_aktiv():
+            iso = iso_datum(datum, jahr)
+            ziehung = self.mitschnitt.vorhanden(iso)
+            if ziehung is None:
+                schalte_zu_ziehung(self.driver, BASE_URL, jahr, tag_value, per_js=True)
+                ziehung = self.mitschnitt.warte_auf_ziehung(iso)
+            if ziehung is not None:
+                with messung.spanne("parse", art="xhr"):
+                    return {
+                        "datum": datum,
+                        "jahr": jahr,
+                        "zahlen": ziehung.zahlen,
+                        "superzahl": ziehung.superzahl if ziehung.superzahl != -1 else None,
+                        "quoten": ziehung.quoten
+                    }
+        self.lade_jahr_und_tag(jahr, tag_value)
+        return self.extrahiere_daten(jahr, datum)
+
+    def lade_jahresdatei(self, jahr):
+        """
+        Liest eine bereits geschriebene Jahresdatei ziehungen_{jahr}.json zurück ([] wenn nicht vorhanden/defekt).
+        """
+        pfad = os.path.join(DATA_PATH, f"ziehungen_{jahr}.json")
+        if not os.path.exists(pfad):
+            return []
+        try:
+            with open(pfad, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            print(f"[!] Jahresdatei {pfad} unlesbar – Jahr wird neu gescrapt.")
+            return []
 
-                tag_value = option.get_attribute("value")
-                datum = option.text.strip()
+    def jahresdatei_vollstaendig(self, jahr, ziehungen):
+        """
+        Eine Jahresdatei gilt als Checkpoint, wenn alle Ziehungen 6 Zahlen haben und sie
+        nach Ende des Jahres geschrieben wurde (sonst fehlen womöglich die letzten Ziehungen).
+        """
+        if not ziehungen or any(len(z.get("zahlen") or []) < 6 for z in ziehungen):
+            return False
+        pfad = os.path.join(DATA_PATH, f"ziehungen_{jahr}.json")
+        return datetime.fromtimestamp(os.path.getmtime(pfad)).year > jahr
 
-                self.lade_jahr_und_tag(jahr, tag_value)
-                daten = self.extrahiere_daten(jahr, datum)
-                ziehungen.append(daten)
+    def speichere_jahresdatei(self, jahr, ziehungen):
+        """
+        Schreibt die Jahresdatei atomar (tmp + os.replace), damit ein Abbruch keine halbe Datei hinterlässt.
+        """
+        pfad = os.path.join(DATA_PATH, f"ziehungen_{jahr}.json")
+        with open(pfad + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(ziehungen, f, ensure_ascii=False, indent=2)
+        os.replace(pfad + ".tmp", pfad)
+
+    def extrahiere_pro_jahr(self, jahr, nach=None):
+        """
+        Für ein bestimmtes Jahr:
+        1. Lade alle Datum-Optionen
+        2. Iteriere durch alle Ziehungen (bereits im Checkpoint-Journal stehende werden übersprungen,
+           mit nach="JJJJ-MM-TT" auch alle Ziehungen bis einschließlich diesem Datum)
+        3. Schreibe jede Ziehung sofort ins Journal und am Ende die JSON-Datei des Jahres
+        Ein abgeschlossenes Vorjahr mit vollständiger Jahresdatei wird nur noch gelesen.
+        """
+        vorhanden = self.lade_jahresdatei(jahr)
+        if jahr < datetime.now().year and (self.journal.jahr_erledigt(jahr) or self.jahresdatei_vollstaendig(jahr, vorhanden)):
+            print(f" Jahr {jahr} bereits vollständig – {len(vorhanden)} Ziehungen aus Jahresdatei.")
+            return vorhanden
 
-            except Exception as e:
-                print(f" Fehler bei Ziehung: Index {i}, Jahr {jahr} – {e}")
+        print(f" Jahr {jahr} wird verarbeitet …")
 
-        # Speichern als JSON
-        with open(os.path.join(DATA_PATH, f"ziehungen_{jahr}.json"), "w", encoding="utf-8") as f:
-            json.dump(ziehungen, f, ensure_ascii=False, indent=2)
+        # Jahr wählen und warten, bis die Optionen für alle Ziehungstage geladen sind
+        # (Seite wird nur geladen, wenn sie noch nicht offen ist)
+        try:
+            if self.xhr_aktiv():
+                optionen = schalte_jahr(self.driver, BASE_URL, jahr, per_js=True)
+            elif self.neu_laden:
+                lade_seite(self.driver, BASE_URL)
+                optionen = waehle_jahr(self.driver, jahr, per_js=True)
+            else:
+                optionen = oeffne_jahr(self.driver, BASE_URL, jahr, per_js=True)
+        except Exception:
+            print(f"Konnte Tage für Jahr {jahr} nicht laden.")
+            self.offene_jahre.append(jahr)
+            # Bereits im Journal gesicherte Ziehungen mitliefern; die Jahresdatei bleibt unverändert,
+            # sonst sähe ein unvollständiges Jahr beim nächsten Lauf vollständig aus
+            nach_datum = {z["datum"]: z for z in vorhanden}
+            nach_datum.update((z["datum"], z) for z in self.journal.eintraege(jahr))
+            return list(nach_datum.values())
+
+        # Die Optionen (value, Datum) wurden einmal gelesen – kein erneutes Abfragen des Dropdowns pro Ziehung
+        fehlend = {}
+
+        for i, (tag_value, datum) in enumerate(optionen):
+            if self.journal.ist_erledigt(jahr, tag_value):
+                continue
+            if nach and (iso_datum(datum, jahr) or "") <= nach:
+                continue
+            with messung.ziehung(iso_datum(datum, jahr) or f"{jahr}/{tag_value}") as messpunkt:
+                try:
+                    daten = self.hole_ziehung(jahr, tag_value, datum)
+                    if len(daten["zahlen"]) < 6:
+                        raise ValueError("Unvollständige Zahlen")
+                    with messung.spanne("persist", art="journal"):
+                        self.journal.ziehung(jahr, tag_value, daten)
+
+                except Exception as e:
+                    # Platzhalter ohne Zahlen bleibt in der Jahresdatei → Jahr gilt beim nächsten Lauf als unvollständig
+                    fehlend[datum] = {"datum": datum, "jahr": jahr, "zahlen": [], "superzahl": None}
+                    messpunkt.setze("fehler", grund=str(e))
+                    print(f" Fehler bei Ziehung: Index {i}, Jahr {jahr} – {e}")
+
+        # Jahresdatei = bisheriger Inhalt + neu gelesene Ziehungen (Datum eindeutig, Reihenfolge wie im Dropdown)
+        nach_datum = {z["datum"]: z for z in vorhanden}
+        nach_datum.update((datum, z) for datum, z in fehlend.items() if datum not in nach_datum)
+        nach_datum.update((z["datum"], z) for z in self.journal.eintraege(jahr))
+        reihenfolge = {datum: i for i, (_, datum) in enumerate(optionen)}
+        ziehungen = sorted(nach_datum.values(), key=lambda z: reihenfolge.get(z["datum"], -1))
+        with messung.spanne("persist", art="jahresdatei", jahr=jahr):
+            self.speichere_jahresdatei(jahr, ziehungen)
+
+        if fehlend:
+            self.offene_jahre.append(jahr)
+        elif jahr < datetime.now().year and not nach:
+            self.journal.jahr_abschliessen(jahr)
 
         return ziehungen
 
-    def scrape(self, start=1955, ende=2025):
+    def scrape(self, start=1955, ende=2025, nur_neue=False):
         """
         Hauptfunktion für den Vollscan: Alle Ziehungen aller Jahre scrapen.
-        - Pro Jahr als JSON speichern
+        - Pro Ziehung sofort ins Checkpoint-Journal, pro Jahr als JSON speichern
+          (ein abgebrochener Lauf setzt beim nächsten Start dort fort)
+        - nur_neue=True: nur Ziehungen nach der jüngsten Ziehung im Primärspeicher;
+          die neuen Ziehungen werden in die bestehende Gesamtausgabe eingefügt
         - Gesamtausgabe als CSV + Excel
+        - Übernahme in den Primärspeicher als ein Massen-Import
         """
+        nach = neuestes_datum() if nur_neue else None
+        if nach:
+            start = max(start, int(nach[:4]))
+            print(f" Inkrementeller Lauf: nur Ziehungen nach {nach}")
+
         alle_ziehungen = []
         for jahr in range(start, ende + 1):
-            ziehungen = self.extrahiere_pro_jahr(jahr)
+            ziehungen = self.extrahiere_pro_jahr(jahr, nach)
             alle_ziehungen.extend(ziehungen)
 
         df = pd.DataFrame(alle_ziehungen)
-        df.to_csv(os.path.join(DATA_PATH, "alle_ziehungen.csv"), index=False)
-        df.to_excel(os.path.join(DATA_PATH, "alle_ziehungen.xlsx"), index=False)
-
-        print(f"✅ Export abgeschlossen: {len(alle_ziehungen)} Ziehungen gespeichert.")
+        if "quoten" in df:
+            # Quoten (nur im XHR-Modus) als JSON-Text, Excel kann keine Dictionaries speichern
+            df["quoten"] = df["quoten"].map(lambda q: json.dumps(q, ensure_ascii=False) if isinstance(q, dict) else q)
+        csv_pfad = os.path.join(DATA_PATH, "alle_ziehungen.csv")
+        if nach and os.path.exists(csv_pfad):
+            df = self.fuehre_gesamtausgabe_zusammen(pd.read_csv(csv_pfad), df)
+        with messung.spanne("persist", art="export", anzahl=len(df)):
+            df.to_csv(csv_pfad, index=False)
+            df.to_excel(os.path.join(DATA_PATH, "alle_ziehungen.xlsx"), index=False)
+
+        print(f"✅ Export abgeschlossen: {len(df)} Ziehungen gespeichert ({len(alle_ziehungen)} aus diesem Lauf).")
+        print(f"📄 Seitenaufrufe: {ZAEHLER['seitenaufrufe']} "
+              f"(davon {ZAEHLER['neu_geladen_nach_fehler']} nach Fehlern)")
+
+        with messung.spanne("parse", art="eintraege", anzahl=len(alle_ziehungen)):
+            ziehungen = [z for z in map(ziehung_aus_scraper_eintrag, alle_ziehungen) if z is not None]
+        speichere_ziehungen(ziehungen)
+
+        if self.offene_jahre:
+            print(f"⚠️ Unvollständige Jahre: {', '.join(map(str, self.offene_jahre))} – Checkpoint bleibt erhalten.")
+            return
+        # Alle Ziehungen stehen jetzt in den Jahresdateien und im Primärspeicher
+        self.journal.loeschen()
+
+    def fuehre_gesamtausgabe_zusammen(self, bestand, neu):
+        """
+        Fügt die Ziehungen eines inkrementellen Laufs in die bestehende Gesamtausgabe ein
+        (gleiches Jahr + Datum → neue Zeile gewinnt), sortiert nach Jahr, Monat, Tag.
+        Listen aus dem neuen Lauf werden wie in der CSV als Text geschrieben.
+        """
+        neu = neu.copy()
+        if "zahlen" in neu:
+            neu["zahlen"] = neu["zahlen"].map(lambda z: str(list(z)) if isinstance(z, list) else z)
+        gesamt = pd.concat([bestand, neu], ignore_index=True)
+        gesamt = gesamt.drop_duplicates(subset=["jahr", "datum"], keep="last")
+        tag_monat = gesamt["datum"].astype(str).str.extract(r"(\d{2})\.(\d{2})\.").astype(float)
+        reihenfolge = gesamt["jahr"].astype(int) * 10000 + tag_monat[1].fillna(0) * 100 + tag_monat[0].fillna(0)
+        return gesamt.iloc[reihenfolge.argsort(kind="stable")].reset_index(drop=True)
 
     def beenden(self):
-        """Beendet die Browser-Sitzung korrekt."""
-        self.driver.quit()
+        """Gibt den Browser an den Pool zurück."""
+        self.journal.schliessen()
+        self._leihe.zurueckgeben()
 
 
 # ========== Haupteinstiegspunkt für CLI-Start ==========
 if __name__ == "__main__":
+    if "--messen" in sys.argv:
+        messung.aktiviere(name="ziehungs_historie")
+    else:
+        messung.aktiviere_aus_umgebung("ziehungs_historie")
     scraper = LottoScraper()
-    scraper.scrape(start=1955, ende=1956)  # Testjahr, z. B. 1969 → ganze Serie 1955–2025
+    if "--nur-neue" in sys.argv:
+        scraper.scrape(ende=datetime.now().year, nur_neue=True)
+    else:
+        scraper.scrape(start=1955, ende=1956)  # Testjahr, z. B. 1969 → ganze Serie 1955–2025
     scraper.beenden()
+    messung.abschluss()
@@ -0,0 +1,129 @@
+"""
+Modul: data/HaeufigkeitRechner.py
+Ziel:
+- Berechnet die Ziehungshäufigkeit der Lottozahlen lokal aus dem Ziehungsspeicher
+- Vollberechnung in einem Schritt per np.bincount (optional nur für einen Zeitraum)
+- Inkrementelle Aktualisierung in O(1) pro neu gespeicherter Ziehung
+- Ergebnis im Format von parse_haeufigkeiten ({Zahl: Häufigkeit}) → direkt an HaeufigkeitSpeicher
+- Gescrapte Werte von lotto.de dienen nur noch als optionaler Abgleich
+"""
+
+import os
+import sys
+from datetime import date
+
+import numpy as np
+
+# Projektverzeichnis zur sys.path hinzufügen, um Model-Import zu ermöglichen
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from model.lotto_model import LottoZiehung, registriere_beobachter, entferne_beobachter
+from model.ziehung_binaer import lade_ziehungs_array
+
+
+def _ordinal(tag):
+    """
+    Akzeptiert date, ISO-String ("YYYY-MM-DD") oder None.
+    """
+    if tag is None:
+        return None
+    if isinstance(tag, str):
+        tag = date.fromisoformat(tag)
+    return tag.toordinal()
+
+
+class HaeufigkeitRechner:
+    def __init__(self, von=None, bis=None):
+        """
+        Leere Zähler für die Zahlen 1–49 und die Superzahl 0–9.
+        Optional auf einen Zeitraum [von, bis] beschränkt.
+        """
+        self.von = _ordinal(von)
+        self.bis = _ordinal(bis)
+        self.zahlen = np.zeros(50, dtype=np.int64)  # Index = Lottozahl (0 = fehlt)
+        self.superzahl = np.zeros(10, dtype=np.int64)
+        self.anzahl_ziehungen = 0
+
+    @classmethod
+    def aus_array(cls, arr: np.ndarray, von=None, bis=None):
+        """
+        Vollberechnung über ein Ziehungs-Array (model/ziehung_binaer.py) per bincount.
+        """
+        rechner = cls(von, bis)
+        auswahl = np.ones(len(arr), dtype=bool)
+        if rechner.von is not None:
+            auswahl &= arr["ordinal"] >= rechner.von
+        if rechner.bis is not None:
+            auswahl &= arr["ordinal"] <= rechner.bis
+        arr = arr[auswahl]
+
+        rechner.zahlen = np.bincount(arr["zahlen"].ravel(), minlength=50)[:50].astype(np.int64)
+        rechner.zahlen[0] = 0
+        superzahlen = arr["superzahl"][arr["superzahl"] >= 0]
+        rechner.superzahl = np.bincount(superzahlen, minlength=10)[:10].astype(np.int64)
+        rechner.anzahl_ziehungen = len(arr)
+        return rechner
+
+    @classmethod
+    def aus_speicher(cls, von=None, bis=None):
+        """
+        Vollberechnung über alle gespeicherten Ziehungen (data/ziehungen.json + Journal).
+        """
+        return cls.aus_array(lade_ziehungs_array(), von, bis)
+
+    def hinzufuegen(self, ziehung: LottoZiehung):
+        """
+        Zählt eine neue Ziehung dazu (O(1)). Ziehungen außerhalb des Zeitraums werden ignoriert.
+        """
+        tag = _ordinal(ziehung.datum)
+        if (self.von is not None and tag < self.von) or (self.bis is not None and tag > self.bis):
+            return
+        for zahl in ziehung.zahlen:
+            if 1 <= zahl <= 49:
+                self.zahlen[zahl] += 1
+        if ziehung.superzahl is not None and 0 <= ziehung.superzahl <= 9:
+            self.superzahl[ziehung.superzahl] += 1
+        self.anzahl_ziehungen += 1
+
+    def verbinden(self):
+        """
+        Hält die Zähler automatisch aktuell: jede über model/lotto_model.py
+        gespeicherte Ziehung wird sofort mitgezählt.
+        """
+        registriere_beobachter(self.hinzufuegen)
+        return self
+
+    def trennen(self):
+        """
+        Beendet die automatische Aktualisierung.
+        """
+        entferne_beobachter(self.hinzufuegen)
+
+    def als_dict(self) -> dict:
+        """
+        Häufigkeiten im Format von parse_haeufigkeiten: {Zahl: Häufigkeit}.
+        """
+        return {zahl: int(self.zahlen[zahl]) for zahl in range(1, 50)}
+
+    def superzahl_dict(self) -> dict:
+        """
+        Häufigkeiten der Superzahl: {Superzahl: Häufigkeit}.
+        """
+        return {zahl: int(anzahl) for zahl, anzahl in enumerate(self.superzahl)}
+
+    def vergleiche(self, gescrapt: dict) -> dict:
+        """
+        Abgleich mit gescrapten Werten (z. B. parse_haeufigkeiten).
+        Rückgabe: nur abweichende Zahlen als {Zahl: (lokal, gescrapt)}.
+        """
+        lokal = self.als_dict()
+        return {
+            zahl: (lokal.get(zahl), gescrapt.get(zahl))
+            for zahl in sorted(set(lokal) | set(gescrapt))
+            if lokal.get(zahl) != gescrapt.get(zahl)
+        }
+
+    def speichern(self, speicher, dateiname: str = "haeufigkeit"):
+        """
+        Übergibt die Häufigkeiten an einen HaeufigkeitSpeicher (JSON, CSV, Excel).
+        """
+        return speicher.speichere_alle(self.als_dict(), dateiname)
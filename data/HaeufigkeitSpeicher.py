@@ -1,14 +1,135 @@
 """
-Modul: core/haeufigkeit_speicher.py
+Modul: data/HaeufigkeitSpeicher.py
 Ziel:
-- Speichert Häufigkeitsdaten der Lottozahlen
+- Speichert Häufigkeitsdaten der Lottozahlen (und andere Statistik-Tabellen: Paare, Lücken, …)
 - Unterstützt drei Formate: JSON, CSV, Excel (.xlsx)
+- Schlüssel und Werte dürfen auch Tupel sein (z. B. Paare/Tripel, mehrere Kennzahlen)
+  → eine Spalte pro Tupel-Element
+- speichere_alle(): alle Formate in einem Durchgang über die Zeilen (Streaming-Writer,
+  Excel im Write-only-Modus), optional parallel in Threads
+- Jede Datei wird als Temp-Datei geschrieben und atomar umbenannt → Leser sehen nie halbe Dateien
 """
 
 import os
 import json
 import csv
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from openpyxl import Workbook
+
+STANDARD_SPALTEN = ["Zahl", "Häufigkeit"]
+FORMATE = ("json", "csv", "xlsx")
+_FORMAT_NAMEN = {"json": "JSON", "csv": "CSV", "xlsx": "Excel"}
+
+
+def _zeilen(daten: dict) -> list[list]:
+    """
+    Wandelt {Schlüssel: Wert} in Tabellenzeilen um; Tupel werden auf Spalten aufgeteilt.
+    """
+    return [
+        [*(schluessel if isinstance(schluessel, tuple) else (schluessel,)),
+         *(wert if isinstance(wert, tuple) else (wert,))]
+        for schluessel, wert in daten.items()
+    ]
+
+
+def _eingerueckt(obj) -> str:
+    """
+    JSON-Text eines Elements mit zwei Leerzeichen Einrückung (wie json.dump(indent=2)).
+    """
+    return json.dumps(obj, indent=2, ensure_ascii=False).replace("\n", "\n  ")
+
+
+class _Schreiber:
+    """
+    Basis für die Streaming-Writer: schreibt in eine Temp-Datei,
+    die erst nach erfolgreichem Abschluss den Zielnamen erhält.
+    """
+    def __init__(self, pfad: str):
+        self.pfad = pfad
+        self.tmp_pfad = f"{pfad}.tmp"
+
+    def zeile(self, zeile: list):
+        raise NotImplementedError
+
+    def schliessen(self):
+        raise NotImplementedError
+
+    def abschliessen(self):
+        self.schliessen()
+        os.replace(self.tmp_pfad, self.pfad)
+
+    def verwerfen(self):
+        try:
+            self.schliessen()
+        finally:
+            if os.path.exists(self.tmp_pfad):
+                os.remove(self.tmp_pfad)
+
+
+class _JsonSchreiber(_Schreiber):
+    """
+    Ohne Spaltennamen: Objekt {Schlüssel: Wert} (bisheriges Format).
+    Ohne Spaltennamen, Tupel-Schlüssel (z. B. Paare): Liste [[[1, 2], Wert], …] – ein JSON-Objekt
+    kann nur Text-Schlüssel, "1, 2" ließe sich nicht eindeutig zurücklesen.
+    Mit Spaltennamen: Liste von Datensätzen [{Spalte: Wert}, …].
+    """
+    def __init__(self, pfad: str, spalten: list = None, schluessel_breite: int = 1):
+        super().__init__(pfad)
+        self.spalten = spalten
+        self.schluessel_breite = schluessel_breite
+        self.als_liste = bool(spalten) or schluessel_breite > 1
+        self.f = open(self.tmp_pfad, "w", encoding="utf-8")
+        self.erste = True
+        self.f.write("[" if self.als_liste else "{")
+
+    def zeile(self, zeile: list):
+        self.f.write("\n  " if self.erste else ",\n  ")
+        self.erste = False
+        if self.spalten:
+            self.f.write(_eingerueckt(dict(zip(self.spalten, zeile))))
+        elif self.als_liste:
+            schluessel, wert = zeile[:self.schluessel_breite], zeile[self.schluessel_breite:]
+            self.f.write(json.dumps([schluessel, wert[0] if len(wert) == 1 else wert], ensure_ascii=False))  # eine Zeile je Eintrag
+        else:
+            wert = zeile[1] if len(zeile) == 2 else zeile[1:]
+            self.f.write(f"{json.dumps(str(zeile[0]), ensure_ascii=False)}: {_eingerueckt(wert)}")
+
+    def schliessen(self):
+        if not self.f.closed:
+            self.f.write(("" if self.erste else "\n") + ("]" if self.als_liste else "}"))
+            self.f.close()
+
+
+class _CsvSchreiber(_Schreiber):
+    def __init__(self, pfad: str, spalten: list):
+        super().__init__(pfad)
+        self.f = open(self.tmp_pfad, mode="w", newline="", encoding="utf-8")
+        self.writer = csv.writer(self.f)
+        self.writer.writerow(spalten)
+
+    def zeile(self, zeile: list):
+        self.writer.writerow(zeile)
+
+    def schliessen(self):
+        self.f.close()
+
+
+class _ExcelSchreiber(_Schreiber):
+    def __init__(self, pfad: str, spalten: list):
+        super().__init__(pfad)
+        self.tmp_pfad = f"{pfad}.tmp.xlsx"  # openpyxl erwartet die Endung
+        self.wb = Workbook(write_only=True)
+        self.ws = self.wb.create_sheet("Sheet1")  # wie bisher mit pandas
+        self.ws.append(spalten)
+        self.gespeichert = False
+
+    def zeile(self, zeile: list):
+        self.ws.append(zeile)
+
+    def schliessen(self):
+        if not self.gespeichert:
+            self.gespeichert = True
+            self.wb.save(self.tmp_pfad)
 
 
 class HaeufigkeitSpeicher:
@@ -20,35 +141,80 @@ class HaeufigkeitSpeicher:
         self.speicherpfad = speicherpfad
         os.makedirs(speicherpfad, exist_ok=True)
 
-    def speichere_json(self, daten: dict, dateiname: str = "haeufigkeit.json"):
+    def _schreiber(self, format: str, dateiname: str, spalten: list, schluessel_breite: int = 1) -> _Schreiber:
+        pfad = os.path.join(self.speicherpfad, dateiname)
+        if format == "json":
+            return _JsonSchreiber(pfad, spalten, schluessel_breite)
+        if format == "csv":
+            return _CsvSchreiber(pfad, spalten or STANDARD_SPALTEN)
+        if format == "xlsx":
+            return _ExcelSchreiber(pfad, spalten or STANDARD_SPALTEN)
+        raise ValueError(f"Unbekanntes Format: {format} (unterstützt: {', '.join(FORMATE)})")
+
+    def speichere_alle(self, daten: dict, dateiname: str = "haeufigkeit", formate=FORMATE,
+                       spalten: list = None, parallel: bool = False) -> dict:
         """
-        Speichert die Häufigkeiten als JSON-Datei.
+        Schreibt eine Statistik-Tabelle in alle gewünschten Formate.
+        - sequentiell: ein einziger Durchgang über die Zeilen, jede Zeile geht an alle Writer
+        - parallel=True: jeder Writer läuft in einem eigenen Thread
+        `dateiname` ohne Endung. Rückgabe: {Format: Pfad}.
         """
-        pfad = os.path.join(self.speicherpfad, dateiname)
-        with open(pfad, "w", encoding="utf-8") as f:
-            json.dump(daten, f, indent=2, ensure_ascii=False)
-        print(f"[✓] JSON gespeichert: {pfad}")
+        ziele = {format: f"{dateiname}.{format}" for format in formate}
+        return self._schreibe(daten, ziele, spalten, parallel)
 
-    def speichere_csv(self, daten: dict, dateiname: str = "haeufigkeit.csv"):
+    def _schreibe(self, daten: dict, ziele: dict, spalten: list, parallel: bool = False) -> dict:
         """
-        Speichert die Häufigkeiten als CSV-Datei.
+        Gemeinsamer Kern: ziele = {Format: Dateiname}.
         """
-        pfad = os.path.join(self.speicherpfad, dateiname)
-        with open(pfad, mode="w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(["Zahl", "Häufigkeit"])
-            for zahl, anzahl in daten.items():
-                writer.writerow([zahl, anzahl])
-        print(f"[✓] CSV gespeichert: {pfad}")
+        zeilen = _zeilen(daten)
+        erster = next(iter(daten), None)
+        breite = len(erster) if isinstance(erster, tuple) else 1
+        schreiber = {f: self._schreiber(f, name, spalten, breite) for f, name in ziele.items()}
+
+        def schreibe_alle_zeilen(s: _Schreiber):
+            for zeile in zeilen:
+                s.zeile(zeile)
+            s.schliessen()  # Excel speichert hier – ebenfalls im Thread
 
-    def speichere_excel(self, daten: dict, dateiname: str = "haeufigkeit.xlsx"):
+        try:
+            if parallel and len(schreiber) > 1:
+                with ThreadPoolExecutor(max_workers=len(schreiber)) as pool:
+                    for future in [pool.submit(schreibe_alle_zeilen, s) for s in schreiber.values()]:
+                        future.result()
+            else:
+                for zeile in zeilen:
+                    for s in schreiber.values():
+                        s.zeile(zeile)
+            for s in schreiber.values():
+                s.abschliessen()
+        except Exception:
+            # Temp-Dateien aufräumen; bereits umbenannte Dateien bleiben vollständig
+            for s in schreiber.values():
+                try:
+                    s.verwerfen()
+                except Exception:
+                    pass
+            raise
+
+        for format, s in schreiber.items():
+            print(f"[✓] {_FORMAT_NAMEN[format]} gespeichert: {s.pfad}")
+        return {format: s.pfad for format, s in schreiber.items()}
+
+    def speichere_json(self, daten: dict, dateiname: str = "haeufigkeit.json", spalten: list = None):
         """
-        Speichert die Häufigkeiten als Excel-Datei.
+        Speichert die Häufigkeiten als JSON-Datei.
+        Mit `spalten` wird eine Liste von Datensätzen ({Spalte: Wert}) geschrieben.
         """
-        pfad = os.path.join(self.speicherpfad, dateiname)
-        df = pd.DataFrame(list(daten.items()), columns=["Zahl", "Häufigkeit"])
-        df.to_excel(pfad, index=False)
-        print(f"[✓] Excel gespeichert: {pfad}")
+        return self._schreibe(daten, {"json": dateiname}, spalten)
 
-        
+    def speichere_csv(self, daten: dict, dateiname: str = "haeufigkeit.csv", spalten: list = None):
+        """
+        Speichert die Häufigkeiten als CSV-Datei.
+        """
+        return self._schreibe(daten, {"csv": dateiname}, spalten)
 
+    def speichere_excel(self, daten: dict, dateiname: str = "haeufigkeit.xlsx", spalten: list = None):
+        """
+        Speichert die Häufigkeiten als Excel-Datei (Write-only, ohne pandas).
+        """
+        return self._schreibe(daten, {"xlsx": dateiname}, spalten)
@@ -0,0 +1,138 @@
+"""
+Modul: data/KookkurrenzRechner.py
+Ziel:
+- Wie oft wurden zwei (Paare) bzw. drei (Tripel) Zahlen gemeinsam gezogen?
+- 49×49-Paarmatrix (symmetrisch) und dünn besetzte Tripel-Tabelle
+- Aufbau in einem vektorisierten Durchgang über alle gespeicherten Ziehungen
+- Inkrementelle Aktualisierung (15 Paare + 20 Tripel) pro neu gespeicherter Ziehung
+- Export über HaeufigkeitSpeicher (JSON, CSV, Excel)
+"""
+
+import os
+import sys
+from itertools import combinations
+
+import numpy as np
+
+# Projektverzeichnis zur sys.path hinzufügen, um Model-Import zu ermöglichen
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from model.lotto_model import LottoZiehung, registriere_beobachter, entferne_beobachter
+from model.ziehung_binaer import lade_ziehungs_array
+
+# Spaltenpaare bzw. -tripel innerhalb der 6 sortierten Zahlen einer Ziehung
+_PAAR_SPALTEN = np.array(list(combinations(range(6), 2)))  # 15 × 2
+_TRIPEL_SPALTEN = np.array(list(combinations(range(6), 3)))  # 20 × 3
+
+# Blockgröße für den Aufbau (begrenzt den Speicherbedarf bei Millionen Ziehungen)
+_BLOCK = 100_000
+
+
+class KookkurrenzRechner:
+    def __init__(self):
+        """
+        Leere Paarmatrix (Index = Lottozahl, 0 ungenutzt) und leere Tripel-Tabelle.
+        """
+        self.paare = np.zeros((50, 50), dtype=np.int64)
+        self.tripel = {}  # (a, b, c) mit a < b < c → Häufigkeit
+        self.anzahl_ziehungen = 0
+
+    @classmethod
+    def aus_array(cls, arr: np.ndarray):
+        """
+        Vollberechnung über ein Ziehungs-Array (model/ziehung_binaer.py).
+        Jedes Paar/Tripel wird als Zahl kodiert (a·50 + b bzw. a·2500 + b·50 + c)
+        und blockweise per bincount gezählt.
+        """
+        rechner = cls()
+        zahlen = np.sort(np.asarray(arr["zahlen"], dtype=np.int64), axis=1)
+        zahlen = zahlen[(zahlen > 0).all(axis=1)]  # unvollständige Ziehungen auslassen
+
+        paar_zaehler = np.zeros(50 * 50, dtype=np.int64)
+        tripel_zaehler = np.zeros(50 * 50 * 50, dtype=np.int64)
+        for start in range(0, len(zahlen), _BLOCK):
+            block = zahlen[start:start + _BLOCK]
+            p = block[:, _PAAR_SPALTEN]
+            paar_zaehler += np.bincount((p[..., 0] * 50 + p[..., 1]).ravel(), minlength=2500)
+            t = block[:, _TRIPEL_SPALTEN]
+            tripel_zaehler += np.bincount((t[..., 0] * 2500 + t[..., 1] * 50 + t[..., 2]).ravel(), minlength=125000)
+
+        obere = paar_zaehler.reshape(50, 50)
+        rechner.paare = obere + obere.T
+        for code in np.flatnonzero(tripel_zaehler):
+            a, rest = divmod(int(code), 2500)
+            b, c = divmod(rest, 50)
+            rechner.tripel[(a, b, c)] = int(tripel_zaehler[code])
+        rechner.anzahl_ziehungen = len(zahlen)
+        return rechner
+
+    @classmethod
+    def aus_speicher(cls):
+        """
+        Vollberechnung über alle gespeicherten Ziehungen (data/ziehungen.json + Journal).
+        """
+        return cls.aus_array(lade_ziehungs_array())
+
+    def hinzufuegen(self, ziehung: LottoZiehung):
+        """
+        Aktualisiert Paarmatrix und Tripel-Tabelle für eine neue Ziehung.
+        """
+        zahlen = sorted(z for z in ziehung.zahlen if 1 <= z <= 49)
+        if len(zahlen) != 6:
+            return
+        for a, b in combinations(zahlen, 2):
+            self.paare[a, b] += 1
+            self.paare[b, a] += 1
+        for schluessel in combinations(zahlen, 3):
+            self.tripel[schluessel] = self.tripel.get(schluessel, 0) + 1
+        self.anzahl_ziehungen += 1
+
+    def verbinden(self):
+        """
+        Hält die Tabellen automatisch aktuell (Beobachter in model/lotto_model.py).
+        """
+        registriere_beobachter(self.hinzufuegen)
+        return self
+
+    def trennen(self):
+        """
+        Beendet die automatische Aktualisierung.
+        """
+        entferne_beobachter(self.hinzufuegen)
+
+    def paar_dict(self) -> dict:
+        """
+        Alle Paare a < b: {(a, b): Häufigkeit}.
+        """
+        return {
+            (a, b): int(self.paare[a, b])
+            for a in range(1, 50) for b in range(a + 1, 50)
+        }
+
+    def tripel_dict(self) -> dict:
+        """
+        Alle gezogenen Tripel a < b < c (sortiert): {(a, b, c): Häufigkeit}.
+        """
+        return dict(sorted(self.tripel.items()))
+
+    def top_paare(self, anzahl: int = 10) -> list[tuple]:
+        """
+        Die häufigsten Paare als Liste [((a, b), Häufigkeit), …].
+        """
+        return sorted(self.paar_dict().items(), key=lambda e: (-e[1], e[0]))[:anzahl]
+
+    def top_tripel(self, anzahl: int = 10) -> list[tuple]:
+        """
+        Die häufigsten Tripel als Liste [((a, b, c), Häufigkeit), …].
+        """
+        return sorted(self.tripel.items(), key=lambda e: (-e[1], e[0]))[:anzahl]
+
+    def speichern(self, speicher, dateiname: str = "kookkurrenz"):
+        """
+        Übergibt Paare und Tripel an einen HaeufigkeitSpeicher (JSON, CSV, Excel).
+        """
+        tabellen = [
+            (f"{dateiname}_paare", self.paar_dict(), ["Zahl 1", "Zahl 2", "Häufigkeit"]),
+            (f"{dateiname}_tripel", self.tripel_dict(), ["Zahl 1", "Zahl 2", "Zahl 3", "Häufigkeit"]),
+        ]
+        for name, daten, spalten in tabellen:
+            speicher.speichere_alle(daten, name, spalten=spalten)
@@ -0,0 +1,167 @@
+"""
+Modul: data/LueckenRechner.py
+Ziel:
+- Lücken-/Überfälligkeitsstatistik je Lottozahl:
+  - Ziehungen seit dem letzten Auftreten
+  - längste Lücke
+  - durchschnittliche Lücke
+- Inkrementelle Aktualisierung in O(1) pro Ziehung (letzter Index + laufende Summen)
+- Vollaufbau in einem vektorisierten Durchgang über die gesamte Historie
+- Export über HaeufigkeitSpeicher (JSON, CSV, Excel)
+
+Eine Lücke ist der Abstand (in Ziehungen) zwischen zwei aufeinanderfolgenden
+Auftreten derselben Zahl; erscheint eine Zahl in zwei direkt folgenden Ziehungen,
+ist die Lücke 1.
+"""
+
+import os
+import sys
+from datetime import date
+
+import numpy as np
+
+# Projektverzeichnis zur sys.path hinzufügen, um Model-Import zu ermöglichen
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from model.lotto_model import LottoZiehung, registriere_beobachter, entferne_beobachter
+from model.ziehung_binaer import lade_ziehungs_array
+
+SPALTEN = ["Zahl", "Ziehungen seit letztem Auftreten", "Durchschnittliche Lücke", "Längste Lücke", "Anzahl Lücken"]
+
+
+class LueckenRechner:
+    def __init__(self):
+        """
+        Leere Zustände für die Zahlen 1–49 (Index = Lottozahl, 0 ungenutzt).
+        """
+        self.letzter = np.full(50, -1, dtype=np.int64)  # Index der letzten Ziehung mit der Zahl
+        self.anzahl_luecken = np.zeros(50, dtype=np.int64)
+        self.summe_luecken = np.zeros(50, dtype=np.int64)
+        self.max_luecke = np.zeros(50, dtype=np.int64)
+        self.anzahl_ziehungen = 0
+        self.letztes_datum = None  # Ordinalzahl der zuletzt gezählten Ziehung
+        self.veraltet = False  # True, wenn eine ältere Ziehung nachträglich dazukam
+
+    @classmethod
+    def aus_array(cls, arr: np.ndarray):
+        """
+        Vollaufbau über ein (nach Datum sortiertes) Ziehungs-Array:
+        alle Vorkommen nach (Zahl, Ziehungsindex) sortieren, Differenzen innerhalb
+        jeder Zahl sind die Lücken.
+        """
+        rechner = cls()
+        n = len(arr)
+        rechner.anzahl_ziehungen = n
+        if n == 0:
+            return rechner
+        rechner.letztes_datum = int(arr["ordinal"][-1])
+
+        zahlen = np.asarray(arr["zahlen"], dtype=np.int64).ravel()
+        index = np.repeat(np.arange(n, dtype=np.int64), 6)
+        gueltig = zahlen > 0
+        zahlen, index = zahlen[gueltig], index[gueltig]
+        if zahlen.size == 0:
+            return rechner  # nur Ziehungen ohne gültige Zahlen (z. B. Platzhalter mit "zahlen": [])
+
+        ordnung = np.lexsort((index, zahlen))
+        zahlen, index = zahlen[ordnung], index[ordnung]
+
+        gleiche_zahl = zahlen[1:] == zahlen[:-1]
+        luecken = (index[1:] - index[:-1])[gleiche_zahl]
+        luecken_zahl = zahlen[1:][gleiche_zahl]
+        rechner.anzahl_luecken = np.bincount(luecken_zahl, minlength=50).astype(np.int64)
+        rechner.summe_luecken = np.bincount(luecken_zahl, weights=luecken, minlength=50).astype(np.int64)
+        np.maximum.at(rechner.max_luecke, luecken_zahl, luecken)
+
+        # Letztes Vorkommen = letztes Element jeder Zahlengruppe
+        gruppen_ende = np.append(~gleiche_zahl, True)
+        rechner.letzter[zahlen[gruppen_ende]] = index[gruppen_ende]
+        return rechner
+
+    @classmethod
+    def aus_speicher(cls):
+        """
+        Vollaufbau über alle gespeicherten Ziehungen (data/ziehungen.json + Journal).
+        """
+        return cls.aus_array(lade_ziehungs_array())
+
+    def hinzufuegen(self, ziehung: LottoZiehung):
+        """
+        Zählt die nächste Ziehung dazu (O(1)). Ziehungen müssen chronologisch kommen;
+        eine ältere Ziehung markiert den Rechner als veraltet (→ aus_speicher() neu aufbauen).
+        """
+        tag = date.fromisoformat(ziehung.datum).toordinal()
+        if self.letztes_datum is not None and tag < self.letztes_datum:
+            self.veraltet = True
+            print(f"[!] Ziehung {ziehung.datum} ist älter als der Stand – Lückenstatistik neu aufbauen")
+            return
+
+        index = self.anzahl_ziehungen
+        for zahl in ziehung.zahlen:
+            if not 1 <= zahl <= 49:
+                continue
+            if self.letzter[zahl] >= 0:
+                luecke = index - self.letzter[zahl]
+                self.anzahl_luecken[zahl] += 1
+                self.summe_luecken[zahl] += luecke
+                self.max_luecke[zahl] = max(self.max_luecke[zahl], luecke)
+            self.letzter[zahl] = index
+        self.anzahl_ziehungen += 1
+        self.letztes_datum = tag
+
+    def verbinden(self):
+        """
+        Hält die Statistik automatisch aktuell (Beobachter in model/lotto_model.py).
+        """
+        registriere_beobachter(self.hinzufuegen)
+        return self
+
+    def trennen(self):
+        """
+        Beendet die automatische Aktualisierung.
+        """
+        entferne_beobachter(self.hinzufuegen)
+
+    def seit_letztem(self) -> np.ndarray:
+        """
+        Ziehungen seit dem letzten Auftreten je Zahl (0 = in der letzten Ziehung dabei).
+        Nie gezogene Zahlen: Anzahl aller Ziehungen.
+        """
+        return np.where(self.letzter >= 0, self.anzahl_ziehungen - 1 - self.letzter, self.anzahl_ziehungen)
+
+    def durchschnitt(self) -> np.ndarray:
+        """
+        Durchschnittliche Lücke je Zahl (0, solange es keine Lücke gibt).
+        """
+        return np.divide(self.summe_luecken, self.anzahl_luecken,
+                         out=np.zeros(50), where=self.anzahl_luecken > 0)
+
+    def ueberfaellig(self, anzahl: int = 10) -> list[tuple]:
+        """
+        Die am längsten nicht gezogenen Zahlen: [(Zahl, Ziehungen seit letztem Auftreten), …].
+        """
+        seit = self.seit_letztem()
+        return sorted(((z, int(seit[z])) for z in range(1, 50)), key=lambda e: (-e[1], e[0]))[:anzahl]
+
+    def als_dict(self) -> dict:
+        """
+        {Zahl: (seit letztem Auftreten, Durchschnitt, längste Lücke, Anzahl Lücken)}
+        """
+        seit, mittel = self.seit_letztem(), self.durchschnitt()
+        return {
+            z: (int(seit[z]), round(float(mittel[z]), 2), int(self.max_luecke[z]), int(self.anzahl_luecken[z]))
+            for z in range(1, 50)
+        }
+
+    def speichern(self, speicher, dateiname: str = "luecken"):
+        """
+        Übergibt die Lückenstatistik an einen HaeufigkeitSpeicher (JSON, CSV, Excel).
+        """
+        return speicher.speichere_alle(self.als_dict(), dateiname, spalten=SPALTEN)
+
+
+# Testlauf: Lückenstatistik aus dem Speicher
+if __name__ == "__main__":
+    rechner = LueckenRechner.aus_speicher()
+    print(f"[✓] {rechner.anzahl_ziehungen} Ziehungen – am längsten nicht gezogen:")
+    for zahl, seit in rechner.ueberfaellig():
+        print(f"Zahl {zahl:2}: seit {seit} Ziehungen")
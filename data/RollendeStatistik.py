@@ -0,0 +1,192 @@
+"""
+Modul: data/RollendeStatistik.py
+Ziel:
+- Häufigkeit, heiße/kalte Zahlen und Superzahl-Verteilung über gleitende Fenster
+  (letzte 50/100/500 Ziehungen oder letzte N Jahre) zu jedem Zeitpunkt der Historie
+- RollendesFenster: Fenster wird per Hinzufügen/Entfernen fortgeschrieben (O(1) pro Schritt)
+- RollendeStatistik: komplette Zeitreihe in einem Durchgang (Präfixsummen:
+  Ziehung i wird addiert, die aus dem Fenster fallende Ziehung abgezogen)
+- Export über HaeufigkeitSpeicher (JSON, CSV, Excel)
+"""
+
+import os
+import sys
+from collections import deque
+from datetime import date
+
+import numpy as np
+
+# Projektverzeichnis zur sys.path hinzufügen, um Model-Import zu ermöglichen
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from model.lotto_model import LottoZiehung, registriere_beobachter, entferne_beobachter
+from model.ziehung_binaer import lade_ziehungs_array
+
+
+def _pruefe_fenster(groesse, tage):
+    if (groesse is None) == (tage is None):
+        raise ValueError("Genau eines von 'groesse' (Ziehungen) oder 'tage' angeben.")
+
+
+def _rangfolge(zaehler: np.ndarray, anzahl: int, absteigend: bool) -> list[int]:
+    """
+    Die `anzahl` Zahlen mit den meisten (bzw. wenigsten) Treffern; bei Gleichstand die kleinere Zahl zuerst.
+    """
+    werte = -zaehler[1:] if absteigend else zaehler[1:]
+    return [int(z) + 1 for z in np.argsort(werte, kind="stable")[:anzahl]]
+
+
+class RollendesFenster:
+    """
+    Ein gleitendes Fenster, das Ziehung für Ziehung fortgeschrieben wird.
+    """
+    def __init__(self, groesse: int = None, tage: int = None):
+        _pruefe_fenster(groesse, tage)
+        self.groesse = groesse  # Fenster in Ziehungen
+        self.tage = tage  # oder Fenster in Kalendertagen
+        self.inhalt = deque()  # (Ordinalzahl, Zahlen, Superzahl)
+        self.zahlen = np.zeros(50, dtype=np.int64)
+        self.superzahl = np.zeros(10, dtype=np.int64)
+
+    def _zaehle(self, zahlen, superzahl, schritt: int):
+        for zahl in zahlen:
+            if 1 <= zahl <= 49:
+                self.zahlen[zahl] += schritt
+        if superzahl is not None and 0 <= superzahl <= 9:
+            self.superzahl[superzahl] += schritt
+
+    def hinzufuegen(self, ziehung: LottoZiehung):
+        """
+        Nimmt die nächste (chronologische) Ziehung auf und entfernt herausgefallene.
+        """
+        tag = date.fromisoformat(ziehung.datum).toordinal()
+        self.inhalt.append((tag, list(ziehung.zahlen), ziehung.superzahl))
+        self._zaehle(ziehung.zahlen, ziehung.superzahl, +1)
+
+        while self.inhalt and (
+            (self.groesse is not None and len(self.inhalt) > self.groesse)
+            or (self.tage is not None and self.inhalt[0][0] <= tag - self.tage)
+        ):
+            _, zahlen, superzahl = self.inhalt.popleft()
+            self._zaehle(zahlen, superzahl, -1)
+
+    def verbinden(self):
+        """
+        Schreibt das Fenster automatisch fort (Beobachter in model/lotto_model.py).
+        """
+        registriere_beobachter(self.hinzufuegen)
+        return self
+
+    def trennen(self):
+        """
+        Beendet die automatische Fortschreibung.
+        """
+        entferne_beobachter(self.hinzufuegen)
+
+    def heiss(self, anzahl: int = 6) -> list[int]:
+        """
+        Die häufigsten Zahlen im aktuellen Fenster.
+        """
+        return _rangfolge(self.zahlen, anzahl, absteigend=True)
+
+    def kalt(self, anzahl: int = 6) -> list[int]:
+        """
+        Die seltensten Zahlen im aktuellen Fenster.
+        """
+        return _rangfolge(self.zahlen, anzahl, absteigend=False)
+
+    def als_dict(self) -> dict:
+        """
+        Häufigkeiten im aktuellen Fenster: {Zahl: Häufigkeit}.
+        """
+        return {zahl: int(self.zahlen[zahl]) for zahl in range(1, 50)}
+
+    def superzahl_dict(self) -> dict:
+        """
+        Superzahl-Verteilung im aktuellen Fenster: {Superzahl: Häufigkeit}.
+        """
+        return {zahl: int(anzahl) for zahl, anzahl in enumerate(self.superzahl)}
+
+
+class RollendeStatistik:
+    """
+    Komplette Zeitreihe eines gleitenden Fensters: Zeile i = Fenster, das mit Ziehung i endet.
+    """
+    def __init__(self, arr: np.ndarray, groesse: int = None, tage: int = None):
+        _pruefe_fenster(groesse, tage)
+        self.groesse = groesse
+        self.tage = tage
+        self.ordinal = np.asarray(arr["ordinal"], dtype=np.int64)
+        n = len(arr)
+
+        # Präfixsummen der Einzelziehungen (Zeile 0 = leer)
+        einzel = np.zeros((n, 50), dtype=np.int32)
+        zeilen = np.repeat(np.arange(n), 6)
+        np.add.at(einzel, (zeilen, np.asarray(arr["zahlen"], dtype=np.int64).ravel()), 1)
+        einzel[:, 0] = 0
+        sz = np.asarray(arr["superzahl"], dtype=np.int64)
+        einzel_sz = np.zeros((n, 10), dtype=np.int32)
+        gueltig = (sz >= 0) & (sz <= 9)
+        einzel_sz[np.flatnonzero(gueltig), sz[gueltig]] = 1
+
+        summe = np.vstack([np.zeros((1, 50), dtype=np.int32), np.cumsum(einzel, axis=0, dtype=np.int32)])
+        summe_sz = np.vstack([np.zeros((1, 10), dtype=np.int32), np.cumsum(einzel_sz, axis=0, dtype=np.int32)])
+
+        # Fensteranfang je Zeile: Ziehung i kommt hinzu, alles vor `anfang` ist entfernt
+        ende = np.arange(1, n + 1)
+        if groesse is not None:
+            anfang = np.maximum(ende - groesse, 0)
+        else:
+            anfang = np.searchsorted(self.ordinal, self.ordinal - tage, side="right")
+
+        self.umfang = ende - anfang  # Ziehungen im Fenster
+        self.zahlen = summe[ende] - summe[anfang]
+        self.superzahl = summe_sz[ende] - summe_sz[anfang]
+
+    @classmethod
+    def aus_speicher(cls, groesse: int = None, tage: int = None):
+        """
+        Zeitreihe über alle gespeicherten Ziehungen (data/ziehungen.json + Journal).
+        """
+        return cls(lade_ziehungs_array(), groesse, tage)
+
+    def daten(self) -> list[str]:
+        """
+        ISO-Datum der letzten Ziehung jedes Fensters.
+        """
+        return [date.fromordinal(int(o)).isoformat() for o in self.ordinal]
+
+    def heiss(self, anzahl: int = 6) -> np.ndarray:
+        """
+        (n, anzahl)-Array: die häufigsten Zahlen je Fenster.
+        """
+        return np.argsort(-self.zahlen[:, 1:], axis=1, kind="stable")[:, :anzahl] + 1
+
+    def kalt(self, anzahl: int = 6) -> np.ndarray:
+        """
+        (n, anzahl)-Array: die seltensten Zahlen je Fenster.
+        """
+        return np.argsort(self.zahlen[:, 1:], axis=1, kind="stable")[:, :anzahl] + 1
+
+    def speichern(self, speicher, dateiname: str = None, anzahl: int = 6):
+        """
+        Übergibt die Zeitreihe an einen HaeufigkeitSpeicher (JSON, CSV, Excel):
+        - <name>.*          Datum, Fenstergröße, Häufigkeit 1–49, Superzahl 0–9
+        - <name>_heiss_kalt.* Datum, heiße und kalte Zahlen
+        """
+        if dateiname is None:
+            dateiname = f"rollend_{self.groesse}_ziehungen" if self.groesse else f"rollend_{self.tage}_tage"
+        daten = self.daten()
+
+        spalten = ["Datum", "Ziehungen im Fenster"] + [str(z) for z in range(1, 50)] + [f"SZ {s}" for s in range(10)]
+        tabelle = {
+            tag: (int(u), *z[1:].tolist(), *s.tolist())
+            for tag, u, z, s in zip(daten, self.umfang, self.zahlen, self.superzahl)
+        }
+        spalten_hk = ["Datum"] + [f"Heiß {i}" for i in range(1, anzahl + 1)] + [f"Kalt {i}" for i in range(1, anzahl + 1)]
+        tabelle_hk = {
+            tag: (*h.tolist(), *k.tolist())
+            for tag, h, k in zip(daten, self.heiss(anzahl), self.kalt(anzahl))
+        }
+
+        for name, tab, sp in ((dateiname, tabelle, spalten), (f"{dateiname}_heiss_kalt", tabelle_hk, spalten_hk)):
+            speicher.speichere_alle(tab, name, spalten=sp)
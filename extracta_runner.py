@@ -6,6 +6,8 @@ Ziel:
 - Prüft, ob die Ziehung bereits existiert
 - Speichert neue Ziehungen über model/lotto_model.py
 - Gibt Informationen im Terminal aus
+- Mit --alles: alle lotto.de-Seiten gleichzeitig abrufen (core/paralleler_abruf.py)
+  und die Häufigkeiten zusätzlich mit der Statistikseite abgleichen
 
 Benötigt:
 ✔️ core/lotto_scraper.py
@@ -16,27 +18,39 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from core.lotto_scraper import hole_aktuelle_ziehung
-from model.lotto_model import lade_bestehende_ziehungen, ist_neue_ziehung, speichere_ziehung
+from model.lotto_model import ist_neue_ziehung, speichere_ziehung
 
 def main():
     print(" Starte Extracta…")
 
     try:
-        #  Schritt 1: Aktuelle Ziehung holen
-        ziehung = hole_aktuelle_ziehung()
+        #  Schritt 1: Aktuelle Ziehung holen (mit --alles: alle Seiten gleichzeitig)
+        seiten = {}
+        if "--alles" in sys.argv:
+            from core.paralleler_abruf import hole_alle_seiten
+            seiten = hole_alle_seiten()
+        ziehung = seiten.get("ziehung")
+        if ziehung is None or isinstance(ziehung, Exception):
+            ziehung = hole_aktuelle_ziehung()
         print(f" Ziehungsdatum: {ziehung.datum}")
         print(f" Zahlen: {ziehung.zahlen} + Superzahl: {ziehung.superzahl}")
         
-        #  Schritt 2: Bestehende Daten laden
-        bestehende = lade_bestehende_ziehungen()
-
-        #  Schritt 3: Prüfen, ob die Ziehung neu ist
-        if ist_neue_ziehung(ziehung, bestehende):
+        #  Schritt 2: Prüfen, ob die Ziehung neu ist (Datum-Index des Speichers)
+        if ist_neue_ziehung(ziehung):
             print(" Neue Ziehung erkannt – wird gespeichert…")
+            #  Schritt 3: speichere_ziehung erzeugt die Excel-Datei erst ab EXCEL_BATCH_GROESSE
+            #  neuen Ziehungen neu (sonst nur vorgemerkt) – kein Export pro Ziehung
             speichere_ziehung(ziehung)
         else:
             print(" Ziehung bereits vorhanden – keine Aktion erforderlich.")
 
+        #  Schritt 4 (optional): Häufigkeiten mit der Statistikseite abgleichen
+        gescrapt = seiten.get("statistik")
+        if gescrapt is not None and not isinstance(gescrapt, Exception):
+            from data.HaeufigkeitRechner import HaeufigkeitRechner  # numpy nur für --alles nötig
+            abweichungen = HaeufigkeitRechner.aus_speicher().vergleiche(gescrapt)
+            print(f" Abgleich Statistikseite: {len(abweichungen)} Abweichungen")
+
     except Exception as e:
         print(" FEHLER beim Ausführen von Extracta:")
         print(e)
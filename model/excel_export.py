@@ -0,0 +1,61 @@
+"""
+Initialisierung model/excel_export.py …
+Ziel:
+
+- Erzeugt data/ziehungen.xlsx in einem Durchgang aus dem Primärspeicher
+- Nutzt den Write-only-Modus von openpyxl (Streaming, kein DOM im Speicher)
+- Optional: zusätzliche Tabellenblätter pro Jahr
+"""
+
+import os
+import json
+from pathlib import Path
+from openpyxl import Workbook
+
+KOPFZEILE = ["Datum", "Zahlen", "Superzahl", "Quoten (JSON)"]
+
+
+def ziehung_als_zeile(eintrag: dict) -> list:
+    """
+    Wandelt ein Ziehungs-Dictionary in eine Excel-Zeile um (gleiches Format wie bisher).
+    """
+    return [
+        eintrag["datum"],
+        ", ".join(map(str, eintrag["zahlen"])),  # Zahlen als Komma-getrennte Zeichenkette
+        eintrag["superzahl"],
+        json.dumps(eintrag["quoten"], ensure_ascii=False),  # Quoten als JSON-Text
+    ]
+
+
+def schreibe_excel(ziehungen: list[dict], pfad: Path, pro_jahr: bool = False) -> int:
+    """
+    Schreibt alle Ziehungen (nach Datum sortiert) in eine neue Excel-Datei.
+    Die Datei wird zuerst als Temp-Datei erzeugt und dann atomar ersetzt.
+    Rückgabe: Anzahl geschriebener Ziehungen.
+    """
+    pfad = Path(pfad)
+    ziehungen = sorted(ziehungen, key=lambda z: z["datum"])
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Ziehungen")
+    ws.append(KOPFZEILE)
+    for eintrag in ziehungen:
+        ws.append(ziehung_als_zeile(eintrag))
+
+    if pro_jahr:
+        # Ziehungen sind sortiert → jedes Jahr ist ein zusammenhängender Block
+        jahr_ws = None
+        aktuelles_jahr = None
+        for eintrag in ziehungen:
+            jahr = eintrag["datum"][:4]
+            if jahr != aktuelles_jahr:
+                jahr_ws = wb.create_sheet(jahr)
+                jahr_ws.append(KOPFZEILE)
+                aktuelles_jahr = jahr
+            jahr_ws.append(ziehung_als_zeile(eintrag))
+
+    pfad.parent.mkdir(parents=True, exist_ok=True)
+    tmp_pfad = pfad.with_name(pfad.stem + ".tmp" + pfad.suffix)
+    wb.save(tmp_pfad)
+    os.replace(tmp_pfad, pfad)
+    return len(ziehungen)
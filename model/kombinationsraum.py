@@ -0,0 +1,210 @@
+"""
+Initialisierung model/kombinationsraum.py …
+Ziel:
+
+- Vollständiger Durchlauf aller C(49, 6) = 13.983.816 möglichen Spielscheine
+- Für jede Kombination: wie oft hatte sie historisch 3, 4, 5 bzw. 6 Richtige?
+- Kombinatorisches Zahlensystem (Rang ↔ Kombination), damit jeder Prozess
+  einen eigenen Indexbereich bearbeiten kann
+- Bewertung per Bitmaske + Popcount gegen alle gespeicherten Ziehungen
+- Ergebnis: kompakte Treffer-Matrix (uint16, optional) + Histogramme als JSON
+- Fortschrittsanzeige und Benchmark (Kombinationen/Sekunde pro Kern)
+
+Verwendung:
+>>> python model/kombinationsraum.py --prozesse 4
+>>> python model/kombinationsraum.py --benchmark
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from math import comb
+from pathlib import Path
+
+import numpy as np
+
+# Projektverzeichnis zur sys.path hinzufügen (für direkten Start der Datei)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from model.lotto_model import DATA_DIR
+from model.ziehung_abfrage import masken, popcount
+from model.ziehung_binaer import lade_binaer, lade_ziehungs_array
+
+ANZAHL_KOMBINATIONEN = comb(49, 6)
+TREFFER_KLASSEN = (3, 4, 5, 6)
+
+TREFFER_PATH = DATA_DIR / "kombinationsraum_treffer.u16"
+HISTOGRAMM_PATH = DATA_DIR / "kombinationsraum_histogramm.json"
+
+# BINOM[k, n] = C(n, k) für n = 0…48, k = 0…6
+BINOM = np.array([[comb(n, k) for n in range(49)] for k in range(7)], dtype=np.int64)
+
+
+def rang(kombination) -> int:
+    """
+    Rang einer Kombination (6 Lottozahlen 1–49) in kolexikografischer Ordnung:
+    Summe C(c_i, i) über die sortierten, nullbasierten Zahlen c_1 < … < c_6.
+    """
+    zahlen = sorted(int(z) - 1 for z in kombination)
+    return sum(comb(c, i) for i, c in enumerate(zahlen, start=1))
+
+
+def kombination(r: int) -> list[int]:
+    """
+    Umkehrung von rang(): Kombination (sortiert, Zahlen 1–49) zu einem Rang.
+    """
+    zahlen = []
+    for i in range(6, 0, -1):
+        c = int(np.searchsorted(BINOM[i], r, side="right")) - 1
+        zahlen.append(c + 1)
+        r -= comb(c, i)
+    return sorted(zahlen)
+
+
+def kombinationen_block(start: int, ende: int) -> np.ndarray:
+    """
+    Alle Kombinationen mit Rang in [start, ende) als (n, 6)-Array (vektorisiert).
+    """
+    r = np.arange(start, ende, dtype=np.int64)
+    zahlen = np.empty((len(r), 6), dtype=np.int64)
+    for i in range(6, 0, -1):
+        c = np.searchsorted(BINOM[i], r, side="right") - 1
+        zahlen[:, i - 1] = c + 1
+        r -= BINOM[i][c]
+    return zahlen
+
+
+def werte_bereich_aus(start: int, ende: int, ziehung_masken: np.ndarray, block: int = 2048) -> np.ndarray:
+    """
+    Zählt für jede Kombination im Bereich die Ziehungen mit 3/4/5/6 Richtigen.
+    Rückgabe: (ende - start, 4)-Array (uint16).
+    """
+    ergebnis = np.zeros((ende - start, len(TREFFER_KLASSEN)), dtype=np.uint16)
+    for teil_start in range(start, ende, block):
+        teil_ende = min(teil_start + block, ende)
+        km = masken(kombinationen_block(teil_start, teil_ende))
+        treffer = popcount(km[:, None] & ziehung_masken[None, :])
+
+        # Nur Paare mit ≥ 3 Treffern (ca. 2 %) werden einzeln gezählt
+        zeile, spalte = np.nonzero(treffer >= 3)
+        klasse = treffer[zeile, spalte].astype(np.intp) - 3
+        zaehler = np.bincount(zeile * 4 + klasse, minlength=(teil_ende - teil_start) * 4)
+        ergebnis[teil_start - start:teil_ende - start] = zaehler.reshape(-1, 4)
+    return ergebnis
+
+
+def _histogramme(treffer: np.ndarray) -> list[np.ndarray]:
+    """
+    Je Trefferklasse: wie viele Kombinationen hatten 0, 1, 2, … solcher Ziehungen?
+    """
+    return [np.bincount(treffer[:, k]) for k in range(len(TREFFER_KLASSEN))]
+
+
+def _addiere(summe: list[np.ndarray], teil: list[np.ndarray]) -> list[np.ndarray]:
+    """
+    Addiert Histogramme unterschiedlicher Länge.
+    """
+    ergebnis = []
+    for a, b in zip(summe, teil):
+        laenge = max(len(a), len(b))
+        ergebnis.append(np.pad(a, (0, laenge - len(a))) + np.pad(b, (0, laenge - len(b))))
+    return ergebnis
+
+
+# --- Prozess-Pool --------------------------------------------------------------
+
+_POOL = {}
+
+
+def _pool_init(ziehung_masken, treffer_pfad):
+    _POOL["masken"] = ziehung_masken
+    _POOL["treffer"] = None
+    if treffer_pfad:
+        _POOL["treffer"] = np.memmap(treffer_pfad, dtype=np.uint16, mode="r+",
+                                     shape=(ANZAHL_KOMBINATIONEN, len(TREFFER_KLASSEN)))
+
+
+def _pool_aufgabe(start, ende):
+    treffer = werte_bereich_aus(start, ende, _POOL["masken"])
+    if _POOL["treffer"] is not None:
+        _POOL["treffer"][start:ende] = treffer
+        _POOL["treffer"].flush()
+    return start, ende, _histogramme(treffer)
+
+
+def durchlaufe(ziehung_masken: np.ndarray, prozesse: int = None, bereich: int = 100_000,
+               bis: int = ANZAHL_KOMBINATIONEN, treffer_pfad: Path = TREFFER_PATH) -> dict:
+    """
+    Bewertet die Kombinationen mit Rang 0 … bis-1 verteilt auf mehrere Prozesse.
+    Jeder Prozess bearbeitet Indexbereiche zu `bereich` Kombinationen und schreibt
+    seine Treffer direkt in die gemeinsame Treffer-Datei (Memory-Map).
+    Rückgabe: Histogramme {"3": {Anzahl Ziehungen: Anzahl Kombinationen}, …}
+    """
+    prozesse = prozesse or os.cpu_count()
+    if treffer_pfad:
+        treffer_pfad = Path(treffer_pfad)
+        treffer_pfad.parent.mkdir(parents=True, exist_ok=True)
+        np.memmap(treffer_pfad, dtype=np.uint16, mode="w+",
+                  shape=(ANZAHL_KOMBINATIONEN, len(TREFFER_KLASSEN))).flush()
+
+    summe = [np.zeros(1, dtype=np.int64) for _ in TREFFER_KLASSEN]
+    erledigt = 0
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=prozesse, initializer=_pool_init,
+                             initargs=(ziehung_masken, str(treffer_pfad) if treffer_pfad else None)) as pool:
+        futures = [pool.submit(_pool_aufgabe, s, min(s + bereich, bis)) for s in range(0, bis, bereich)]
+        for future in as_completed(futures):
+            start, ende, histogramme = future.result()
+            summe = _addiere(summe, histogramme)
+            erledigt += ende - start
+            dauer = time.perf_counter() - t0
+            rate = erledigt / dauer
+            print(f"[…] {erledigt:,}/{bis:,} Kombinationen ({erledigt / bis:.1%}) | "
+                  f"{rate:,.0f}/s | Rest ca. {(bis - erledigt) / rate:,.0f} s", flush=True)
+
+    return {
+        str(klasse): {int(anzahl): int(n) for anzahl, n in enumerate(hist) if n}
+        for klasse, hist in zip(TREFFER_KLASSEN, summe)
+    }
+
+
+def benchmark(ziehung_masken: np.ndarray, anzahl: int = 200_000) -> float:
+    """
+    Misst Kombinationen/Sekunde auf einem Kern.
+    """
+    t0 = time.perf_counter()
+    werte_bereich_aus(0, anzahl, ziehung_masken)
+    rate = anzahl / (time.perf_counter() - t0)
+    print(f"📊 {len(ziehung_masken):,} Ziehungen: {rate:,.0f} Kombinationen/s pro Kern "
+          f"→ Vollscan ca. {ANZAHL_KOMBINATIONEN / rate / 60:,.1f} min auf einem Kern")
+    return rate
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Alle 6-aus-49-Kombinationen gegen die Historie auswerten")
+    parser.add_argument("--binaer", help="Ziehungen aus Binärdatei statt JSON-Speicher")
+    parser.add_argument("--prozesse", type=int, default=os.cpu_count())
+    parser.add_argument("--bereich", type=int, default=100_000, help="Kombinationen pro Arbeitspaket")
+    parser.add_argument("--bis", type=int, default=ANZAHL_KOMBINATIONEN, help="nur die ersten N Kombinationen")
+    parser.add_argument("--ohne-treffer-datei", action="store_true", help="nur Histogramme schreiben")
+    parser.add_argument("--benchmark", action="store_true")
+    args = parser.parse_args(argv)
+
+    arr = lade_binaer(args.binaer) if args.binaer else lade_ziehungs_array()
+    ziehung_masken = masken(arr["zahlen"])
+
+    if args.benchmark:
+        benchmark(ziehung_masken)
+        return
+
+    histogramme = durchlaufe(ziehung_masken, args.prozesse, args.bereich, min(args.bis, ANZAHL_KOMBINATIONEN),
+                             None if args.ohne_treffer_datei else TREFFER_PATH)
+    with open(HISTOGRAMM_PATH, "w", encoding="utf-8") as f:
+        json.dump(histogramme, f, indent=2)
+    print(f"[✓] Histogramme gespeichert: {HISTOGRAMM_PATH}")
+
+
+if __name__ == "__main__":
+    main()
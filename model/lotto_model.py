@@ -6,26 +6,118 @@ Ziel:
 - Speichern in Excel + JSON
 - Duplikatprüfung
 - Ladefunktion für bestehende Daten
+- Primärspeicher: Snapshot + Append-only-Journal (model/ziehungs_speicher.py)
+- Excel-Export gebündelt und gestreamt (model/excel_export.py)
+- Beobachter: Statistiken werden bei jeder neu gespeicherten Ziehung benachrichtigt
+- Speichern und Excel-Export werden als Phase "persist" gemessen, sofern eine Zeitmessung
+  registriert ist (setze_zeitmessung, z. B. durch core/messung.aktiviere) – model/ hängt nicht von core/ ab
 """
 
 import os
+import re
 import json
-from openpyxl import Workbook, load_workbook
-from openpyxl.utils import get_column_letter
 from datetime import datetime
 from pathlib import Path
 
+from model.ziehungs_speicher import ZiehungsSpeicher
+from model.excel_export import schreibe_excel
+
 # Basispfade (relativ zum Projektordner)
 DATA_DIR = Path(__file__).resolve().parent.parent / "data"
 EXCEL_PATH = DATA_DIR / "ziehungen.xlsx"
 JSON_PATH = DATA_DIR / "ziehungen.json"
+EXPORT_STAND_PATH = DATA_DIR / "ziehungen.export.json"
+
+# Excel wird erst neu erzeugt, wenn so viele Ziehungen seit dem letzten Export dazukamen
+EXCEL_BATCH_GROESSE = 50
+
+# Rückruffunktionen, die jede neu gespeicherte Ziehung erhalten (inkrementelle Statistiken)
+_BEOBACHTER: list = []
+
+# Optionale Zeitmessung: spanne(phase, **felder) → Kontextmanager mit setze(); None = keine Messung
+_ZEITMESSUNG = None
+
+# Ein Speicher pro JSON-Datei (z. B. mehrere Spielhistorien)
+_SPEICHER: dict[Path, ZiehungsSpeicher] = {}
+
+
+def hole_speicher(json_pfad: Path = None) -> ZiehungsSpeicher:
+    """
+    Gibt den (prozessweit geteilten) Ziehungsspeicher für die JSON-Datei zurück.
+    Standard: data/ziehungen.json
+    """
+    pfad = Path(json_pfad or JSON_PATH)
+    if pfad not in _SPEICHER:
+        _SPEICHER[pfad] = ZiehungsSpeicher(pfad)
+    return _SPEICHER[pfad]
+
+
+def registriere_beobachter(rueckruf):
+    """
+    Registriert eine Funktion rueckruf(ziehung: LottoZiehung), die nach jeder
+    neu gespeicherten Ziehung aufgerufen wird (auch beim Massen-Import).
+    """
+    if rueckruf not in _BEOBACHTER:
+        _BEOBACHTER.append(rueckruf)
+
+
+def entferne_beobachter(rueckruf):
+    """
+    Entfernt eine zuvor registrierte Rückruffunktion.
+    """
+    if rueckruf in _BEOBACHTER:
+        _BEOBACHTER.remove(rueckruf)
+
+
+class _OhneMessung:
+    """
+    Platzhalter, solange keine Zeitmessung registriert ist.
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, typ, wert, tb):
+        return False
+
+    def setze(self, ergebnis: str = None, **felder):
+        pass
+
+
+_OHNE_MESSUNG = _OhneMessung()
+
+
+def setze_zeitmessung(spanne):
+    """
+    Registriert eine Zeitmessung für Speichern und Excel-Export (z. B. core/messung.spanne);
+    None schaltet sie wieder ab.
+    """
+    global _ZEITMESSUNG
+    _ZEITMESSUNG = spanne
+
+
+def _spanne(phase: str, **felder):
+    return _ZEITMESSUNG(phase, **felder) if _ZEITMESSUNG is not None else _OHNE_MESSUNG
+
+
+def _benachrichtige(ziehungen: list):
+    """
+    Gibt neu gespeicherte Ziehungen an alle Beobachter weiter.
+    """
+    for ziehung in ziehungen:
+        for rueckruf in list(_BEOBACHTER):
+            rueckruf(ziehung)
 
 
 class LottoZiehung:
     """
     Repräsentiert eine einzelne Lotto-Ziehung.
     Enthält Datum, gezogene Zahlen, Superzahl und Quoten.
+    __slots__ spart das Instanz-Dictionary (relevant bei Millionen Objekten).
     """
+    __slots__ = ("datum", "zahlen", "superzahl", "quoten")
+
     def __init__(self, datum: str, zahlen: list[int], superzahl: int, quoten: dict):
         self.datum = datum  # Format: "YYYY-MM-DD"
         self.zahlen = zahlen  # Liste von 6 Lottozahlen
@@ -45,64 +137,140 @@ class LottoZiehung:
         }
 
 
+def iso_datum(datum_text: str, jahr) -> str | None:
+    """
+    "21.06. (Mittwoch)" + 1955 → "1955-06-21" (Format der Datumsauswahl auf lotto.de).
+    Rückgabe: None, wenn Datum oder Jahr fehlen.
+    """
+    treffer = re.search(r"(\d{2})\.(\d{2})\.", str(datum_text or ""))
+    if not treffer or not jahr:
+        return None
+    tag, monat = treffer.groups()
+    return f"{int(jahr):04d}-{monat}-{tag}"
+
+
+def ziehung_aus_scraper_eintrag(eintrag: dict) -> LottoZiehung | None:
+    """
+    Wandelt einen Eintrag der historischen Scraper in eine LottoZiehung um.
+    Unterstützt beide Formate:
+    - {"datum": "21.06. (Mittwoch)", "jahr": 1955, "zahl_1": …, "zahl_6": …, "superzahl": …}
+    - {"datum": "21.06. (Mittwoch)", "jahr": 1955, "zahlen": [...], "superzahl": …}
+    Optional "quoten" (z. B. aus dem XHR-Mitschnitt) werden übernommen.
+    Rückgabe: None, wenn Datum oder Zahlen unvollständig sind.
+    """
+    datum = iso_datum(eintrag.get("datum", ""), eintrag.get("jahr"))
+    if datum is None:
+        return None
+
+    if "zahlen" in eintrag:
+        zahlen = list(eintrag["zahlen"] or [])
+    else:
+        zahlen = [eintrag.get(f"zahl_{i}") for i in range(1, 7)]
+    if len(zahlen) != 6 or any(z is None for z in zahlen):
+        return None
+
+    superzahl = eintrag.get("superzahl")
+    return LottoZiehung(
+        datum=datum,
+        zahlen=[int(z) for z in zahlen],
+        superzahl=int(superzahl) if superzahl is not None else -1,
+        quoten=eintrag.get("quoten") or {},
+    )
+
+
 def lade_bestehende_ziehungen():
     """
-    Lädt bereits gespeicherte Ziehungen aus der JSON-Datei.
+    Lädt bereits gespeicherte Ziehungen (Snapshot + Journal).
     Gibt eine Liste von Dictionaries zurück.
     """
-    if not JSON_PATH.exists():
-        return []  # Noch keine Daten vorhanden
-    with open(JSON_PATH, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return hole_speicher().alle()
+
+
+def neuestes_datum() -> str | None:
+    """
+    Datum (ISO) der jüngsten gespeicherten Ziehung – Startpunkt für inkrementelle Scraper-Läufe.
+    """
+    return hole_speicher().neuestes_datum()
 
 
-def ist_neue_ziehung(ziehung: LottoZiehung, bestehende: list[dict]) -> bool:
+def ist_neue_ziehung(ziehung: LottoZiehung, bestehende: list[dict] = None) -> bool:
     """
-    Prüft, ob die Ziehung bereits in der bestehenden Liste enthalten ist.
+    Prüft, ob die Ziehung bereits gespeichert ist.
+    Ohne `bestehende` wird der Datum-Index des Speichers genutzt (O(1)),
+    mit einer übergebenen Liste wird wie bisher linear gesucht.
     Rückgabe: True, wenn die Ziehung NEU ist.
     """
+    if bestehende is None:
+        return not hole_speicher().enthaelt(ziehung.datum)
     return all(z["datum"] != ziehung.datum for z in bestehende)
 
 
 def speichere_ziehung(ziehung: LottoZiehung):
     """
-    Speichert eine neue Ziehung in JSON + Excel, falls sie noch nicht vorhanden ist.
+    Speichert eine neue Ziehung im Primärspeicher, falls sie noch nicht vorhanden ist.
+    Die Excel-Datei wird erst ab EXCEL_BATCH_GROESSE neuen Ziehungen neu erzeugt
+    (oder explizit über exportiere_excel()).
     """
     # Sicherstellen, dass der data/ Ordner existiert
     DATA_DIR.mkdir(parents=True, exist_ok=True)
 
-    # JSON-Aktualisierung
-    daten = lade_bestehende_ziehungen()
-    if ist_neue_ziehung(ziehung, daten):
-        daten.append(ziehung.to_dict())
-        with open(JSON_PATH, "w", encoding="utf-8") as f:
-            json.dump(daten, f, indent=2, ensure_ascii=False)
+    # JSON-Aktualisierung: nur eine Journal-Zeile anhängen
+    with _spanne("persist", art="speicher") as spanne:
+        neu = hole_speicher().hinzufuegen(ziehung.to_dict())
+        spanne.setze(None if neu else "vorhanden")
+    if neu:
         print(f"[✓] JSON aktualisiert: {ziehung.datum}")
+        _benachrichtige([ziehung])
     else:
         print(f"[!] Ziehung {ziehung.datum} bereits vorhanden (JSON)")
 
-    #  Excel-Aktualisierung
-    if not EXCEL_PATH.exists():
-        # Neue Excel-Datei mit Kopfzeile erzeugen
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Ziehungen"
-        ws.append(["Datum", "Zahlen", "Superzahl", "Quoten (JSON)"])
-    else:
-        # Bestehende Datei laden
-        wb = load_workbook(EXCEL_PATH)
-        ws = wb.active
-
-    # Bereits gespeicherte Daten prüfen (Datum in Spalte A)
-    existing_dates = [str(cell.value) for cell in ws["A"] if cell.value]
-    if ziehung.datum not in existing_dates:
-        ws.append([
-            ziehung.datum,
-            ", ".join(map(str, ziehung.zahlen)),  # Zahlen als Komma-getrennte Zeichenkette
-            ziehung.superzahl,
-            json.dumps(ziehung.quoten, ensure_ascii=False)  # Quoten als JSON-Text
-        ])
-        wb.save(EXCEL_PATH)
-        print(f"[✓] Excel aktualisiert: {ziehung.datum}")
-    else:
-        print(f"[!] Ziehung {ziehung.datum} bereits vorhanden (Excel)")
+    # Excel wird nicht mehr pro Ziehung angefasst, sondern gebündelt erzeugt
+    ausstehend = excel_ausstehend()
+    if not EXCEL_PATH.exists() or ausstehend >= EXCEL_BATCH_GROESSE:
+        exportiere_excel()
+    elif ausstehend:
+        print(f"[…] Excel-Export vorgemerkt ({ausstehend}/{EXCEL_BATCH_GROESSE})")
+
+
+def speichere_ziehungen(ziehungen: list[LottoZiehung]) -> dict:
+    """
+    Massen-Import (z. B. historischer Backfill): dedupliziert den ganzen Stapel
+    gegen den Bestand, schreibt einmal ins Journal und prüft danach einmal,
+    ob die Excel-Datei neu erzeugt werden muss.
+    Rückgabe: {"eingefuegt": n, "uebersprungen": m}
+    """
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+
+    with _spanne("persist", art="speicher", anzahl=len(ziehungen)):
+        neue = hole_speicher().hinzufuegen_viele([z.to_dict() for z in ziehungen])
+    bericht = {"eingefuegt": len(neue), "uebersprungen": len(ziehungen) - len(neue)}
+    print(f"[✓] Massen-Import: {bericht['eingefuegt']} neu, {bericht['uebersprungen']} übersprungen")
+    # Beobachter (z. B. Lückenstatistik) erwarten chronologische Reihenfolge
+    _benachrichtige([LottoZiehung(**e) for e in sorted(neue, key=lambda e: e["datum"])])
+
+    if neue and (not EXCEL_PATH.exists() or excel_ausstehend() >= EXCEL_BATCH_GROESSE):
+        exportiere_excel()
+    return bericht
+
+
+def excel_ausstehend() -> int:
+    """
+    Anzahl der Ziehungen, die seit dem letzten Excel-Export dazugekommen sind.
+    """
+    stand = 0
+    if EXPORT_STAND_PATH.exists():
+        with open(EXPORT_STAND_PATH, "r", encoding="utf-8") as f:
+            stand = json.load(f).get("anzahl", 0)
+    return len(hole_speicher()) - stand
+
+
+def exportiere_excel(pro_jahr: bool = False):
+    """
+    Erzeugt data/ziehungen.xlsx in einem Durchgang (Write-only) aus dem Primärspeicher.
+    Optional mit zusätzlichen Tabellenblättern pro Jahr.
+    """
+    with _spanne("persist", art="excel"):
+        anzahl = schreibe_excel(lade_bestehende_ziehungen(), EXCEL_PATH, pro_jahr=pro_jahr)
+    with open(EXPORT_STAND_PATH, "w", encoding="utf-8") as f:
+        json.dump({"anzahl": anzahl, "zeitpunkt": datetime.now().isoformat(timespec="seconds")}, f)
+    print(f"[✓] Excel exportiert: {anzahl} Ziehungen → {EXCEL_PATH}")
@@ -0,0 +1,233 @@
+"""
+Initialisierung model/ticket_auswertung.py …
+Ziel:
+
+- Bewertet viele Spielscheine (6 Zahlen + Superzahl) gegen alle gespeicherten Ziehungen
+- Ergebnis je Spielschein: Anzahl der Treffer pro Gewinnklasse (GK 1 = 6 + SZ … GK 9 = 2 + SZ)
+- Bitmasken-UND + Popcount in Blöcken (Spielscheine × Ziehungen) statt Python-Schleifen
+- Große Stapel werden auf einen Prozess-Pool verteilt
+- CLI: liest Spielscheine aus CSV und schreibt die Ergebnisse fortlaufend (Streaming)
+
+Verwendung:
+>>> python model/ticket_auswertung.py tickets.csv --ausgabe ergebnis.csv --prozesse 4
+
+CSV-Format der Spielscheine (Kopfzeile optional):
+z1,z2,z3,z4,z5,z6,superzahl
+"""
+
+import os
+import sys
+import csv
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Projektverzeichnis zur sys.path hinzufügen (für direkten Start der Datei)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from model.ziehung_abfrage import masken, popcount
+from model.ziehung_binaer import lade_binaer, lade_ziehungs_array
+
+# Gewinnklasse je (Treffer, Superzahl richtig); 0 = kein Gewinn
+GEWINNKLASSEN = np.zeros((7, 2), dtype=np.int64)
+GEWINNKLASSEN[6, 1], GEWINNKLASSEN[6, 0] = 1, 2
+GEWINNKLASSEN[5, 1], GEWINNKLASSEN[5, 0] = 3, 4
+GEWINNKLASSEN[4, 1], GEWINNKLASSEN[4, 0] = 5, 6
+GEWINNKLASSEN[3, 1], GEWINNKLASSEN[3, 0] = 7, 8
+GEWINNKLASSEN[2, 1] = 9
+ANZAHL_KLASSEN = 10  # Index 0 (kein Gewinn) + GK 1–9
+
+KOPFZEILE = ["z1", "z2", "z3", "z4", "z5", "z6", "superzahl"] + [f"gk{k}" for k in range(1, 10)]
+
+# Ab so vielen Spielscheinen lohnt sich der Prozess-Pool
+POOL_AB = 50_000
+
+
+def werte_block_aus(ticket_masken, ticket_sz, ziehung_masken, ziehung_sz, block: int = 512) -> np.ndarray:
+    """
+    Kern der Auswertung: (m Spielscheine) × (n Ziehungen) in Blöcken zu `block` Spielscheinen.
+    Rückgabe: (m, 10)-Array mit Trefferanzahl je Gewinnklasse (Spalte 0 = kein Gewinn).
+    """
+    ergebnis = np.zeros((len(ticket_masken), ANZAHL_KLASSEN), dtype=np.int64)
+    ziehung_sz = np.asarray(ziehung_sz, dtype=np.int8)
+    ticket_sz = np.asarray(ticket_sz, dtype=np.int8)
+    for start in range(0, len(ticket_masken), block):
+        tm = ticket_masken[start:start + block, None]
+        ts = ticket_sz[start:start + block, None]
+        treffer = popcount(tm & ziehung_masken[None, :])
+        sz_richtig = ts == ziehung_sz[None, :]
+
+        # Nur die wenigen Gewinn-Paare (≥ 3 Treffer oder 2 + SZ) werden einzeln gezählt
+        zeile, spalte = np.nonzero((treffer >= 3) | ((treffer == 2) & sz_richtig))
+        klasse = GEWINNKLASSEN[treffer[zeile, spalte], sz_richtig[zeile, spalte].astype(np.intp)]
+        zaehler = np.bincount(zeile * ANZAHL_KLASSEN + klasse, minlength=len(tm) * ANZAHL_KLASSEN)
+        zaehler = zaehler.reshape(-1, ANZAHL_KLASSEN)
+        zaehler[:, 0] = len(ziehung_masken) - zaehler[:, 1:].sum(axis=1)
+        ergebnis[start:start + len(tm)] = zaehler
+    return ergebnis
+
+
+# --- Prozess-Pool: Ziehungen werden einmal pro Prozess übergeben ---------------
+
+_POOL_ZIEHUNGEN = None
+
+
+def _pool_init(ziehung_masken, ziehung_sz):
+    global _POOL_ZIEHUNGEN
+    _POOL_ZIEHUNGEN = (ziehung_masken, ziehung_sz)
+
+
+def _pool_aufgabe(zahlen, superzahl):
+    return werte_block_aus(masken(zahlen), superzahl, *_POOL_ZIEHUNGEN)
+
+
+class TicketAuswertung:
+    """
+    Hält die Ziehungen als Bitmasken und bewertet Spielscheine dagegen.
+    """
+    def __init__(self, arr: np.ndarray):
+        self.ziehung_masken = masken(arr["zahlen"])
+        self.ziehung_sz = np.asarray(arr["superzahl"], dtype=np.int64)
+
+    @classmethod
+    def aus_speicher(cls):
+        """
+        Ziehungen aus dem Primärspeicher (data/ziehungen.json + Journal).
+        """
+        return cls(lade_ziehungs_array())
+
+    def auswerten(self, zahlen, superzahl) -> np.ndarray:
+        """
+        Bewertet einen Stapel im aktuellen Prozess.
+        zahlen: (m, 6), superzahl: (m,) → (m, 10)
+        """
+        zahlen = np.asarray(zahlen, dtype=np.int64)
+        superzahl = np.asarray(superzahl, dtype=np.int64)
+        return werte_block_aus(masken(zahlen), superzahl, self.ziehung_masken, self.ziehung_sz)
+
+    def auswerten_strom(self, bloecke, prozesse: int = None, max_offen: int = None):
+        """
+        Bewertet einen Strom von Blöcken (zahlen, superzahl) und liefert die Ergebnisse
+        in Eingabereihenfolge. Mit prozesse > 1 werden die Blöcke auf einen Prozess-Pool
+        verteilt; es sind höchstens `max_offen` Blöcke gleichzeitig unterwegs
+        (konstanter Speicherbedarf auch bei Millionen Spielscheinen).
+        """
+        if not prozesse or prozesse <= 1:
+            for zahlen, superzahl in bloecke:
+                yield zahlen, superzahl, self.auswerten(zahlen, superzahl)
+            return
+
+        max_offen = max_offen or prozesse * 2
+        with ProcessPoolExecutor(
+            max_workers=prozesse,
+            initializer=_pool_init,
+            initargs=(self.ziehung_masken, self.ziehung_sz),
+        ) as pool:
+            offen = deque()
+            for zahlen, superzahl in bloecke:
+                offen.append((zahlen, superzahl, pool.submit(_pool_aufgabe, zahlen, superzahl)))
+                if len(offen) >= max_offen:
+                    zahlen, superzahl, future = offen.popleft()
+                    yield zahlen, superzahl, future.result()
+            while offen:
+                zahlen, superzahl, future = offen.popleft()
+                yield zahlen, superzahl, future.result()
+
+    def auswerten_viele(self, zahlen, superzahl, prozesse: int = None, block: int = 10_000) -> np.ndarray:
+        """
+        Bewertet einen großen Stapel; ab POOL_AB Spielscheinen mit Prozess-Pool.
+        """
+        zahlen = np.asarray(zahlen, dtype=np.int64)
+        superzahl = np.asarray(superzahl, dtype=np.int64)
+        if prozesse is None:
+            prozesse = os.cpu_count() if len(zahlen) >= POOL_AB else 1
+        bloecke = ((zahlen[i:i + block], superzahl[i:i + block]) for i in range(0, len(zahlen), block))
+        teile = [ergebnis for _, _, ergebnis in self.auswerten_strom(bloecke, prozesse)]
+        return np.concatenate(teile) if teile else np.zeros((0, ANZAHL_KLASSEN), dtype=np.int64)
+
+
+def pruefe_ticket(werte: list) -> str | None:
+    """
+    Grund, warum ein Spielschein ungültig ist, sonst None.
+    Gültig: 6 verschiedene Zahlen 1–49 und Superzahl 0–9 (sonst zählen Treffer falsch
+    bzw. die Bitmaske in masken() ist bei Werten ≥ 64 bedeutungslos).
+    """
+    if len(werte) != 7:
+        return f"{len(werte)} statt 7 Werte"
+    zahlen, superzahl = werte[:6], werte[6]
+    if any(not 1 <= z <= 49 for z in zahlen):
+        return f"Zahl außerhalb 1–49: {zahlen}"
+    if len(set(zahlen)) != 6:
+        return f"doppelte Zahl: {zahlen}"
+    if not 0 <= superzahl <= 9:
+        return f"Superzahl außerhalb 0–9: {superzahl}"
+    return None
+
+
+def lese_tickets_csv(pfad: str, block: int = 10_000):
+    """
+    Liest Spielscheine blockweise aus einer CSV-Datei (z1–z6, superzahl).
+    Liefert Tupel (zahlen (b, 6), superzahl (b,)); eine Kopfzeile wird übersprungen.
+    Ungültige Zeilen (siehe pruefe_ticket) werden mit Zeilennummer auf stderr gemeldet und übersprungen.
+    """
+    with open(pfad, newline="", encoding="utf-8") as f:
+        puffer = []
+        ungueltig = 0
+        for nr, zeile in enumerate(csv.reader(f), start=1):
+            if not zeile or not zeile[0].strip().lstrip("-").isdigit():
+                continue  # Kopfzeile / Leerzeile
+            try:
+                werte = [int(wert) for wert in zeile[:7] if wert.strip()]
+                grund = pruefe_ticket(werte)
+            except ValueError:
+                grund = f"keine Zahl: {zeile}"
+            if grund:
+                ungueltig += 1
+                print(f"[!] Zeile {nr} übersprungen – {grund}", file=sys.stderr)
+                continue
+            puffer.append(werte)
+            if len(puffer) >= block:
+                daten = np.array(puffer, dtype=np.int64)
+                yield daten[:, :6], daten[:, 6]
+                puffer = []
+        if puffer:
+            daten = np.array(puffer, dtype=np.int64)
+            yield daten[:, :6], daten[:, 6]
+        if ungueltig:
+            print(f"⚠️ {ungueltig} ungültige Spielscheine übersprungen", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Spielscheine gegen alle gespeicherten Ziehungen auswerten")
+    parser.add_argument("tickets", help="CSV-Datei mit z1–z6, superzahl")
+    parser.add_argument("--ausgabe", help="Ergebnis-CSV (Standard: Konsole)")
+    parser.add_argument("--binaer", help="Ziehungen aus Binärdatei (model/ziehung_binaer.py) statt JSON-Speicher")
+    parser.add_argument("--prozesse", type=int, default=os.cpu_count(), help="Anzahl Prozesse (1 = ohne Pool)")
+    parser.add_argument("--block", type=int, default=10_000, help="Spielscheine pro Block")
+    args = parser.parse_args(argv)
+
+    arr = lade_binaer(args.binaer) if args.binaer else lade_ziehungs_array()
+    auswertung = TicketAuswertung(arr)
+    print(f"[✓] {len(arr)} Ziehungen geladen", file=sys.stderr)
+
+    ausgabe = open(args.ausgabe, "w", newline="", encoding="utf-8") if args.ausgabe else sys.stdout
+    try:
+        writer = csv.writer(ausgabe)
+        writer.writerow(KOPFZEILE)
+        anzahl = 0
+        bloecke = lese_tickets_csv(args.tickets, args.block)
+        for zahlen, superzahl, ergebnis in auswertung.auswerten_strom(bloecke, args.prozesse):
+            writer.writerows(
+                [*z, sz, *treffer[1:]]
+                for z, sz, treffer in zip(zahlen.tolist(), superzahl.tolist(), ergebnis.tolist())
+            )
+            anzahl += len(zahlen)
+            print(f"[…] {anzahl:,} Spielscheine ausgewertet", file=sys.stderr)
+    finally:
+        if ausgabe is not sys.stdout:
+            ausgabe.close()
+
+
+if __name__ == "__main__":
+    main()
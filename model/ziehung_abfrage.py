@@ -0,0 +1,200 @@
+"""
+Initialisierung model/ziehung_abfrage.py …
+Ziel:
+
+- Abfrageschicht über allen gespeicherten Ziehungen
+- Jede Ziehung als 49-Bit-Maske (Bit n = Zahl n gezogen) + Superzahl
+- Abfragen per bitweisem UND / Popcount über das gesamte Array statt Python-Schleifen:
+  - Ziehungen, die alle Zahlen {a, b, c} enthalten
+  - Ziehungen in einem Zeitraum, die Zahl n enthalten
+  - Ziehungen mit genau (oder mindestens) k Treffern gegen eine Zahlenmenge
+- Benchmark gegen die naive Schleife über eine Liste von Dictionaries
+"""
+
+import os
+import sys
+import time
+from datetime import date
+
+import numpy as np
+
+# Projektverzeichnis zur sys.path hinzufügen (für direkten Start der Datei)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from model.ziehung_binaer import DATENSATZ, lade_ziehungs_array, zu_dicts
+
+# Bit 0 bleibt frei (Zahl 0 = "fehlt" im Binärformat)
+_GUELTIGE_BITS = np.uint64(((1 << 50) - 1) & ~1)
+
+# Fallback-Tabelle für NumPy-Versionen ohne np.bitwise_count
+_POPCOUNT_TABELLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def popcount(werte: np.ndarray) -> np.ndarray:
+    """
+    Anzahl gesetzter Bits je uint64-Wert (elementweise).
+    """
+    werte = np.asarray(werte, dtype=np.uint64)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(werte).astype(np.uint8)
+    bytes_ = werte.reshape(werte.shape + (1,)).view(np.uint8)
+    return _POPCOUNT_TABELLE[bytes_].sum(axis=-1, dtype=np.uint8)
+
+
+def masken(zahlen: np.ndarray) -> np.ndarray:
+    """
+    Wandelt ein (n, 6)-Array von Lottozahlen in n Bitmasken (uint64) um.
+    """
+    zahlen = np.asarray(zahlen, dtype=np.uint64)
+    bits = np.left_shift(np.uint64(1), zahlen)
+    return np.bitwise_or.reduce(bits, axis=-1) & _GUELTIGE_BITS
+
+
+def maske_von(zahlen) -> np.uint64:
+    """
+    Bitmaske einer einzelnen Zahlenmenge, z. B. {3, 17, 42}.
+    """
+    maske = 0
+    for zahl in zahlen:
+        if not 1 <= int(zahl) <= 49:
+            raise ValueError(f"Ungültige Lottozahl: {zahl}")
+        maske |= 1 << int(zahl)
+    return np.uint64(maske)
+
+
+def _ordinal(tag) -> int:
+    """
+    Akzeptiert date oder ISO-String ("YYYY-MM-DD").
+    """
+    if isinstance(tag, str):
+        tag = date.fromisoformat(tag)
+    return tag.toordinal()
+
+
+class ZiehungsIndex:
+    """
+    Bitmasken-Index über ein (nach Datum sortiertes) Ziehungs-Array.
+    Alle Abfragen geben Positionen im Array zurück; daten() wandelt sie in Datumsangaben um.
+    """
+    def __init__(self, arr: np.ndarray):
+        self.arr = arr
+        self.ordinal = np.asarray(arr["ordinal"])
+        self.maske = masken(arr["zahlen"])
+        self.superzahl = np.asarray(arr["superzahl"])
+
+    @classmethod
+    def aus_speicher(cls):
+        """
+        Baut den Index aus dem Primärspeicher (data/ziehungen.json + Journal).
+        """
+        return cls(lade_ziehungs_array())
+
+    def __len__(self):
+        return len(self.maske)
+
+    def treffer(self, zahlen) -> np.ndarray:
+        """
+        Anzahl Treffer jeder Ziehung gegen die Zahlenmenge.
+        """
+        return popcount(self.maske & maske_von(zahlen))
+
+    def mit_allen(self, zahlen) -> np.ndarray:
+        """
+        Ziehungen, die alle angegebenen Zahlen enthalten.
+        """
+        suche = maske_von(zahlen)
+        return np.flatnonzero((self.maske & suche) == suche)
+
+    def im_zeitraum_mit(self, zahl: int, von=None, bis=None) -> np.ndarray:
+        """
+        Ziehungen zwischen `von` und `bis` (inklusive), die die Zahl enthalten.
+        Der Zeitraum wird per Binärsuche auf dem sortierten Datum eingegrenzt.
+        """
+        start = 0 if von is None else np.searchsorted(self.ordinal, _ordinal(von), side="left")
+        ende = len(self) if bis is None else np.searchsorted(self.ordinal, _ordinal(bis), side="right")
+        bit = maske_von([zahl])
+        return start + np.flatnonzero(self.maske[start:ende] & bit)
+
+    def mit_treffern(self, zahlen, k: int, mindestens: bool = False, superzahl: int = None) -> np.ndarray:
+        """
+        Ziehungen mit genau k (bzw. mindestens k) Treffern gegen die Zahlenmenge.
+        Optional zusätzlich nur Ziehungen mit passender Superzahl.
+        """
+        anzahl = self.treffer(zahlen)
+        auswahl = anzahl >= k if mindestens else anzahl == k
+        if superzahl is not None:
+            auswahl &= self.superzahl == superzahl
+        return np.flatnonzero(auswahl)
+
+    def daten(self, indizes) -> list[str]:
+        """
+        Wandelt Array-Positionen in ISO-Datumsangaben um.
+        """
+        return [date.fromordinal(int(o)).isoformat() for o in self.ordinal[indizes]]
+
+
+def zufalls_ziehungen(anzahl: int, seed: int = 0, block: int = 100_000) -> np.ndarray:
+    """
+    Erzeugt simulierte Ziehungen (gleiche Struktur wie das Binärformat),
+    z. B. für Benchmarks mit Millionen Ziehungen. Wird blockweise erzeugt,
+    damit der Speicherbedarf begrenzt bleibt.
+    """
+    rng = np.random.default_rng(seed)
+    arr = np.zeros(anzahl, dtype=DATENSATZ)
+    arr["ordinal"] = date(1955, 10, 9).toordinal() + np.arange(anzahl, dtype=np.uint32)
+    for start in range(0, anzahl, block):
+        n = min(block, anzahl - start)
+        zufall = rng.random((n, 49), dtype=np.float32)
+        zahlen = np.argpartition(zufall, 6, axis=1)[:, :6] + 1
+        arr["zahlen"][start:start + n] = np.sort(zahlen, axis=1)
+    arr["superzahl"] = rng.integers(0, 10, anzahl)
+    return arr
+
+
+def _messe(funktion, wiederholungen: int = 3) -> float:
+    """
+    Beste Laufzeit (Sekunden) aus mehreren Wiederholungen.
+    """
+    beste = float("inf")
+    for _ in range(wiederholungen):
+        t0 = time.perf_counter()
+        funktion()
+        beste = min(beste, time.perf_counter() - t0)
+    return beste
+
+
+def benchmark(groessen=(10_000, 1_000_000)):
+    """
+    Vergleicht die Bitmasken-Abfragen mit der naiven Schleife über Dictionaries.
+    """
+    suche = {7, 19, 33}
+    for anzahl in groessen:
+        arr = zufalls_ziehungen(anzahl)
+        dicts = zu_dicts(arr)
+        index = ZiehungsIndex(arr)
+
+        faelle = {
+            "alle von {7,19,33}": (
+                lambda: [z["datum"] for z in dicts if suche.issubset(z["zahlen"])],
+                lambda: index.mit_allen(suche),
+            ),
+            "3 Treffer gegen {7,19,33}": (
+                lambda: [z["datum"] for z in dicts if len(suche.intersection(z["zahlen"])) == 3],
+                lambda: index.mit_treffern(suche, 3),
+            ),
+            "Zahl 13 im Zeitraum": (
+                lambda: [z["datum"] for z in dicts if "1970-01-01" <= z["datum"] <= "1999-12-31" and 13 in z["zahlen"]],
+                lambda: index.im_zeitraum_mit(13, "1970-01-01", "1999-12-31"),
+            ),
+        }
+
+        print(f"\n📊 {anzahl:,} Ziehungen")
+        for name, (naiv, maske) in faelle.items():
+            assert len(naiv()) == len(maske()), f"Abweichendes Ergebnis: {name}"
+            t_naiv = _messe(naiv)
+            t_maske = _messe(maske)
+            print(f"  {name:<28} naiv {t_naiv * 1000:9.2f} ms | Bitmaske {t_maske * 1000:8.2f} ms | x{t_naiv / t_maske:,.0f}")
+
+
+# Testlauf: Benchmark mit 10k und 1M simulierten Ziehungen
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,168 @@
+"""
+Initialisierung model/ziehung_binaer.py …
+Ziel:
+
+- Kompakte, spaltenorientierte Darstellung aller Ziehungen als NumPy-Array
+- Binärdatei mit fester Satzlänge (11 Byte pro Ziehung), per Memory-Map lesbar
+- Konverter JSON ↔ Binär und Binär → Excel
+
+Dateiformat data/ziehungen.bin:
+- Kopf (8 Byte):  b"EXZB" + Version (uint16) + Satzlänge (uint16)
+- Datensätze:     Datum als Ordinalzahl (uint32), 6 Zahlen (uint8), Superzahl (int8, -1 = unbekannt)
+
+Hinweis: Quoten sind nicht enthalten – dafür bleibt der JSON-Speicher die Quelle.
+"""
+
+import os
+import sys
+import json
+import struct
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+# Projektverzeichnis zur sys.path hinzufügen (für direkten Start der Datei)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from model.lotto_model import DATA_DIR, LottoZiehung, lade_bestehende_ziehungen
+from model.excel_export import schreibe_excel
+
+BIN_PATH = DATA_DIR / "ziehungen.bin"
+
+MAGIC = b"EXZB"
+VERSION = 1
+
+# Ein Datensatz = eine Ziehung (gepackt, ohne Füllbytes)
+DATENSATZ = np.dtype([
+    ("ordinal", "<u4"),  # date.toordinal()
+    ("zahlen", "u1", (6,)),  # 6 Lottozahlen, 0 = fehlt
+    ("superzahl", "i1"),  # Superzahl, -1 = unbekannt
+])
+KOPF = struct.Struct("<4sHH")
+
+
+def aus_dicts(eintraege: list[dict]) -> np.ndarray:
+    """
+    Wandelt Ziehungs-Dictionaries (JSON-Format) in ein nach Datum sortiertes Array um.
+    Unvollständige Zahlenreihen werden mit 0 aufgefüllt.
+    """
+    arr = np.zeros(len(eintraege), dtype=DATENSATZ)
+    for i, eintrag in enumerate(eintraege):
+        arr["ordinal"][i] = date.fromisoformat(eintrag["datum"]).toordinal()
+        zahlen = (list(eintrag["zahlen"] or []) + [0] * 6)[:6]
+        arr["zahlen"][i] = zahlen
+        superzahl = eintrag.get("superzahl")
+        arr["superzahl"][i] = -1 if superzahl is None else superzahl
+    return arr[np.argsort(arr["ordinal"], kind="stable")]
+
+
+def zu_dicts(arr: np.ndarray) -> list[dict]:
+    """
+    Wandelt ein Ziehungs-Array zurück in Dictionaries (JSON-Format, ohne Quoten).
+    """
+    return [
+        {
+            "datum": date.fromordinal(int(ordinal)).isoformat(),
+            "zahlen": [int(z) for z in zahlen if z],
+            "superzahl": int(superzahl),
+            "quoten": {},
+        }
+        for ordinal, zahlen, superzahl in zip(arr["ordinal"], arr["zahlen"], arr["superzahl"])
+    ]
+
+
+def zu_ziehungen(arr: np.ndarray) -> list[LottoZiehung]:
+    """
+    Wandelt ein Ziehungs-Array in LottoZiehung-Objekte um.
+    """
+    return [LottoZiehung(**eintrag) for eintrag in zu_dicts(arr)]
+
+
+def spalten(arr: np.ndarray) -> dict:
+    """
+    Gibt die Spalten als eigenständige Arrays (Views, keine Kopien) zurück.
+    """
+    return {
+        "datum_ordinal": arr["ordinal"],
+        "zahlen": arr["zahlen"],
+        "superzahl": arr["superzahl"],
+    }
+
+
+def schreibe_binaer(arr: np.ndarray, pfad: Path = BIN_PATH):
+    """
+    Schreibt das Array mit Kopf in die Binärdatei (vollständig neu).
+    """
+    pfad = Path(pfad)
+    pfad.parent.mkdir(parents=True, exist_ok=True)
+    with open(pfad, "wb") as f:
+        f.write(KOPF.pack(MAGIC, VERSION, DATENSATZ.itemsize))
+        np.ascontiguousarray(arr, dtype=DATENSATZ).tofile(f)
+
+
+def lade_binaer(pfad: Path = BIN_PATH, mmap: bool = True) -> np.ndarray:
+    """
+    Öffnet die Binärdatei als Array. Mit mmap=True wird nichts eingelesen,
+    das Betriebssystem lädt die Seiten erst beim Zugriff.
+    """
+    pfad = Path(pfad)
+    with open(pfad, "rb") as f:
+        magic, version, satzlaenge = KOPF.unpack(f.read(KOPF.size))
+    if magic != MAGIC or version != VERSION or satzlaenge != DATENSATZ.itemsize:
+        raise ValueError(f"Unbekanntes Binärformat: {pfad}")
+
+    anzahl = (pfad.stat().st_size - KOPF.size) // DATENSATZ.itemsize
+    if anzahl == 0:
+        return np.zeros(0, dtype=DATENSATZ)
+    if mmap:
+        return np.memmap(pfad, dtype=DATENSATZ, mode="r", offset=KOPF.size, shape=(anzahl,))
+    return np.fromfile(pfad, dtype=DATENSATZ, count=anzahl, offset=KOPF.size)
+
+
+def lade_ziehungs_array() -> np.ndarray:
+    """
+    Baut das Array direkt aus dem Primärspeicher (Snapshot + Journal).
+    """
+    return aus_dicts(lade_bestehende_ziehungen())
+
+
+def json_zu_binaer(json_pfad: Path = None, bin_pfad: Path = BIN_PATH) -> int:
+    """
+    Konvertiert eine JSON-Ziehungsdatei (oder den Primärspeicher) in die Binärdatei.
+    Rückgabe: Anzahl der Ziehungen.
+    """
+    if json_pfad is None:
+        arr = lade_ziehungs_array()
+    else:
+        with open(json_pfad, "r", encoding="utf-8") as f:
+            arr = aus_dicts(json.load(f))
+    schreibe_binaer(arr, bin_pfad)
+    print(f"[✓] Binärdatei geschrieben: {len(arr)} Ziehungen → {bin_pfad}")
+    return len(arr)
+
+
+def binaer_zu_json(bin_pfad: Path, json_pfad: Path) -> int:
+    """
+    Konvertiert eine Binärdatei in eine JSON-Datei im bisherigen Format.
+    """
+    eintraege = zu_dicts(lade_binaer(bin_pfad))
+    with open(json_pfad, "w", encoding="utf-8") as f:
+        json.dump(eintraege, f, indent=2, ensure_ascii=False)
+    print(f"[✓] JSON geschrieben: {len(eintraege)} Ziehungen → {json_pfad}")
+    return len(eintraege)
+
+
+def binaer_zu_excel(bin_pfad: Path, excel_pfad: Path, pro_jahr: bool = False) -> int:
+    """
+    Konvertiert eine Binärdatei in eine Excel-Datei im bisherigen Format.
+    """
+    anzahl = schreibe_excel(zu_dicts(lade_binaer(bin_pfad)), excel_pfad, pro_jahr=pro_jahr)
+    print(f"[✓] Excel geschrieben: {anzahl} Ziehungen → {excel_pfad}")
+    return anzahl
+
+
+# Testlauf: Primärspeicher → Binärdatei
+if __name__ == "__main__":
+    json_zu_binaer()
+    arr = lade_binaer()
+    print(f"{len(arr)} Ziehungen, {arr.nbytes} Byte")
@@ -0,0 +1,198 @@
+"""
+Initialisierung model/ziehungs_speicher.py …
+Ziel:
+
+- Primärspeicher für Ziehungen: Snapshot (JSON) + Append-only-Journal (JSONL)
+- Datum-Index im Speicher → Duplikatprüfung in O(1)
+- Neue Ziehungen werden nur als eine Zeile angehängt (kein Neuschreiben der Datei)
+- Periodische Kompaktierung: Journal wird in den Snapshot übernommen
+
+Dateien (Beispiel für data/ziehungen.json):
+- data/ziehungen.json          → Snapshot im bisherigen Format (Liste von Dictionaries)
+- data/ziehungen.journal.jsonl → eine Ziehung pro Zeile, seit der letzten Kompaktierung
+"""
+
+import os
+import json
+from pathlib import Path
+
+# Nach so vielen Journal-Einträgen wird automatisch kompaktiert
+KOMPAKTIERUNG_AB = 500
+
+
+class ZiehungsSpeicher:
+    """
+    Verwaltet Snapshot + Journal einer Ziehungshistorie.
+    Der Index (Datum → Eintrag) wird beim ersten Zugriff einmalig aufgebaut
+    und danach nur noch inkrementell gepflegt.
+    """
+    def __init__(self, json_pfad: Path, kompaktierung_ab: int = KOMPAKTIERUNG_AB):
+        self.json_pfad = Path(json_pfad)
+        self.journal_pfad = self.json_pfad.with_suffix(".journal.jsonl")
+        self.kompaktierung_ab = kompaktierung_ab
+        self._eintraege = None  # Liste in Einfügereihenfolge
+        self._index = None  # Datum → Eintrag
+        self._journal_laenge = 0
+        self._signatur = None
+
+    # --- Laden ---------------------------------------------------------------
+
+    def _datei_signatur(self):
+        """
+        Größe + Änderungszeit beider Dateien. Ändert sie sich, hat ein anderer
+        Prozess geschrieben und der Index wird neu aufgebaut.
+        """
+        signatur = []
+        for pfad in (self.json_pfad, self.journal_pfad):
+            try:
+                st = pfad.stat()
+                signatur.append((st.st_size, st.st_mtime_ns))
+            except FileNotFoundError:
+                signatur.append(None)
+        return tuple(signatur)
+
+    def _laden(self):
+        """
+        Baut Index und Eintragsliste aus Snapshot + Journal auf (nur falls nötig).
+        """
+        signatur = self._datei_signatur()
+        if self._index is not None and signatur == self._signatur:
+            return
+
+        eintraege = []
+        if self.json_pfad.exists():
+            with open(self.json_pfad, "r", encoding="utf-8") as f:
+                eintraege = json.load(f)
+
+        journal = []
+        if self.journal_pfad.exists():
+            with open(self.journal_pfad, "r", encoding="utf-8") as f:
+                for zeile in f:
+                    zeile = zeile.strip()
+                    if not zeile:
+                        continue
+                    try:
+                        journal.append(json.loads(zeile))
+                    except json.JSONDecodeError:
+                        # Abgebrochener Schreibvorgang am Dateiende → ignorieren
+                        print(f"[!] Unlesbare Journal-Zeile übersprungen: {self.journal_pfad}")
+
+        self._index = {}
+        self._eintraege = []
+        for eintrag in eintraege + journal:
+            if eintrag["datum"] not in self._index:
+                self._index[eintrag["datum"]] = eintrag
+                self._eintraege.append(eintrag)
+        self._journal_laenge = len(journal)
+        self._signatur = signatur
+
+    # --- Abfragen ------------------------------------------------------------
+
+    def enthaelt(self, datum: str) -> bool:
+        """
+        Prüft in O(1), ob für das Datum bereits eine Ziehung gespeichert ist.
+        """
+        self._laden()
+        return datum in self._index
+
+    def alle(self) -> list[dict]:
+        """
+        Gibt alle gespeicherten Ziehungen (Kopie der Liste) zurück.
+        """
+        self._laden()
+        return list(self._eintraege)
+
+    def neuestes_datum(self) -> str | None:
+        """
+        Datum (ISO) der jüngsten gespeicherten Ziehung, None bei leerem Speicher.
+        """
+        self._laden()
+        return max(self._index, default=None)
+
+    def __len__(self):
+        self._laden()
+        return len(self._eintraege)
+
+    # --- Schreiben -----------------------------------------------------------
+
+    def _journal_oeffnen(self):
+        """
+        Öffnet das Journal zum Anhängen. Endet es nach einem Absturz ohne Zeilenumbruch,
+        wird die abgeschnittene Zeile zuerst abgeschlossen – sonst klebt der neue Eintrag daran
+        und beide werden beim Laden verworfen.
+        """
+        self.json_pfad.parent.mkdir(parents=True, exist_ok=True)
+        f = open(self.journal_pfad, "a", encoding="utf-8")
+        if f.tell():
+            with open(self.journal_pfad, "rb") as roh:
+                roh.seek(-1, os.SEEK_END)
+                if roh.read(1) != b"\n":
+                    f.write("\n")
+        return f
+
+    def hinzufuegen(self, eintrag: dict) -> bool:
+        """
+        Hängt eine Ziehung an das Journal an, falls das Datum noch fehlt.
+        Rückgabe: True, wenn die Ziehung neu war.
+        """
+        self._laden()
+        if eintrag["datum"] in self._index:
+            return False
+
+        with self._journal_oeffnen() as f:
+            f.write(json.dumps(eintrag, ensure_ascii=False) + "\n")
+
+        self._index[eintrag["datum"]] = eintrag
+        self._eintraege.append(eintrag)
+        self._journal_laenge += 1
+        self._signatur = self._datei_signatur()
+
+        if self._journal_laenge >= self.kompaktierung_ab:
+            self.kompaktieren()
+        return True
+
+    def hinzufuegen_viele(self, eintraege: list[dict]) -> list[dict]:
+        """
+        Übernimmt einen ganzen Stapel in einem Schreibvorgang.
+        Duplikate (gegen den Bestand und innerhalb des Stapels) werden per
+        Hash-Join über den Datum-Index aussortiert.
+        Rückgabe: Liste der tatsächlich neu eingefügten Einträge.
+        """
+        self._laden()
+        neue = {}
+        for eintrag in eintraege:
+            datum = eintrag["datum"]
+            if datum not in self._index and datum not in neue:
+                neue[datum] = eintrag
+        if not neue:
+            return []
+
+        with self._journal_oeffnen() as f:
+            f.write("".join(json.dumps(e, ensure_ascii=False) + "\n" for e in neue.values()))
+
+        self._index.update(neue)
+        self._eintraege.extend(neue.values())
+        self._journal_laenge += len(neue)
+        self._signatur = self._datei_signatur()
+
+        if self._journal_laenge >= self.kompaktierung_ab:
+            self.kompaktieren()
+        return list(neue.values())
+
+    def kompaktieren(self):
+        """
+        Schreibt alle Einträge als neuen Snapshot (atomar über Temp-Datei)
+        und leert anschließend das Journal.
+        """
+        self._laden()
+        tmp_pfad = self.json_pfad.with_suffix(".json.tmp")
+        with open(tmp_pfad, "w", encoding="utf-8") as f:
+            json.dump(self._eintraege, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_pfad, self.json_pfad)
+
+        # Erst nach erfolgreichem Snapshot das Journal entfernen
+        if self.journal_pfad.exists():
+            self.journal_pfad.unlink()
+        self._journal_laenge = 0
+        self._signatur = self._datei_signatur()
+        print(f"[✓] Ziehungsspeicher kompaktiert: {len(self._eintraege)} Ziehungen")